@@ -1,4 +1,6 @@
 from .chinese_stroke_sorting import sort_by_stroke, write_sort_result_to_human, write_sort_result_to_file, \
     read_name_list_from_file
+from .external_sort import iter_sort_by_stroke, sort_file_by_stroke
+from .stroke_index import StrokeIndex, get_stroke_index, get_stroke_counts
 
 __name__ = 'chinese-stroke-sorting'
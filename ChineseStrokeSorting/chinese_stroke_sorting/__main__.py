@@ -0,0 +1,26 @@
+# 命令行：按笔划对名单文件进行排序，支持无法一次装入内存的大文件。
+# python -m chinese_stroke_sorting input.txt output.txt --chunk-size 100000
+import argparse
+
+from .external_sort import DEFAULT_CHUNK_SIZE, DEFAULT_MERGE_FAN_IN, sort_file_by_stroke
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='chinese-stroke-sorting',
+                                     description='Sort a name list file (one name per line) by stroke order.')
+    parser.add_argument('input_file', help='name list file, one name per line')
+    parser.add_argument('output_file', help='file to write the sorted names to')
+    parser.add_argument('--split-char', default='\n', help='separator written between names (default: newline)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='number of names sorted in memory at a time (default: %(default)s)')
+    parser.add_argument('--merge-fan-in', type=int, default=DEFAULT_MERGE_FAN_IN,
+                        help='maximum number of temporary runs merged at once (default: %(default)s)')
+    parser.add_argument('--temp-dir', default=None, help='directory for temporary run files')
+    args = parser.parse_args(argv)
+
+    sort_file_by_stroke(args.input_file, args.output_file, split_char=args.split_char, chunk_size=args.chunk_size,
+                        merge_fan_in=args.merge_fan_in, temp_dir=args.temp_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,8 @@
 # 从文件中读取姓名列表，注意，每行一个人名。
 import os
 
+from .stroke_index import get_stroke_index
+
 __char_num_i = 0
 
 
@@ -102,7 +104,41 @@ def write_sort_result_to_file(sort_result_list, output_file, split_char='\n'):
         f.write(split_char.join(str(i) for i in sort_result_list))
 
 
-def sort_by_stroke(name_list_input):
+# ###############################################################
+# 为每个名字预先计算一个整数排序键。
+# 每个字取其在笔划索引中的名次，占用相同的比特宽度，按字的先后从高位到低位排列；
+# 较短的名字在低位补 0，因此前缀相同时较短的名字排在前面。
+
+
+def __init_stroke_sort_key_list__(name_list, stroke_index):
+    order_table = stroke_index.order
+    base = stroke_index.base
+    size = len(order_table)
+    name_orders_list = []
+    for name in name_list:
+        name_orders = []
+        for name_char in name:
+            i = ord(name_char) - base
+            rank = order_table[i] if 0 <= i < size else 0
+            if not rank:
+                raise TypeError('No stroke data for character {!r} in name {!r}'.format(name_char, name))
+            name_orders.append(rank)
+        name_orders_list.append(name_orders)
+
+    width = max((max(name_orders) for name_orders in name_orders_list if name_orders), default=0).bit_length()
+    max_len = max((len(name_orders) for name_orders in name_orders_list), default=0)
+
+    sort_key_list = []
+    for name_orders in name_orders_list:
+        sort_key = 0
+        for rank in name_orders:
+            sort_key = (sort_key << width) | rank
+        sort_key_list.append(sort_key << (width * (max_len - len(name_orders))))
+    return sort_key_list
+
+
+# 旧的多轮冒泡排序实现，仅用于与新实现进行对比测试。
+def __legacy_sort_by_stroke__(name_list_input):
     global __char_num_i
     __char_num_i = 0
     name_stroke_count_list = __init_name_stroke_count_list__(name_list_input, __read_bh__())
@@ -116,5 +152,14 @@ def sort_by_stroke(name_list_input):
     return name_result_list
 
 
+# 按笔划排序：每个名字只计算一次排序键，再进行一次稳定排序（Timsort），
+# 不使用全局状态，可以被多个线程同时调用。
+def sort_by_stroke(name_list_input):
+    name_list = list(name_list_input)
+    sort_key_list = __init_stroke_sort_key_list__(name_list, get_stroke_index())
+    order = sorted(range(len(name_list)), key=sort_key_list.__getitem__)
+    return [name_list[i] for i in order]
+
+
 def write_sort_result_to_human(sort_result_list, split_char=' '):
     return str(split_char.join(str(i) for i in sort_result_list))
@@ -1,8 +1,13 @@
 import os
+import random
+import tempfile
+import threading
 import unittest
 
 from .chinese_stroke_sorting import sort_by_stroke, write_sort_result_to_human, write_sort_result_to_file, \
-    read_name_list_from_file, __read_bh__, __sort__
+    read_name_list_from_file, __read_bh__, __sort__, __legacy_sort_by_stroke__
+from .external_sort import iter_sort_by_stroke, sort_file_by_stroke
+from .stroke_index import StrokeIndex, BH_BIN_PATH, get_stroke_index, get_stroke_counts
 
 
 class SortByNameTest(unittest.TestCase):
@@ -133,5 +138,118 @@ class TestSortFunction(unittest.TestCase):
         expected_output = [['Name1', ['3', '2', '0']], ['Name2', ['3', '2', '0']], ['Name3', ['3', '2', '0']]]
         self.assertEqual(__sort__(input_list), expected_output)
 
+class StrokeSortEngineTest(unittest.TestCase):
+    def setUp(self):
+        self.chinese_char_dict = __read_bh__()
+        self.chars = list(self.chinese_char_dict)[:4000]
+        self.random = random.Random(20200101)
+
+    def random_name_list(self, max_name_len):
+        pool = self.random.sample(self.chars, self.random.randint(2, 30))
+        return [''.join(self.random.choice(pool) for _ in range(self.random.randint(1, max_name_len)))
+                for _ in range(self.random.randint(0, 80))]
+
+    def test_matches_legacy_implementation(self):
+        """Differential test: the key-based engine must order names exactly like the multi-pass bubble sort."""
+        for _ in range(100):
+            name_list = self.random_name_list(max_name_len=2)
+            self.assertEqual(sort_by_stroke(name_list), __legacy_sort_by_stroke__(name_list))
+
+    def test_matches_lexicographic_stroke_order(self):
+        """Longer names are ordered character by character, shorter prefixes first, ties kept stable."""
+        for _ in range(100):
+            name_list = self.random_name_list(max_name_len=5)
+            expected = sorted(name_list, key=lambda name: [int(self.chinese_char_dict[c]) for c in name])
+            self.assertEqual(sort_by_stroke(name_list), expected)
+
+    def test_unknown_character(self):
+        """Characters without stroke data raise TypeError."""
+        with self.assertRaises(TypeError):
+            sort_by_stroke(['王五', 'abc'])
+
+    def test_concurrent_callers(self):
+        """Concurrent calls do not share any sorting state."""
+        name_lists = [self.random_name_list(max_name_len=4) for _ in range(8)]
+        expected = [sort_by_stroke(name_list) for name_list in name_lists]
+        results = [None] * len(name_lists)
+
+        def worker(i):
+            for _ in range(5):
+                results[i] = sort_by_stroke(name_lists[i])
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(name_lists))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, expected)
+
+
+class StrokeIndexTest(unittest.TestCase):
+    def test_prebuilt_index_matches_bh_txt(self):
+        """The shipped bh.bin must be in sync with bh.txt."""
+        self.assertEqual(StrokeIndex.load(BH_BIN_PATH), StrokeIndex.from_bh_txt())
+
+    def test_round_trip(self):
+        """Serializing and loading an index gives back the same tables."""
+        stroke_index = get_stroke_index()
+        self.assertEqual(StrokeIndex.from_bytes(stroke_index.to_bytes()), stroke_index)
+
+    def test_order_matches_stroke_codes(self):
+        """Index ranks keep the integer order of the bh.txt stroke codes."""
+        stroke_index = get_stroke_index()
+        chinese_char_dict = __read_bh__()
+        chars = sorted(chinese_char_dict, key=lambda c: int(chinese_char_dict[c]))
+        ranks = [stroke_index.order_of(c) for c in chars]
+        self.assertEqual(ranks, sorted(ranks))
+        self.assertEqual(len(stroke_index), len(chinese_char_dict))
+
+    def test_stroke_counts(self):
+        """Stroke counts are returned per character, 0 for unknown characters."""
+        self.assertEqual(get_stroke_counts(['王五', '张三', 'a', '']), [[4, 4], [7, 3], [0], []])
+        self.assertNotIn('a', get_stroke_index())
+        self.assertIn('王', get_stroke_index())
+
+    def test_invalid_binary(self):
+        """Loading something that is not a stroke index raises ValueError."""
+        with self.assertRaises(ValueError):
+            StrokeIndex.from_bytes(b'NOTINDEX' + bytes(8))
+
+
+class ExternalSortTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        chars = list(__read_bh__())[:3000]
+        pool = rng.sample(chars, 40)
+        self.name_list = [''.join(rng.choice(pool) for _ in range(rng.randint(1, 4))) for _ in range(1000)]
+
+    def test_matches_in_memory_sort(self):
+        """Merging spilled runs gives the same order as sorting everything in memory."""
+        expected = sort_by_stroke(self.name_list)
+        for chunk_size, merge_fan_in in [(10000, 64), (1000, 64), (37, 64), (37, 2), (1, 3)]:
+            result = list(iter_sort_by_stroke(iter(self.name_list), chunk_size=chunk_size, merge_fan_in=merge_fan_in))
+            self.assertEqual(result, expected)
+
+    def test_sort_file(self):
+        """Sorting a file writes the same content as write_sort_result_to_file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = os.path.join(temp_dir, 'names.txt')
+            write_sort_result_to_file(self.name_list, input_file)
+            expected_file = os.path.join(temp_dir, 'expected.txt')
+            write_sort_result_to_file(sort_by_stroke(self.name_list), expected_file, split_char='|')
+            output_file = os.path.join(temp_dir, 'sorted.txt')
+            sort_file_by_stroke(input_file, output_file, split_char='|', chunk_size=50, temp_dir=temp_dir)
+            with open(output_file, encoding='UTF-8') as f, open(expected_file, encoding='UTF-8') as g:
+                self.assertEqual(f.read(), g.read())
+            self.assertEqual(sorted(os.listdir(temp_dir)), ['expected.txt', 'names.txt', 'sorted.txt'])
+
+    def test_invalid_arguments(self):
+        """Chunk size and merge fan-in are validated."""
+        with self.assertRaises(ValueError):
+            list(iter_sort_by_stroke(self.name_list, chunk_size=0))
+        with self.assertRaises(ValueError):
+            list(iter_sort_by_stroke(self.name_list, merge_fan_in=1))
+
+
 if __name__ == "__main__":
     unittest.main()
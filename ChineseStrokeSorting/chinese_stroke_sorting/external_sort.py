@@ -0,0 +1,128 @@
+# 外部归并笔划排序：用于无法一次装入内存的超大名单。
+# ###############################################################
+# 按 chunk_size 分块读取名单，每块在内存中按笔划排序后写入临时文件（一个“顺串”），
+# 最后对所有顺串进行 k 路归并。内存中最多同时保存 chunk_size 个名字，
+# 同时打开的临时文件数不超过 merge_fan_in，顺串过多时会分多轮归并。
+import heapq
+import os
+import tempfile
+from itertools import islice
+
+from .chinese_stroke_sorting import sort_by_stroke
+from .stroke_index import get_stroke_index
+
+DEFAULT_CHUNK_SIZE = 100000
+DEFAULT_MERGE_FAN_IN = 64
+
+
+# ###############################################################
+# 逐行读取名单，每行一个人名。
+
+
+def iter_name_list_from_file(input_file):
+    with open(str(input_file), 'r', encoding='UTF-8') as f:
+        for line in f:
+            yield line.split('\n')[0]
+
+
+# ###############################################################
+# 归并时使用的排序键：每个字在笔划索引中的名次组成的元组。
+# 元组比较时较短的前缀排在前面，与 sort_by_stroke 的补 0 规则一致。
+
+
+def __stroke_rank_key__(stroke_index):
+    def key(name):
+        ranks = tuple(stroke_index.order_of(name_char) for name_char in name)
+        if 0 in ranks:
+            raise TypeError('No stroke data for character {!r} in name {!r}'.format(name[ranks.index(0)], name))
+        return ranks
+    return key
+
+
+def __write_run__(name_list, temp_dir):
+    fd, path = tempfile.mkstemp(suffix='.run', dir=temp_dir)
+    with open(fd, 'w', encoding='UTF-8', newline='\n') as f:
+        for name in name_list:
+            if '\n' in name:
+                raise ValueError('Names must not contain line breaks: {!r}'.format(name))
+            f.write(name)
+            f.write('\n')
+    return path
+
+
+def __iter_run__(path):
+    with open(path, 'r', encoding='UTF-8', newline='\n') as f:
+        for line in f:
+            yield line[:-1]
+
+
+def __merge_runs__(run_paths, key):
+    return heapq.merge(*[__iter_run__(path) for path in run_paths], key=key)
+
+
+# 顺串数量超过 merge_fan_in 时，先把相邻的顺串归并成更长的顺串。
+# 只归并相邻的顺串，保证相同排序键的名字保持原有顺序。
+def __reduce_runs__(run_paths, key, merge_fan_in, temp_dir):
+    while len(run_paths) > merge_fan_in:
+        merged_paths = []
+        for i in range(0, len(run_paths), merge_fan_in):
+            group = run_paths[i:i + merge_fan_in]
+            if len(group) == 1:
+                merged_paths.append(group[0])
+                continue
+            merged_paths.append(__write_run__(__merge_runs__(group, key), temp_dir))
+            for path in group:
+                os.remove(path)
+        run_paths = merged_paths
+    return run_paths
+
+
+# ###############################################################
+# 对任意可迭代的名单进行外部排序，逐个返回排好序的名字。
+
+
+def iter_sort_by_stroke(name_iterable, chunk_size=DEFAULT_CHUNK_SIZE, merge_fan_in=DEFAULT_MERGE_FAN_IN,
+                        temp_dir=None):
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+    if merge_fan_in < 2:
+        raise ValueError('merge_fan_in must be at least 2')
+
+    name_iterator = iter(name_iterable)
+    first_chunk = sort_by_stroke(islice(name_iterator, chunk_size))
+    if len(first_chunk) < chunk_size:
+        # 整个名单放得下一个块，无需临时文件。
+        for name in first_chunk:
+            yield name
+        return
+
+    key = __stroke_rank_key__(get_stroke_index())
+    with tempfile.TemporaryDirectory(prefix='stroke-sort-', dir=temp_dir) as run_dir:
+        run_paths = [__write_run__(first_chunk, run_dir)]
+        del first_chunk
+        while True:
+            chunk = sort_by_stroke(islice(name_iterator, chunk_size))
+            if not chunk:
+                break
+            run_paths.append(__write_run__(chunk, run_dir))
+            del chunk
+
+        run_paths = __reduce_runs__(run_paths, key, merge_fan_in, run_dir)
+        for name in __merge_runs__(run_paths, key):
+            yield name
+
+
+# ###############################################################
+# 对文件中的名单进行外部排序，并把结果写入 output_file。
+# 通过设定 split_char，可以以不同的分隔形式存放到文件中。
+
+
+def sort_file_by_stroke(input_file, output_file, split_char='\n', chunk_size=DEFAULT_CHUNK_SIZE,
+                        merge_fan_in=DEFAULT_MERGE_FAN_IN, temp_dir=None):
+    sorted_names = iter_sort_by_stroke(iter_name_list_from_file(input_file), chunk_size=chunk_size,
+                                       merge_fan_in=merge_fan_in, temp_dir=temp_dir)
+    with open(str(output_file), 'w', encoding='UTF-8') as f:
+        for i, name in enumerate(sorted_names):
+            if i:
+                f.write(split_char)
+            f.write(str(name))
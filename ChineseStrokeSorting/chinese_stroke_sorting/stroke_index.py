@@ -0,0 +1,153 @@
+# 笔划索引：按 Unicode 码位存放每个汉字的笔划数据，整个进程共享一份。
+# ###############################################################
+# bh.txt 中每个字的笔划数据是一串笔顺编码（例如“王”为 1121），
+# 排序时按其整数值比较。索引中不保存原始编码，而是保存两张紧凑的表：
+#   order   —— 笔顺编码整数值的名次（1 起，0 表示没有该字），array('H')
+#   strokes —— 笔划数，即笔顺编码的位数，array('B')
+# 两张表都以码位减去 base 作为下标。名次保持了整数值的大小关系，
+# 因此可以直接用来生成排序键。
+import os
+import struct
+import sys
+import threading
+from array import array
+
+__package_path = os.path.dirname(os.path.abspath(__file__))
+BH_TXT_PATH = os.path.join(__package_path, 'bh.txt')
+BH_BIN_PATH = os.path.join(__package_path, 'bh.bin')
+
+# 二进制格式：魔数、base、表长，随后依次是小端序的 order 表与 strokes 表。
+_BIN_MAGIC = b'BHIX0001'
+_BIN_HEADER = struct.Struct('<8sII')
+
+
+class StrokeIndex(object):
+    def __init__(self, base, order, strokes):
+        self.base = base
+        self.order = order
+        self.strokes = strokes
+
+    def __len__(self):
+        return sum(1 for rank in self.order if rank)
+
+    def __eq__(self, other):
+        if not isinstance(other, StrokeIndex):
+            return NotImplemented
+        return (self.base, self.order, self.strokes) == (other.base, other.order, other.strokes)
+
+    def __contains__(self, char):
+        return self.order_of(char) != 0
+
+    # 返回字的笔顺名次，没有该字时返回 0。
+    def order_of(self, char):
+        i = ord(char) - self.base
+        if 0 <= i < len(self.order):
+            return self.order[i]
+        return 0
+
+    # 返回字的笔划数，没有该字时返回 0。
+    def stroke_count(self, char):
+        i = ord(char) - self.base
+        if 0 <= i < len(self.strokes):
+            return self.strokes[i]
+        return 0
+
+    # 返回字符串中每个字的笔划数。
+    def stroke_counts(self, text):
+        return [self.stroke_count(char) for char in text]
+
+    # ###############################################################
+    # 从 bh.txt 构建索引。
+
+    @classmethod
+    def from_bh_txt(cls, path=BH_TXT_PATH):
+        entries = []
+        with open(path, 'r', encoding='UTF-8') as f:
+            for line in f:
+                line_after_split = line.rstrip('\n').split('\t')
+                if len(line_after_split) < 2 or not line_after_split[0]:
+                    continue
+                entries.append((ord(line_after_split[0]), line_after_split[1]))
+        if not entries:
+            return cls(0, array('H'), array('B'))
+
+        rank_of = {value: rank for rank, value in enumerate(sorted({int(code) for _, code in entries}), 1)}
+        base = min(cp for cp, _ in entries)
+        size = max(cp for cp, _ in entries) - base + 1
+        order = array('H', bytes(2 * size))
+        strokes = array('B', bytes(size))
+        for cp, code in entries:
+            order[cp - base] = rank_of[int(code)]
+            strokes[cp - base] = len(code)
+        return cls(base, order, strokes)
+
+    # ###############################################################
+    # 读写预先序列化的二进制索引。
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, base, size = _BIN_HEADER.unpack_from(data)
+        if magic != _BIN_MAGIC:
+            raise ValueError('Not a stroke index file')
+        offset = _BIN_HEADER.size
+        order = array('H')
+        order.frombytes(data[offset:offset + 2 * size])
+        strokes = array('B')
+        strokes.frombytes(data[offset + 2 * size:offset + 3 * size])
+        if len(order) != size or len(strokes) != size:
+            raise ValueError('Truncated stroke index file')
+        if sys.byteorder != 'little':
+            order.byteswap()
+        return cls(base, order, strokes)
+
+    def to_bytes(self):
+        order = array('H', self.order)
+        if sys.byteorder != 'little':
+            order.byteswap()
+        return _BIN_HEADER.pack(_BIN_MAGIC, self.base, len(self.order)) + order.tobytes() + self.strokes.tobytes()
+
+    @classmethod
+    def load(cls, path=BH_BIN_PATH):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def dump(self, path=BH_BIN_PATH):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+
+# ###############################################################
+# 进程内共享的索引：导入时若存在 bh.bin 则直接载入，否则在第一次使用时由 bh.txt 构建。
+
+__stroke_index = None
+__stroke_index_lock = threading.Lock()
+
+
+def __load_prebuilt_stroke_index__():
+    try:
+        return StrokeIndex.load(BH_BIN_PATH)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def get_stroke_index():
+    global __stroke_index
+    if __stroke_index is None:
+        with __stroke_index_lock:
+            if __stroke_index is None:
+                __stroke_index = StrokeIndex.from_bh_txt(BH_TXT_PATH)
+    return __stroke_index
+
+
+# 批量获取多个字符串中每个字的笔划数。
+def get_stroke_counts(text_list):
+    stroke_index = get_stroke_index()
+    return [stroke_index.stroke_counts(text) for text in text_list]
+
+
+__stroke_index = __load_prebuilt_stroke_index__()
+
+if __name__ == '__main__':
+    # python -m chinese_stroke_sorting.stroke_index [output]：由 bh.txt 重新生成 bh.bin
+    output_path = sys.argv[1] if len(sys.argv) > 1 else BH_BIN_PATH
+    StrokeIndex.from_bh_txt(BH_TXT_PATH).dump(output_path)
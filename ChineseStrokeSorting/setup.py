@@ -13,7 +13,10 @@ setuptools.setup(
     long_description_content_type="text/markdown",
     url="https://github.com/echosun1996/ChineseStrokeSorting",
     packages=setuptools.find_packages(),
-    package_data={'chinese_stroke_sorting': ['bh.txt']},
+    package_data={'chinese_stroke_sorting': ['bh.txt', 'bh.bin']},
+    entry_points={
+        'console_scripts': ['chinese-stroke-sorting=chinese_stroke_sorting.__main__:main'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.5",
@@ -1,12 +1,21 @@
 import sys
+import asyncio
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
 import uvicorn
 from fastapi import FastAPI, Depends
 from fastapi.openapi.utils import get_openapi
+from fastapi.responses import StreamingResponse
 from pydantic import create_model
+from starlette.concurrency import run_in_threadpool
 
 sys.path.append('.')
 from random_profile.main import RandomProfile
 from random_profile.__about__ import __version__
+from random_profile.enums.gender import Gender
+from random_profile import export
 
 # random_profile==0.2.3 required
 rp = RandomProfile()
@@ -15,6 +24,16 @@ app = FastAPI()
 query_limit = 1000
 query_model = create_model("num", num=(int, ...))
 
+# bulk endpoint: profiles are generated in chunks on a process pool and streamed as NDJSON
+bulk_query_limit = 1_000_000
+bulk_chunk_size = 1000
+bulk_chunks_in_flight = 4
+bulk_query_model = create_model("bulk",
+                                num=(int, ...),
+                                chunk_size=(int, bulk_chunk_size),
+                                seed=(Optional[int], None),
+                                gender=(Optional[Gender], None))
+
 metadata = {
     "status": "200",
     "message": "Success",
@@ -27,6 +46,33 @@ overloaded_error = {"status": "429",
                     "Error": "Too Many Requests",
                     "message": "Number of profiles should be less than {}".format(query_limit)}
 
+bulk_overloaded_error = {"status": "429",
+                         "Error": "Too Many Requests",
+                         "message": "Number of profiles should be less than {}".format(bulk_query_limit)}
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def response(data) -> dict:
+    """ build a new response envelope for every request, metadata itself is never modified """
+    return {**metadata, 'data': data}
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """ worker pool for the bulk endpoint, created on first use """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor()
+    return _process_pool
+
+
+@app.on_event("shutdown")
+def shutdown_process_pool():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
 
 @app.get("/")
 def home():
@@ -46,9 +92,8 @@ async def get_full_profile(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    profile = rp.full_profile(num)
-    metadata['data'] = profile
-    return metadata
+    profile = await run_in_threadpool(rp.full_profiles, num)
+    return response(profile)
 
 
 @app.get('/api/v1/random_profile/first_name')
@@ -64,9 +109,8 @@ async def get_first_name(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    first_names = rp.first_name(num)
-    metadata['data'] = first_names
-    return metadata
+    first_names = await run_in_threadpool(rp.first_names, num)
+    return response(first_names)
 
 
 @app.get('/api/v1/random_profile/last_name')
@@ -82,9 +126,8 @@ async def get_last_name(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    last_names = rp.last_name(num)
-    metadata['data'] = last_names
-    return metadata
+    last_names = await run_in_threadpool(rp.last_names, num)
+    return response(last_names)
 
 
 @app.get('/api/v1/random_profile/full_name')
@@ -100,9 +143,8 @@ async def get_full_name(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    full_names = rp.full_name(num)
-    metadata['data'] = full_names
-    return metadata
+    full_names = await run_in_threadpool(rp.full_names, num)
+    return response(full_names)
 
 
 @app.get('/api/v1/random_profile/ip_address')
@@ -118,9 +160,8 @@ async def get_ip_address(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    ip_addresses = rp.ipaddress(num)
-    metadata['data'] = ip_addresses
-    return metadata
+    ip_addresses = await run_in_threadpool(rp.ip_address, num)
+    return response(ip_addresses)
 
 
 @app.get("/api/v1/random_profile/job_title")
@@ -136,9 +177,8 @@ async def get_job_title(params: query_model = Depends()):
         return overloaded_error
 
     num = params_as_dict['num']
-    job_titles = rp.job_title(num)
-    metadata['data'] = job_titles
-    return metadata
+    job_titles = await run_in_threadpool(rp.job_title, num)
+    return response(job_titles)
 
 
 @app.get("/api/v1/random_profile/address")
@@ -148,9 +188,51 @@ async def get_address(params: query_model = Depends()):
     if params_as_dict['num'] > query_limit:
         return overloaded_error
     num = params_as_dict['num']
-    address = rp.generate_address(num)
-    metadata['data'] = address
-    return metadata
+    address = await run_in_threadpool(rp.generate_address, num)
+    return response(address)
+
+
+async def stream_profiles(num: int, chunk_size: int, seed: int, gender: Optional[Gender]):
+    """ yield NDJSON chunks in order while the next chunks are generated on the process pool """
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    pending = deque()
+    try:
+        for chunk_index, size in enumerate(export.chunk_sizes(num, chunk_size)):
+            pending.append(loop.run_in_executor(pool, export.generate_chunk, chunk_index, size, seed, 'jsonl', gender))
+            if len(pending) >= bulk_chunks_in_flight:
+                yield await pending.popleft()
+        while pending:
+            yield await pending.popleft()
+    finally:
+        # client went away: drop chunks nobody will read
+        for future in pending:
+            future.cancel()
+
+
+@app.get('/api/v1/random_profile/bulk')
+async def get_bulk_profiles(params: bulk_query_model = Depends()):
+    """ Stream many full profiles as newline delimited JSON (one profile per line)
+
+    args:
+        num (int): number of profiles to generate
+        chunk_size (int): number of profiles generated per worker task
+        seed (int): seed for a reproducible stream
+        gender (Gender): generate only profiles of this gender
+    """
+    params_as_dict = params.dict()
+    if params_as_dict['num'] > bulk_query_limit:
+        return bulk_overloaded_error
+    if params_as_dict['chunk_size'] < 1:
+        return {"status": "422", "Error": "Unprocessable Entity", "message": "chunk_size should be at least 1"}
+
+    seed = export.new_seed() if params_as_dict['seed'] is None else params_as_dict['seed']
+    headers = {"X-Total-Count": str(params_as_dict['num']),
+               "X-Seed": str(seed),
+               "X-Version": __version__}
+    return StreamingResponse(stream_profiles(params_as_dict['num'], params_as_dict['chunk_size'], seed,
+                                             params_as_dict['gender']),
+                             media_type="application/x-ndjson", headers=headers)
 
 
 def custom_openapi():
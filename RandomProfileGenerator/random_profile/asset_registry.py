@@ -0,0 +1,186 @@
+'''
+Lazy asset registry
+
+Asset text files are read the first time they are used instead of at import
+time, and combined pools (e.g. male + female first names) are built once.
+Large assets can optionally be kept in a compact offsets + blob file that is
+read through mmap, so forked workers share one copy in the page cache.
+'''
+
+import os
+import sys
+import mmap
+import struct
+import tempfile
+import threading
+from array import array
+from collections.abc import Sequence
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.append('.')
+
+from random_profile import utils
+
+# attribute name -> asset file in ASSETS_DIR
+ASSET_FILES: Dict[str, str] = {
+    'lname': 'lnames.txt',
+    'fname_male': 'fnames_male.txt',
+    'fname_female': 'fnames_female.txt',
+    'hair_colors': 'hair_colors.txt',
+    'blood_types': 'blood_types.txt',
+    'states_names': 'states_names.txt',
+    'cities_name': 'cities_name.txt',
+    'street_names': 'street_names.txt',
+    'job_titles': 'job_titles.txt',
+    'job_levels': 'job_levels.txt',
+}
+
+# attribute name -> assets concatenated into one pool
+COMBINED_ASSETS: Dict[str, Tuple[str, ...]] = {
+    'fname': ('fname_female', 'fname_male'),
+}
+
+# comma separated asset names to load through mmap, e.g. "street_names,cities_name"
+MMAP_ASSETS_ENV = 'RANDOM_PROFILE_MMAP_ASSETS'
+# directory for the compact files, defaults to the assets directory
+ASSET_CACHE_ENV = 'RANDOM_PROFILE_ASSET_CACHE'
+
+_MAGIC = b'RPSTR001'
+_HEADER = struct.Struct('<8sQ')
+_OFFSET_SIZE = 8
+
+
+def write_mapped_strings(values: Iterable[str], path: str) -> None:
+    """ write strings as header + (count + 1) little endian uint64 offsets + utf-8 blob
+
+    The file is written next to path and renamed, so readers never see a partial file.
+    """
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array('Q', [0])
+    for value in encoded:
+        offsets.append(offsets[-1] + len(value))
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, len(encoded)))
+            f.write(offsets.tobytes())
+            f.write(b''.join(encoded))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class MappedStrings(Sequence):
+    """ read-only sequence of strings backed by an mmap of a write_mapped_strings file
+
+    Only the bytes of the requested items are decoded, the rest stays in the page cache.
+    """
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _HEADER.unpack_from(self._mmap)
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a mapped strings file")
+        self.path = path
+        self._count = count
+        offsets_end = _HEADER.size + (count + 1) * _OFFSET_SIZE
+        if sys.byteorder == 'little':
+            self._offsets = memoryview(self._mmap)[_HEADER.size:offsets_end].cast('Q')
+        else:
+            self._offsets = array('Q', self._mmap[_HEADER.size:offsets_end])
+            self._offsets.byteswap()
+        self._blob_start = offsets_end
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('MappedStrings index out of range')
+        start = self._blob_start + self._offsets[index]
+        end = self._blob_start + self._offsets[index + 1]
+        return self._mmap[start:end].decode('utf-8')
+
+    def __repr__(self) -> str:
+        return f'MappedStrings({self.path!r}, len={self._count})'
+
+
+class AssetRegistry(object):
+    """ Loads assets on first attribute access and keeps them for the life of the process
+
+    Args:
+        assets_dir (str, optional): directory with the asset txt files. Defaults to utils.ASSETS_DIR.
+        mapped (iterable, optional): asset names to hold as MappedStrings instead of lists.
+        cache_dir (str, optional): where the compact files for mapped assets are kept. Defaults to assets_dir.
+
+    Example:
+        assets = AssetRegistry(mapped=['street_names', 'cities_name'])
+        assets.street_names   # loaded now
+        assets.fname          # fname_female + fname_male, built once
+    """
+    def __init__(self, assets_dir: str = utils.ASSETS_DIR, mapped: Iterable[str] = (), cache_dir: str = None):
+        self.assets_dir = assets_dir
+        self.cache_dir = cache_dir or assets_dir
+        self.mapped = frozenset(mapped)
+        unknown = self.mapped - set(ASSET_FILES)
+        if unknown:
+            raise ValueError(f"Unknown assets: {', '.join(sorted(unknown))}")
+        self._lock = threading.RLock()
+
+    def __getattr__(self, name: str):
+        # only called when the asset is not loaded yet, afterwards it is a plain attribute
+        if name not in ASSET_FILES and name not in COMBINED_ASSETS:
+            raise AttributeError(f"'{type(self).__name__}' has no asset '{name}'")
+        with self._lock:
+            if name not in self.__dict__:
+                self.__dict__[name] = self._load(name)
+        return self.__dict__[name]
+
+    def __repr__(self) -> str:
+        return f'AssetRegistry({self.assets_dir!r}, loaded={sorted(self.loaded())})'
+
+    def loaded(self) -> List[str]:
+        return [name for name in self.__dict__ if name in ASSET_FILES or name in COMBINED_ASSETS]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.assets_dir, ASSET_FILES[name])
+
+    def _load(self, name: str):
+        if name in COMBINED_ASSETS:
+            pool = []
+            for part in COMBINED_ASSETS[name]:
+                pool.extend(getattr(self, part))
+            return pool
+        if name in self.mapped:
+            mapped = self._load_mapped(name)
+            if mapped is not None:
+                return mapped
+        return utils.load_txt_file(self.path(name))
+
+    def _load_mapped(self, name: str) -> Optional[MappedStrings]:
+        txt_path = self.path(name)
+        bin_path = os.path.join(self.cache_dir, os.path.splitext(ASSET_FILES[name])[0] + '.strings')
+        try:
+            if not os.path.exists(bin_path) or os.path.getmtime(bin_path) < os.path.getmtime(txt_path):
+                write_mapped_strings(utils.load_txt_file(txt_path), bin_path)
+            return MappedStrings(bin_path)
+        except (OSError, ValueError):
+            # read-only install or broken cache file: fall back to a plain list
+            return None
+
+
+def _mapped_from_env() -> List[str]:
+    return [name.strip() for name in os.environ.get(MMAP_ASSETS_ENV, '').split(',') if name.strip()]
+
+
+# registry used by RandomProfile and BulkProfileGenerator
+assets = AssetRegistry(mapped=_mapped_from_env(), cache_dir=os.environ.get(ASSET_CACHE_ENV))
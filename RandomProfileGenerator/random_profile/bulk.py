@@ -0,0 +1,284 @@
+'''
+Vectorized bulk profile generator
+
+Draws every field of N profiles at once as NumPy column arrays instead of
+building one profile at a time. Requires numpy (``pip install random_profile[bulk]``).
+'''
+
+import sys
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterator, List
+
+sys.path.append('.')
+
+from random_profile.asset_registry import assets
+from random_profile import utils
+from random_profile.enums.gender import Gender
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is an optional dependency
+    np = None
+
+# order of the columns in a ProfileBatch; nested dicts of full_profiles are flattened
+COLUMNS = (
+    'id', 'gender', 'first_name', 'last_name', 'hair_color', 'blood_type', 'full_name',
+    'job_title', 'dob', 'age', 'phone_number', 'email', 'height', 'weight', 'ip_address',
+    'street_num', 'street', 'city', 'state', 'zip_code', 'full_address', 'job_experience',
+    'mother', 'father', 'card_type', 'card_number', 'card_expiration', 'coordinates')
+
+# keys of a profile dict as returned by RandomProfile.full_profiles
+PROFILE_KEYS = (
+    'id', 'gender', 'first_name', 'last_name', 'hair_color', 'blood_type', 'full_name',
+    'job_title', 'dob', 'age', 'phone_number', 'email', 'height', 'weight', 'ip_address',
+    'address', 'full_address', 'job_experience', 'mother', 'father', 'payment_card', 'coordinates')
+
+ADDRESS_COLUMNS = ('street_num', 'street', 'city', 'state', 'zip_code')
+CARD_COLUMNS = {'card_type': 'type', 'card_number': 'number', 'card_expiration': 'expiration'}
+
+_GENDERS = (Gender.MALE.value, Gender.FEMALE.value)
+
+_MAX_INT_STRING_TABLE = 1 << 20
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("numpy is required for bulk profile generation, "
+                          "install it with `pip install random_profile[bulk]`")
+
+
+def _concat(*parts):
+    """ element-wise string concatenation of arrays and scalar strings """
+    result = parts[0]
+    for part in parts[1:]:
+        result = np.char.add(result, part)
+    return result
+
+
+def _join(separator: str, parts):
+    """ element-wise str.join of a list of string arrays """
+    result = parts[0]
+    for part in parts[1:]:
+        result = _concat(result, separator, part)
+    return result
+
+
+@lru_cache(maxsize=None)
+def _int_string_table(low: int, high: int, width: int):
+    strings = np.arange(low, high + 1).astype(str)
+    return np.char.zfill(strings, width) if width else strings
+
+
+def _to_str(values, width: int = 0):
+    """ integer array to string array, optionally zero padded to width
+
+    Formatting numbers is the slow part of building string columns, so values
+    from a small range are looked up in a cached table of their string forms.
+    """
+    if not values.size:
+        return values.astype(str)
+    low, high = int(values.min()), int(values.max())
+    if high - low > _MAX_INT_STRING_TABLE:
+        strings = values.astype(str)
+        return np.char.zfill(strings, width) if width else strings
+    return _int_string_table(low, high, width)[values - low]
+
+
+def _uuid4_strings(rng, num: int):
+    """ RFC 4122 version 4 UUIDs built from random bytes """
+    raw = rng.integers(0, 256, size=(num, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+    hex_chars = np.frombuffer(raw.tobytes().hex().encode('ascii'), dtype='S1').reshape(num, 32)
+    with_dashes = np.full((num, 36), b'-', dtype='S1')
+    for start, end, offset in ((0, 8, 0), (8, 12, 1), (12, 16, 2), (16, 20, 3), (20, 32, 4)):
+        with_dashes[:, start + offset:end + offset] = hex_chars[:, start:end]
+    return with_dashes.view('S36').reshape(num).astype('U36')
+
+
+def _dms_strings(values):
+    """ vectorized version of utils.decdeg2dms + the formatting of utils.coords_string """
+    minutes, seconds = np.divmod(np.abs(values) * 3600, 60)
+    degrees, minutes = np.divmod(minutes, 60)
+    # seconds with 4 decimals, formatted as integer and fraction parts
+    seconds = np.rint(seconds * 10000).astype(np.int64)
+    return _concat(_to_str(degrees.astype(np.int64)), '° ',
+                   _to_str(minutes.astype(np.int64)), "' ",
+                   _to_str(seconds // 10000), '.', _to_str(seconds % 10000, 4), "''")
+
+
+class ProfileBatch(object):
+    """ Columnar result of BulkProfileGenerator
+
+    Every column is a NumPy array of length ``len(batch)``.
+
+    Methods:
+        to_dicts: Convert to a list of profile dicts, same shape as RandomProfile.full_profiles
+        to_pandas: Convert to a pandas DataFrame
+        to_arrow: Convert to a pyarrow Table
+    """
+    def __init__(self, columns: Dict[str, 'np.ndarray']):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.to_dicts())
+
+    def __repr__(self) -> str:
+        return f'ProfileBatch(num={len(self)})'
+
+    def to_dicts(self) -> List[dict]:
+        """ Convert to a list of profile dicts, same keys and nesting as RandomProfile.full_profiles """
+        lists = {name: column.tolist() for name, column in self.columns.items()}
+        addresses = [dict(zip(ADDRESS_COLUMNS, row)) for row in zip(*[lists[name] for name in ADDRESS_COLUMNS])]
+        cards = [dict(zip(CARD_COLUMNS.values(), row)) for row in zip(*[lists[name] for name in CARD_COLUMNS])]
+        lists['address'] = addresses
+        lists['payment_card'] = cards
+        return [dict(zip(PROFILE_KEYS, row)) for row in zip(*[lists[name] for name in PROFILE_KEYS])]
+
+    def to_pandas(self):
+        import pandas as pd
+        return pd.DataFrame(self.columns, columns=list(COLUMNS))
+
+    def to_arrow(self):
+        import pyarrow as pa
+        return pa.table({name: self.columns[name] for name in COLUMNS})
+
+
+class BulkProfileGenerator(object):
+    """ Vectorized Random Profile Generator backed by numpy.random.Generator
+
+    Args:
+        seed (int, optional): seed or numpy SeedSequence for reproducible output. Defaults to None.
+        gender (Gender, optional): generate only profiles of this gender. Defaults to None.
+
+    Methods:
+        generate: Generate a ProfileBatch of num profiles
+        reseed: Restart the random stream from a new seed
+    """
+    def __init__(self, seed=None, gender: Gender = None):
+        _require_numpy()
+        self.rng = np.random.default_rng(seed)
+        self.gender = gender
+
+        as_array = lambda values: np.array(list(values), dtype=str)  # noqa: E731
+        self.fname_male = as_array(assets.fname_male)
+        self.fname_female = as_array(assets.fname_female)
+        self.lname = as_array(assets.lname)
+        self.hair_colors = as_array(assets.hair_colors)
+        self.blood_types = as_array(assets.blood_types)
+        self.street_names = as_array(assets.street_names)
+        self.states_names = as_array(assets.states_names)
+        self.job_titles = as_array(assets.job_titles)
+
+        cities = [city.split(';') for city in assets.cities_name]
+        self.city_names = as_array([city[0] for city in cities])
+        self.city_lat = np.array([float(city[1]) for city in cities])
+        self.city_lon = np.array([float(city[2]) for city in cities])
+
+        levels = [level.split(';') for level in assets.job_levels]
+        self.job_levels = as_array([level[0] for level in levels] + [''])
+        self.job_level_bounds = np.array([[int(level[1]), int(level[2])] for level in levels], dtype=np.int64)
+
+    def __repr__(self) -> str:
+        return f'BulkProfileGenerator(gender={self.gender})'
+
+    def reseed(self, seed) -> None:
+        self.rng = np.random.default_rng(seed)
+
+    def _choice(self, pool, num: int):
+        return pool[self.rng.integers(0, len(pool), size=num)]
+
+    def _randint(self, low: int, high: int, num: int):
+        """ inclusive on both ends, like random.randint """
+        return self.rng.integers(low, high, size=num, endpoint=True)
+
+    def _first_names(self, is_male):
+        male = self._choice(self.fname_male, len(is_male))
+        female = self._choice(self.fname_female, len(is_male))
+        return np.where(is_male, male, female)
+
+    def _job_experience(self, age):
+        # first level whose [min, max] range contains the age, '' when none does
+        inside = (self.job_level_bounds[:, 0] <= age[:, None]) & (age[:, None] <= self.job_level_bounds[:, 1])
+        index = np.where(inside.any(axis=1), inside.argmax(axis=1), len(self.job_levels) - 1)
+        return self.job_levels[index]
+
+    def generate(self, num: int) -> ProfileBatch:
+        """ Generate num profiles as columns """
+        rng = self.rng
+        today = date.today()
+        c = {}
+
+        c['id'] = _uuid4_strings(rng, num)
+
+        if self.gender is None:
+            is_male = rng.integers(0, 2, size=num).astype(bool)
+        else:
+            is_male = np.full(num, self.gender.value == Gender.MALE.value)
+        c['gender'] = np.where(is_male, *_GENDERS)
+
+        c['first_name'] = self._first_names(is_male)
+        c['last_name'] = self._choice(self.lname, num)
+        c['hair_color'] = self._choice(self.hair_colors, num)
+        c['blood_type'] = self._choice(self.blood_types, num)
+        c['full_name'] = _concat(c['first_name'], ' ', c['last_name'])
+        c['job_title'] = self._choice(self.job_titles, num)
+
+        # date of birth as a day offset between 1st Jan 80 years ago and 31st Dec 18 years ago
+        first_day = np.datetime64(date(today.year - 80, 1, 1), 'D')
+        last_day = np.datetime64(date(today.year - 18, 12, 31), 'D')
+        span = (last_day - first_day).astype(np.int64)
+        dob = first_day + rng.integers(0, span, size=num, endpoint=True)
+        month_start = dob.astype('datetime64[M]')
+        year = dob.astype('datetime64[Y]').astype(np.int64) + 1970
+        month = month_start.astype(np.int64) % 12 + 1
+        day = (dob - month_start.astype('datetime64[D]')).astype(np.int64) + 1
+        c['dob'] = _concat(_to_str(day, 2), '/', _to_str(month, 2), '/', _to_str(year))
+        c['age'] = (np.datetime64(today, 'D') - dob).astype(np.int64) // 365
+
+        c['phone_number'] = _concat('+1-', _to_str(self._randint(300, 500, num)), '-',
+                                    _to_str(self._randint(800, 999, num)), '-',
+                                    _to_str(self._randint(1000, 9999, num)))
+        c['email'] = _concat(np.char.lower(c['first_name']), np.char.lower(c['last_name']), '@example.com')
+
+        # weight range moves up by 10 kg for every 10 cm, same bands as utils.generate_random_height_weight
+        height = self._randint(140, 200, num)
+        c['height'] = height
+        c['weight'] = 40 + 10 * np.minimum((height - 140) // 10, 5) + self._randint(0, 20, num)
+
+        c['ip_address'] = _join('.', [_to_str(self._randint(0, 255, num)) for _ in range(4)])
+
+        c['street_num'] = self._randint(100, 999, num)
+        c['street'] = self._choice(self.street_names, num)
+        city_index = rng.integers(0, len(self.city_names), size=num)
+        c['city'] = self.city_names[city_index]
+        c['state'] = self._choice(self.states_names, num)
+        c['zip_code'] = self._randint(10000, 99999, num)
+        c['full_address'] = _concat(_to_str(c['street_num']), ' ', c['street'], ', ', c['city'], ', ',
+                                    c['state'], ' ', _to_str(c['zip_code']))
+
+        c['job_experience'] = self._job_experience(c['age'])
+        c['mother'] = _concat(self._choice(self.fname_female, num), ' ', c['last_name'])
+        c['father'] = _concat(self._choice(self.fname_male, num), ' ', c['last_name'])
+
+        c['card_type'] = np.where(rng.integers(0, 2, size=num).astype(bool), 'Credit', 'Debit')
+        c['card_number'] = _join('-', [_to_str(self._randint(1, 9999, num), 4) for _ in range(4)])
+        expiration_year = self._randint(today.year, today.year + 10, num) % 100
+        c['card_expiration'] = _concat(_to_str(self._randint(1, 12, num), 2), '/', _to_str(expiration_year, 2))
+
+        # random point up to 1 km around the city, same as utils.random_coords_from_point
+        angle = rng.random(num) * 2 * np.pi
+        offset = rng.random(num) * 1000
+        lat = self.city_lat[city_index] + np.cos(angle) * offset / utils.M_PER_DEGREE
+        lon = self.city_lon[city_index] + np.sin(angle) * offset / utils.M_PER_DEGREE
+        c['coordinates'] = _concat(_dms_strings(lat), ' ', np.where(lat > 0, 'N', 'S'), ' ',
+                                   _dms_strings(lon), ' ', np.where(lon > 0, 'E', 'W'))
+
+        return ProfileBatch({name: c[name] for name in COLUMNS})
@@ -10,6 +10,7 @@ from random_profile.main import RandomProfile
 from random_profile.__about__ import __version__
 from random_profile.api import start_server
 from random_profile.enums.gender import Gender
+from random_profile.export import export_profiles, FORMATS, DEFAULT_CHUNK_SIZE
 
 parser = argparse.ArgumentParser()
 parser.add_argument('-v', '--version', action='version', version=__version__)
@@ -18,6 +19,13 @@ parser.add_argument('--server', help='Start server', action='store_true')
 parser.add_argument('--port', help='Port number', type=int, default=8000)
 parser.add_argument('-n', '--number', help='Number of random profiles', type=int, default=1)
 
+export_arg_group = parser.add_argument_group('export', 'Stream full profiles to a file using all cores')
+export_arg_group.add_argument('-o', '--export', help='Export profiles to a .jsonl, .csv or .parquet file', metavar='FILE')
+export_arg_group.add_argument('--format', help='Export format, defaults to the file extension', choices=FORMATS)
+export_arg_group.add_argument('--chunk-size', help='Profiles generated per chunk', type=int, default=DEFAULT_CHUNK_SIZE)
+export_arg_group.add_argument('--workers', help='Number of worker processes, defaults to the number of cores', type=int)
+export_arg_group.add_argument('--seed', help='Seed for reproducible exports', type=int)
+
 gender_arg_group = parser.add_mutually_exclusive_group()
 
 gender_arg_group.add_argument("-ma", "--male", help="Get only male profiles", action="store_true")
@@ -46,6 +54,10 @@ def main():
     rp = RandomProfile(args.number, gender)
     if args.server:
         start_server(args.port)
+    elif args.export:
+        seed = 0 if args.seed is None and args.repeat else args.seed
+        export_profiles(args.export, args.number, fmt=args.format, chunk_size=args.chunk_size,
+                        workers=args.workers, seed=seed, gender=gender)
     elif args.fullname:
         pprint(rp.full_names())
     elif args.firstname:
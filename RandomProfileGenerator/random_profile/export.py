@@ -0,0 +1,153 @@
+'''
+Streaming multi-process profile export
+
+Generates profiles in fixed-size chunks across a process pool and writes them
+incrementally to JSONL, CSV or Parquet files, so memory stays bounded no matter
+how many profiles are requested. Requires numpy (and pyarrow for Parquet).
+'''
+
+import os
+import io
+import sys
+import csv
+import json
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, Optional
+
+sys.path.append('.')
+
+from random_profile.bulk import BulkProfileGenerator, COLUMNS, ProfileBatch, np, _require_numpy
+from random_profile.enums.gender import Gender
+
+FORMATS = ('jsonl', 'csv', 'parquet')
+DEFAULT_CHUNK_SIZE = 100_000
+
+# generators of the current (worker) process, one per gender, reseeded for every chunk
+_generators: Dict[Optional[Gender], BulkProfileGenerator] = {}
+
+
+def infer_format(path: str) -> str:
+    """ guess the export format from the file extension """
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    if extension in ('csv', 'parquet'):
+        return extension
+    raise ValueError(f"Can not infer export format from '{path}', use one of {', '.join(FORMATS)}")
+
+
+def chunk_seed(seed: int, chunk_index: int):
+    """ independent, deterministic seed stream for a chunk
+
+    Every chunk gets its own child of the root SeedSequence, so the output only
+    depends on the seed and the chunk size, not on the number of workers.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(chunk_index,))
+
+
+def new_seed() -> int:
+    """ fresh root entropy, drawn once so all chunks of a run come from one seed stream """
+    return np.random.SeedSequence().entropy
+
+
+def _serialize(batch: ProfileBatch, fmt: str, header: bool):
+    if fmt == 'jsonl':
+        lines = [json.dumps(profile, ensure_ascii=False) for profile in batch.to_dicts()]
+        return ''.join(line + '\n' for line in lines).encode('utf-8')
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        if header:
+            writer.writerow(COLUMNS)
+        writer.writerows(zip(*[batch[name].tolist() for name in COLUMNS]))
+        return buffer.getvalue().encode('utf-8')
+    # parquet: hand the columns back to the parent, which owns the ParquetWriter
+    return batch.columns
+
+
+def generate_chunk(chunk_index: int, num: int, seed: int, fmt: str = 'jsonl', gender: Gender = None):
+    """ Generate and serialize one chunk, meant to run in a worker process
+
+    returns:
+        bytes for jsonl and csv (csv has a header on chunk 0), a dict of columns for parquet
+    """
+    if gender not in _generators:
+        _generators[gender] = BulkProfileGenerator(gender=gender)
+    generator = _generators[gender]
+    generator.reseed(chunk_seed(seed, chunk_index))
+    return _serialize(generator.generate(num), fmt, header=chunk_index == 0)
+
+
+def chunk_sizes(num: int, chunk_size: int) -> Iterator[int]:
+    for start in range(0, num, chunk_size):
+        yield min(chunk_size, num - start)
+
+
+def _iter_chunks(num: int, chunk_size: int, seed: int, fmt: str, workers: int,
+                 gender: Optional[Gender]) -> Iterator:
+    """ yield serialized chunks in order, keeping at most 2 * workers chunks in flight """
+    if workers == 1:
+        for chunk_index, size in enumerate(chunk_sizes(num, chunk_size)):
+            yield generate_chunk(chunk_index, size, seed, fmt, gender)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for chunk_index, size in enumerate(chunk_sizes(num, chunk_size)):
+            pending.append(executor.submit(generate_chunk, chunk_index, size, seed, fmt, gender))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def export_profiles(path: str, num: int, fmt: str = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    workers: int = None, seed: int = None, gender: Gender = None) -> int:
+    """ Generate num profiles and write them to path
+
+    args:
+        path (str): output file
+        num (int): number of profiles to generate
+        fmt (str, optional): one of jsonl, csv, parquet. Defaults to the file extension.
+        chunk_size (int, optional): profiles generated per task. Defaults to 100000.
+        workers (int, optional): number of worker processes. Defaults to os.cpu_count().
+        seed (int, optional): seed for reproducible output. Defaults to None.
+        gender (Gender, optional): generate only profiles of this gender. Defaults to None.
+
+    returns:
+        int: number of profiles written
+    """
+    _require_numpy()
+    fmt = infer_format(path) if fmt is None else fmt
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', use one of {', '.join(FORMATS)}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size should be at least 1")
+    workers = max(1, min(workers or os.cpu_count() or 1, -(-num // chunk_size) or 1))
+    seed = new_seed() if seed is None else seed
+
+    chunks = _iter_chunks(num, chunk_size, seed, fmt, workers, gender)
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for columns in chunks:
+                table = pa.table({name: columns[name] for name in COLUMNS})
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            # nothing generated, still leave a valid (empty) file behind
+            pq.write_table(BulkProfileGenerator(gender=gender).generate(0).to_arrow(), path)
+    else:
+        with open(path, 'wb') as f:
+            for data in chunks:
+                f.write(data)
+            if fmt == 'csv' and num == 0:
+                f.write((','.join(COLUMNS) + '\n').encode('utf-8'))
+    return num
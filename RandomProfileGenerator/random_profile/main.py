@@ -5,7 +5,6 @@ language : python 3.0 ++
 github : codeperfectplus
 '''
 
-import os
 import sys
 import uuid
 import random
@@ -15,30 +14,18 @@ sys.path.append('.')
 
 from random_profile.enums.gender import Gender
 from random_profile import utils
+from random_profile.asset_registry import assets, ASSET_FILES
 from random_profile.__about__ import __version__
 
-lname_txt = os.path.join(utils.ASSETS_DIR, "lnames.txt")
-fname_male_txt = os.path.join(utils.ASSETS_DIR, "fnames_male.txt")
-fname_female_txt = os.path.join(utils.ASSETS_DIR, "fnames_female.txt")
-hair_colors_txt = os.path.join(utils.ASSETS_DIR, "hair_colors.txt")
-blood_types_txt = os.path.join(utils.ASSETS_DIR, "blood_types.txt")
-street_names_txt = os.path.join(utils.ASSETS_DIR, "street_names.txt")
-cities_name_txt = os.path.join(utils.ASSETS_DIR, "cities_name.txt")
-states_names_txt = os.path.join(utils.ASSETS_DIR, "states_names.txt")
-job_titles_txt = os.path.join(utils.ASSETS_DIR, "job_titles.txt")
-job_levels_txt = os.path.join(utils.ASSETS_DIR, "job_levels.txt")
-
-# loading data from txt files
-lname = utils.load_txt_file(lname_txt)
-fname_male = utils.load_txt_file(fname_male_txt)
-fname_female = utils.load_txt_file(fname_female_txt)
-hair_colors = utils.load_txt_file(hair_colors_txt)
-blood_types = utils.load_txt_file(blood_types_txt)
-states_names = utils.load_txt_file(states_names_txt)
-cities_name = utils.load_txt_file(cities_name_txt)
-street_names = utils.load_txt_file(street_names_txt)
-job_titles = utils.load_txt_file(job_titles_txt)
-job_levels = utils.load_txt_file(job_levels_txt)
+# assets are loaded on first use, see random_profile.asset_registry
+LEGACY_ASSET_NAMES = tuple(ASSET_FILES)
+
+
+def __getattr__(name: str):
+    """ keep `main.lname`, `main.fname_male`, ... working without loading every asset at import """
+    if name in LEGACY_ASSET_NAMES:
+        return getattr(assets, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class RandomProfile(object):
@@ -62,6 +49,7 @@ class RandomProfile(object):
         hair_color: Generate Hair Color
         blood_type: Generate Blood Type
         job_title: Generate Job Title
+        bulk_profiles: Generate Full Profiles as columns with numpy (fast, for large num)
     """
     def __init__(self, num: int = 1, gender: Gender = None):
         self.num = num
@@ -97,20 +85,20 @@ class RandomProfile(object):
     def job_title(self, num: int = None) -> List[str]:
         num = self.num if num is None else num
         if num == 1 or num is None:
-            return random.choice(job_titles)
-        return random.choices(job_titles, k=num)
+            return random.choice(assets.job_titles)
+        return random.choices(assets.job_titles, k=num)
 
     def blood_type(self, num: int = None) -> List[str]:
         num = self.num if num is None else num
         if num == 1 or num is None:
-            return random.choice(blood_types)
-        return random.choices(blood_types, k=num)
+            return random.choice(assets.blood_types)
+        return random.choices(assets.blood_types, k=num)
 
     def hair_color(self, num: int = None) -> List[str]:
         num = self.num if num is None else num
         if num == 1 or num is None:
-            return random.choice(hair_colors)
-        return random.choices(hair_colors, k=num)
+            return random.choice(assets.hair_colors)
+        return random.choices(assets.hair_colors, k=num)
 
     def dob_age(self, num: int = None) -> List[Tuple[str, int]]:
         num = self.num if num is None else num
@@ -129,9 +117,9 @@ class RandomProfile(object):
         address_list = []
         for _ in range(num):
             street_num = random.randint(100, 999)
-            street = random.choice(street_names)
-            city = random.choice(cities_name)
-            state = random.choice(states_names)
+            street = random.choice(assets.street_names)
+            city = random.choice(assets.cities_name)
+            state = random.choice(assets.states_names)
             zip_code = random.randint(10000, 99999)
 
             address = {
@@ -151,11 +139,11 @@ class RandomProfile(object):
 
         # DRY CODE
         if gender is None:
-            names = fname_female + fname_male
+            names = assets.fname
         elif gender.value == Gender.MALE.value:
-            names = fname_male
+            names = assets.fname_male
         else:
-            names = fname_female
+            names = assets.fname_female
 
         if num == 1 or num is None:
             return random.choice(names)
@@ -165,25 +153,25 @@ class RandomProfile(object):
     def last_names(self, num: int = None) -> list:
         num = self.num if num is None else num
         if num == 1 or num is None:
-            return random.choice(lname)
+            return random.choice(assets.lname)
 
-        return random.choices(lname, k=num)
+        return random.choices(assets.lname, k=num)
 
     def full_names(self, num: int = None, gender: Gender = None) -> list:
         num = self.num if num is None else num
         gender = self.gender if gender is None else gender
 
         if gender is None:
-            names = fname_female + fname_male
+            names = assets.fname
         elif gender.value == Gender.MALE.value:
-            names = fname_male
+            names = assets.fname_male
         else:
-            names = fname_female
+            names = assets.fname_female
 
         if num == 1 or num is None:
-            return random.choice(names) + ' ' + random.choice(lname)
+            return random.choice(names) + ' ' + random.choice(assets.lname)
 
-        return [random.choice(names) + ' ' + random.choice(lname) for _ in range(num)]
+        return [random.choice(names) + ' ' + random.choice(assets.lname) for _ in range(num)]
 
     def full_profiles(self, num: int = None, gender: Gender = None) -> list:
         num = self.num if num is None else num
@@ -193,24 +181,24 @@ class RandomProfile(object):
         for _ in range(num):
             # random gender for every profile in list
             this_gender = utils.generate_random_gender() if gender is None else gender
-            first = random.choice(fname_male if this_gender.value == Gender.MALE.value else fname_female)
-            last = random.choice(lname)
+            first = random.choice(assets.fname_male if this_gender.value == Gender.MALE.value else assets.fname_female)
+            last = random.choice(assets.lname)
             full_name = first + ' ' + last
 
-            hair_color = random.choice(hair_colors)
-            blood_type = random.choice(blood_types)
+            hair_color = random.choice(assets.hair_colors)
+            blood_type = random.choice(assets.blood_types)
 
             phone_number = f'+1-{random.randint(300, 500)}-{random.randint(800, 999)}-{random.randint(1000,9999)}'
 
             dob, age = utils.generate_dob_age()
             height, weight = utils.generate_random_height_weight()
-            job_experience = utils.generate_random_job_level(age, job_levels)
+            job_experience = utils.generate_random_job_level(age, assets.job_levels)
 
             street_num = random.randint(100, 999)
-            street = random.choice(street_names)
-            city, coords = utils.generate_random_city_coords(cities_name)
+            street = random.choice(assets.street_names)
+            city, coords = utils.generate_random_city_coords(assets.cities_name)
             coords_pretty = utils.coords_string(coords)
-            state = random.choice(states_names)
+            state = random.choice(assets.states_names)
             zip_code = random.randint(10000, 99999)
 
             address = {
@@ -261,4 +249,10 @@ class RandomProfile(object):
             profile_list.append(profile)
 
         return profile_list
-    
\ No newline at end of file
+
+    def bulk_profiles(self, num: int = None, gender: Gender = None, seed=None):
+        num = self.num if num is None else num
+        gender = self.gender if gender is None else gender
+
+        from random_profile.bulk import BulkProfileGenerator
+        return BulkProfileGenerator(seed=seed, gender=gender).generate(num)
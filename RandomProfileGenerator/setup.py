@@ -18,6 +18,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     install_requires=requirements,
+    extras_require={"bulk": ["numpy"]},
     data_files=[('assets', glob('random_profile/assets/*'))],
     url=__github__,
     packages=setuptools.find_packages(),
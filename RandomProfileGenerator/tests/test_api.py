@@ -0,0 +1,51 @@
+import sys
+import json
+
+import pytest
+
+sys.path.append('.')
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+pytest.importorskip("numpy")
+
+from fastapi.testclient import TestClient
+
+from random_profile import api
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(api.app) as client:
+        yield client
+
+
+def test_envelope_is_built_per_request(client):
+    response = client.get('/api/v1/random_profile/full_profile', params={'num': 2})
+    assert response.status_code == 200
+    assert len(response.json()['data']) == 2
+    assert 'data' not in api.metadata
+    assert 'data' not in client.get('/').json()
+
+
+def test_bulk_streams_ndjson(client):
+    response = client.get('/api/v1/random_profile/bulk', params={'num': 2500, 'chunk_size': 1000, 'seed': 5})
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert response.headers['x-total-count'] == '2500'
+
+    profiles = [json.loads(line) for line in response.text.splitlines()]
+    assert len(profiles) == 2500
+    assert len({profile['id'] for profile in profiles}) == 2500
+
+
+def test_bulk_seed_is_reproducible(client):
+    params = {'num': 300, 'chunk_size': 100, 'seed': 11, 'gender': 'Male'}
+    first = client.get('/api/v1/random_profile/bulk', params=params).text
+    second = client.get('/api/v1/random_profile/bulk', params=params).text
+    assert first == second
+    assert {json.loads(line)['gender'] for line in first.splitlines()} == {'Male'}
+
+
+def test_bulk_limit(client):
+    response = client.get('/api/v1/random_profile/bulk', params={'num': api.bulk_query_limit + 1})
+    assert response.json()['status'] == '429'
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append('.')
+
+from random_profile import main
+from random_profile import utils
+from random_profile.asset_registry import AssetRegistry, MappedStrings, write_mapped_strings, ASSET_FILES
+
+
+def test_assets_load_on_first_use():
+    registry = AssetRegistry()
+    assert registry.loaded() == []
+
+    street_names = registry.street_names
+    assert registry.loaded() == ['street_names']
+    assert street_names == utils.load_txt_file(os.path.join(utils.ASSETS_DIR, 'street_names.txt'))
+    assert registry.street_names is street_names
+
+
+def test_combined_pool_is_built_once():
+    registry = AssetRegistry()
+    assert registry.fname == registry.fname_female + registry.fname_male
+    assert registry.fname is registry.fname
+
+
+def test_unknown_asset():
+    with pytest.raises(AttributeError):
+        AssetRegistry().not_an_asset
+    with pytest.raises(ValueError):
+        AssetRegistry(mapped=['not_an_asset'])
+
+
+def test_legacy_module_attributes():
+    assert main.lname == AssetRegistry().lname
+    with pytest.raises(AttributeError):
+        main.not_an_asset
+
+
+def test_mapped_strings(tmp_path):
+    values = ['Main', 'Oak', '', 'Čapek', "King's Landing;-25.95;32.57"]
+    path = str(tmp_path / 'values.strings')
+    write_mapped_strings(values, path)
+
+    mapped = MappedStrings(path)
+    assert len(mapped) == len(values)
+    assert list(mapped) == values
+    assert mapped[-1] == values[-1]
+    assert mapped[1:3] == values[1:3]
+    with pytest.raises(IndexError):
+        mapped[len(values)]
+
+
+def test_mapped_registry(tmp_path):
+    registry = AssetRegistry(mapped=['street_names', 'cities_name'], cache_dir=str(tmp_path))
+    plain = AssetRegistry()
+
+    assert isinstance(registry.street_names, MappedStrings)
+    assert list(registry.street_names) == plain.street_names
+    assert list(registry.cities_name) == plain.cities_name
+    assert isinstance(registry.lname, list)
+    assert sorted(os.listdir(str(tmp_path))) == ['cities_name.strings', 'street_names.strings']
+
+
+def test_mapped_cache_is_rebuilt_when_stale(tmp_path):
+    assets_dir = tmp_path / 'assets'
+    assets_dir.mkdir()
+    txt = assets_dir / ASSET_FILES['street_names']
+    txt.write_text('Main\nOak\n')
+    assert list(AssetRegistry(str(assets_dir), mapped=['street_names']).street_names) == ['Main', 'Oak']
+
+    txt.write_text('Elm\n')
+    cache = assets_dir / 'street_names.strings'
+    os.utime(str(cache), (0, 0))
+    assert list(AssetRegistry(str(assets_dir), mapped=['street_names']).street_names) == ['Elm']
@@ -0,0 +1,102 @@
+import sys
+import uuid
+from datetime import datetime
+
+import pytest
+
+sys.path.append('.')
+np = pytest.importorskip("numpy")
+
+from random_profile import RandomProfile
+from random_profile import main
+from random_profile.bulk import BulkProfileGenerator, COLUMNS
+from random_profile.enums.gender import Gender
+
+
+@pytest.fixture
+def batch():
+    return BulkProfileGenerator(seed=42).generate(2000)
+
+
+def test_columns(batch):
+    assert len(batch) == 2000
+    assert tuple(batch.columns) == COLUMNS
+    assert all(len(column) == 2000 for column in batch.columns.values())
+
+
+def test_to_dicts_matches_full_profiles_shape(batch):
+    profiles = batch.to_dicts()
+    reference = RandomProfile().full_profiles(1)[0]
+
+    assert len(profiles) == 2000
+    assert list(profiles[0]) == list(reference)
+    assert list(profiles[0]['address']) == list(reference['address'])
+    assert list(profiles[0]['payment_card']) == list(reference['payment_card'])
+    for key, value in reference.items():
+        assert type(profiles[0][key]) is type(value), key
+
+
+def test_seed_is_reproducible():
+    first = BulkProfileGenerator(seed=7).generate(50).to_dicts()
+    second = BulkProfileGenerator(seed=7).generate(50).to_dicts()
+    other = BulkProfileGenerator(seed=8).generate(50).to_dicts()
+
+    assert first == second
+    assert first != other
+
+
+def test_values_in_range(batch):
+    for profile in batch.to_dicts():
+        assert uuid.UUID(profile['id']).version == 4
+        assert profile['email'] == profile['first_name'].lower() + profile['last_name'].lower() + '@example.com'
+        assert profile['full_name'] == profile['first_name'] + ' ' + profile['last_name']
+        assert profile['mother'].endswith(' ' + profile['last_name'])
+        assert profile['first_name'] in (main.fname_male if profile['gender'] == 'Male' else main.fname_female)
+
+        dob = datetime.strptime(profile['dob'], '%d/%m/%Y')
+        assert profile['age'] == (datetime.now() - dob).days // 365
+        assert 17 <= profile['age'] <= 81
+        assert profile['job_experience']
+
+        assert 140 <= profile['height'] <= 200
+        band = 40 + 10 * min((profile['height'] - 140) // 10, 5)
+        assert band <= profile['weight'] <= band + 20
+
+        assert all(0 <= int(part) <= 255 for part in profile['ip_address'].split('.'))
+        address = profile['address']
+        assert profile['full_address'] == (f"{address['street_num']} {address['street']}, {address['city']}, "
+                                           f"{address['state']} {address['zip_code']}")
+        assert len(profile['payment_card']['number']) == 19
+
+
+def test_gender():
+    batch = BulkProfileGenerator(seed=1, gender=Gender.FEMALE).generate(100)
+    assert set(batch['gender'].tolist()) == {'Female'}
+    assert set(batch['first_name'].tolist()) <= set(main.fname_female)
+
+
+def test_empty():
+    batch = BulkProfileGenerator(seed=1).generate(0)
+    assert len(batch) == 0
+    assert batch.to_dicts() == []
+
+
+def test_bulk_profiles_method():
+    batch = RandomProfile(num=10).bulk_profiles(seed=3)
+    assert len(batch) == 10
+    assert batch.to_dicts() == BulkProfileGenerator(seed=3).generate(10).to_dicts()
+
+
+def test_to_pandas(batch):
+    pd = pytest.importorskip("pandas")
+    frame = batch.to_pandas()
+    assert isinstance(frame, pd.DataFrame)
+    assert list(frame.columns) == list(COLUMNS)
+    assert len(frame) == 2000
+
+
+def test_to_arrow(batch):
+    pytest.importorskip("pyarrow")
+    table = batch.to_arrow()
+    assert table.num_rows == 2000
+    assert table.column_names == list(COLUMNS)
@@ -0,0 +1,83 @@
+import sys
+import csv
+import json
+
+import pytest
+
+sys.path.append('.')
+pytest.importorskip("numpy")
+
+from random_profile.bulk import COLUMNS
+from random_profile.enums.gender import Gender
+from random_profile.export import export_profiles, infer_format
+
+
+def read_jsonl(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_infer_format():
+    assert infer_format('out.jsonl') == 'jsonl'
+    assert infer_format('out.ndjson') == 'jsonl'
+    assert infer_format('out.CSV') == 'csv'
+    assert infer_format('out.parquet') == 'parquet'
+    with pytest.raises(ValueError):
+        infer_format('out.txt')
+
+
+def test_jsonl(tmp_path):
+    path = str(tmp_path / 'profiles.jsonl')
+    assert export_profiles(path, 250, chunk_size=100, workers=1, seed=1) == 250
+
+    profiles = read_jsonl(path)
+    assert len(profiles) == 250
+    assert len({profile['id'] for profile in profiles}) == 250
+    assert set(profiles[0]['address']) == {'street_num', 'street', 'city', 'state', 'zip_code'}
+
+
+def test_output_does_not_depend_on_workers(tmp_path):
+    single = str(tmp_path / 'single.jsonl')
+    pooled = str(tmp_path / 'pooled.jsonl')
+    export_profiles(single, 500, chunk_size=120, workers=1, seed=9)
+    export_profiles(pooled, 500, chunk_size=120, workers=3, seed=9)
+
+    with open(single, 'rb') as f, open(pooled, 'rb') as g:
+        assert f.read() == g.read()
+
+
+def test_csv(tmp_path):
+    path = str(tmp_path / 'profiles.csv')
+    export_profiles(path, 250, chunk_size=100, workers=2, seed=2, gender=Gender.MALE)
+
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == COLUMNS
+    assert len(rows) == 251
+    assert {row[COLUMNS.index('gender')] for row in rows[1:]} == {'Male'}
+
+
+def test_csv_empty(tmp_path):
+    path = str(tmp_path / 'profiles.csv')
+    export_profiles(path, 0, workers=1, seed=2)
+
+    with open(path, newline='') as f:
+        assert list(csv.reader(f)) == [list(COLUMNS)]
+
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / 'profiles.parquet')
+    export_profiles(path, 250, chunk_size=100, workers=1, seed=3)
+
+    table = pq.read_table(path)
+    assert table.num_rows == 250
+    assert table.column_names == list(COLUMNS)
+    assert pq.ParquetFile(path).num_row_groups == 3
+
+
+def test_invalid_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        export_profiles(str(tmp_path / 'profiles.xml'), 10, fmt='xml')
+    with pytest.raises(ValueError):
+        export_profiles(str(tmp_path / 'profiles.csv'), 10, chunk_size=0)
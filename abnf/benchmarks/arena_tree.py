@@ -0,0 +1,81 @@
+"""Compares parse trees of Node objects with arena parse trees on long inputs.
+
+    python benchmarks/arena_tree.py [repeat]
+
+For each input, prints the time per parse_all, the peak memory traced during the parse,
+the memory held by the returned tree, and the time to walk the whole tree, with and
+without arena=True.
+"""
+
+import gc
+import sys
+import timeit
+import tracemalloc
+import typing
+
+sys.path.insert(0, ".")
+
+from src.abnf1.grammars import rfc3986, rfc5322, rfc9110  # noqa: E402
+from src.abnf1.parser import Node, Rule  # noqa: E402
+
+CASES: typing.List[typing.Tuple[Rule, str]] = [
+    (rfc3986.Rule("path-abempty"), "/segment" * 500),
+    (rfc3986.Rule("query"), "key=value&" * 400),
+    (
+        rfc9110.Rule("Accept"),
+        ", ".join("text/html;q=0.%d" % (i % 10) for i in range(200)),
+    ),
+    (
+        rfc5322.Rule("address-list"),
+        ", ".join('"Joe Q. Public" <john.q.public@example.com>' for _ in range(30)),
+    ),
+]
+
+
+def walk(node: Node) -> int:
+    return 1 + sum(walk(child) for child in node.children)
+
+
+def memory(rule: Rule, source: str, arena: bool) -> typing.Tuple[int, int]:
+    tracemalloc.start()
+    try:
+        node = rule.parse_all(source, arena=arena)
+        gc.collect()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del node
+    return peak, held
+
+
+def main(repeat: int = 3) -> None:
+    print(
+        "%-14s %6s %5s %9s %10s %10s %9s"
+        % ("rule", "length", "arena", "parse", "peak", "tree", "walk")
+    )
+    for rule, source in CASES:
+        for arena in (False, True):
+            parse = min(
+                timeit.repeat(
+                    lambda: rule.parse_all(source, arena=arena), number=1, repeat=repeat
+                )
+            )
+            peak, held = memory(rule, source, arena)
+            node = rule.parse_all(source, arena=arena)
+            walk_time = min(timeit.repeat(lambda: walk(node), number=1, repeat=1))
+            print(
+                "%-14s %6d %5s %8.3fs %8.1fMB %8.2fMB %8.3fs"
+                % (
+                    rule.name,
+                    len(source),
+                    arena,
+                    parse,
+                    peak / 1e6,
+                    held / 1e6,
+                    walk_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
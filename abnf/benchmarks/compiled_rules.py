@@ -0,0 +1,63 @@
+"""Compares parsing with and without compiled rules.
+
+    python benchmarks/compiled_rules.py [repeat]
+
+For each input, prints the time per parse_all for the generic parser, for the compiled
+rule, and for the compiled rule plus walking the whole parse tree.
+"""
+
+import sys
+import timeit
+import typing
+
+sys.path.insert(0, ".")
+
+from src.abnf1.compiler import compile_grammar, uncompile_grammar  # noqa: E402
+from src.abnf1.grammars import rfc3986, rfc9110  # noqa: E402
+from src.abnf1.parser import Node, Rule  # noqa: E402
+
+CASES: typing.List[typing.Tuple[typing.Type[Rule], str, str]] = [
+    (rfc3986.Rule, "URI", "http://www.example.com/some/path/to/a/resource.html?query=string&foo=bar#frag"),
+    (rfc3986.Rule, "URI", "https://user:pass@[2001:db8::8a2e:370:7334]:8443/a/b/c?x=1"),
+    (rfc3986.Rule, "path-abempty", "/a/very/long/path" * 20),
+    (rfc3986.Rule, "query", "key=value&" * 40),
+    (rfc9110.Rule, "Accept", ", ".join("text/html;q=0.%d" % (i % 10) for i in range(20))),
+    (rfc9110.Rule, "Accept-Language", "en-US, en;q=0.9, fr-CA;q=0.8, de;q=0.7, *;q=0.5"),
+    (rfc9110.Rule, "Content-Type", 'multipart/form-data; boundary="----abc123"; charset=utf-8'),
+    (rfc9110.Rule, "Date", "Sun, 06 Nov 1994 08:49:37 GMT"),
+    (rfc9110.Rule, "If-None-Match", ", ".join('W/"etag-%d"' % i for i in range(20))),
+]
+
+
+def walk(node: Node) -> int:
+    return 1 + sum(walk(child) for child in node.children)
+
+
+def best(statement: typing.Callable[[], typing.Any], repeat: int) -> float:
+    return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def main(repeat: int = 5) -> None:
+    grammars = {rule_cls for rule_cls, _, _ in CASES}
+    print("%-16s %6s %12s %12s %12s %8s" % ("rule", "length", "generic", "compiled", "+tree", "speedup"))
+    for rule_cls, name, src in CASES:
+        rule = rule_cls(name)
+        for grammar in grammars:
+            uncompile_grammar(grammar)
+        generic = best(lambda: rule.parse_all(src), repeat)
+        generic_tree = rule.parse_all(src)
+
+        for grammar in grammars:
+            compile_grammar(grammar)
+        compiled = best(lambda: rule.parse_all(src), repeat)
+        tree = best(lambda: walk(rule.parse_all(src)), repeat)
+        assert rule.parse_all(src).value == generic_tree.value == src
+
+        print(
+            "%-16s %6d %10.2fms %10.2fms %10.2fms %7.0fx"
+            % (name, len(src), generic * 1e3, compiled * 1e3, tree * 1e3, generic / compiled)
+        )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,43 @@
+"""Compares importing grammars with an empty and with a warm grammar cache.
+
+    python benchmarks/grammar_import.py [repeat]
+
+Each import runs in a new interpreter, with ABNF_CACHE_DIR pointing to a temporary
+directory.  The cold time includes writing the cache file.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import typing
+
+GRAMMARS = ["rfc3986", "rfc5322", "rfc7230", "rfc9110"]
+
+
+def import_time(module: str, env: typing.Dict[str, str]) -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c", "import src.abnf1.grammars.%s" % module],
+        check=True,
+        env=env,
+    )
+    return time.perf_counter() - start
+
+
+def main(repeat: int = 3) -> None:
+    print("%-10s %10s %10s %10s" % ("grammar", "no cache", "cold", "warm"))
+    for module in GRAMMARS:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            env = dict(os.environ, ABNF_CACHE_DIR=cache_dir)
+            uncached = min(
+                import_time(module, dict(env, ABNF_NO_CACHE="1")) for _ in range(repeat)
+            )
+            cold = import_time(module, env)
+            warm = min(import_time(module, env) for _ in range(repeat))
+        print("%-10s %9.3fs %9.3fs %9.3fs" % (module, uncached, cold, warm))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,63 @@
+"""Measures the line rate of HeaderStream.
+
+    python benchmarks/header_stream.py [messages] [chunk size]
+
+Feeds a run of typical request header sections to HeaderStream, whole and split into
+chunks, with compiled rules and with Rule.recognize, and prints header lines per second.
+"""
+
+import sys
+import time
+import typing
+
+sys.path.insert(0, ".")
+
+from src.abnf1.streaming import NEED_DATA, EndOfHeaders, HeaderStream  # noqa: E402
+
+MESSAGE = (
+    b"GET /some/path/to/a/resource.html?query=string&foo=bar HTTP/1.1\r\n"
+    b"Host: www.example.com\r\n"
+    b"Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8\r\n"
+    b"Accept-Encoding: gzip, deflate, br\r\n"
+    b"Accept-Language: en-US, en;q=0.9, fr-CA;q=0.8\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Content-Type: text/plain; charset=utf-8\r\n"
+    b"If-Modified-Since: Sun, 06 Nov 1994 08:49:37 GMT\r\n"
+    b'If-None-Match: W/"etag-1", "etag-2"\r\n'
+    b"Cache-Control: no-cache\r\n"
+    b"X-Request-Id: 0b7f6c1e-8f2a-4c3e-9d1b-5a6e7f8091a2\r\n"
+    b"\r\n"
+)
+LINES = MESSAGE.count(b"\n")
+
+
+def run(messages: int, chunk_size: typing.Optional[int], compiled: bool) -> float:
+    chunks = (
+        [MESSAGE]
+        if chunk_size is None
+        else [MESSAGE[i : i + chunk_size] for i in range(0, len(MESSAGE), chunk_size)]
+    )
+    start = time.perf_counter()
+    for _ in range(messages):
+        stream = HeaderStream(compiled=compiled)
+        for chunk in chunks:
+            events = stream.feed(chunk)
+        assert events[-1] is not NEED_DATA and isinstance(events[-1], EndOfHeaders)
+    return messages * LINES / (time.perf_counter() - start)
+
+
+def main(messages: int = 2000, chunk_size: int = 64) -> None:
+    # the first message compiles the rules.
+    run(1, None, True)
+    print("%-24s %14s" % ("", "lines/s"))
+    for label, size, compiled in [
+        ("compiled, whole", None, True),
+        ("compiled, %d byte chunks" % chunk_size, chunk_size, True),
+        ("recognize, whole", None, False),
+    ]:
+        count = messages if compiled else max(1, messages // 50)
+        print("%-24s %14.0f" % (label, run(count, size, compiled)))
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
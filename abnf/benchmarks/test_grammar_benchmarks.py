@@ -0,0 +1,121 @@
+"""pytest-benchmark suite over representative inputs for the bundled grammars.
+
+    pip install pytest-benchmark
+    python -m pytest benchmarks/test_grammar_benchmarks.py
+    python -m pytest benchmarks/test_grammar_benchmarks.py --benchmark-autosave
+    python -m pytest benchmarks/test_grammar_benchmarks.py --benchmark-compare
+
+The suite is not part of tests/, so it does not run with the unit tests.  Each case is
+checked to parse before it is timed.
+"""
+
+import typing
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.abnf1.grammars import (  # noqa: E402
+    rfc3339,
+    rfc3986,
+    rfc5322,
+    rfc6265,
+    rfc7230,
+    rfc9110,
+)
+from src.abnf1.parser import Rule  # noqa: E402
+
+MESSAGE = (
+    "From: John Doe <jdoe@machine.example>\r\n"
+    "To: Mary Smith <mary@example.net>\r\n"
+    "Subject: Saying Hello\r\n"
+    "Date: Fri, 21 Nov 1997 09:55:06 -0600\r\n"
+    "Message-ID: <1234@local.machine.example>\r\n"
+    "\r\n"
+    "This is a message just to say hello.\r\n"
+    'So, "Hello".'
+)
+
+def case(name: str, rule: Rule, src: str) -> typing.Any:
+    return pytest.param(rule, src, id=name)
+
+
+CASES = [
+    # URIs
+    case("uri-simple", rfc3986.Rule("URI"), "http://www.example.com/index.html"),
+    case(
+        "uri-full",
+        rfc3986.Rule("URI"),
+        "https://user:pass@[2001:db8::8a2e:370:7334]:8443/a/b/c?x=1&y=2#frag",
+    ),
+    case(
+        "uri-urn",
+        rfc3986.Rule("URI"),
+        "urn:oasis:names:specification:docbook:dtd:xml:4.1.2",
+    ),
+    case("uri-reference", rfc3986.Rule("URI-reference"), "../../a/b%20c/d;p?q"),
+    # cookies
+    case(
+        "cookie",
+        rfc6265.Rule("cookie-string"),
+        "SID=31d4d96e407aad42; lang=en-US; theme=dark; _ga=GA1.2.1234567890.1234567890",
+    ),
+    case(
+        "set-cookie",
+        rfc6265.Rule("set-cookie-string"),
+        "SID=31d4d96e407aad42; Path=/; Domain=example.com; Secure; HttpOnly; "
+        "Expires=Wed, 09 Jun 2021 10:18:14 GMT",
+    ),
+    # dates
+    case("rfc3339-date-time", rfc3339.Rule("date-time"), "1985-04-12T23:20:50.52Z"),
+    case("rfc3339-offset", rfc3339.Rule("date-time"), "1996-12-19T16:39:57-08:00"),
+    case("http-date", rfc9110.Rule("HTTP-date"), "Sun, 06 Nov 1994 08:49:37 GMT"),
+    case(
+        "http-date-rfc850", rfc9110.Rule("HTTP-date"), "Sunday, 06-Nov-94 08:49:37 GMT"
+    ),
+    case("mail-date", rfc5322.Rule("date-time"), "Fri, 21 Nov 1997 09:55:06 -0600"),
+    # mail headers
+    case("mail-address", rfc5322.Rule("address"), "John Doe <jdoe@machine.example>"),
+    case(
+        "mail-address-list",
+        rfc5322.Rule("address-list"),
+        'Mary Smith <mary@x.test>, jdoe@example.org, "Who?" <one@y.test>',
+    ),
+    case("mail-message", rfc5322.Rule("message"), MESSAGE),
+    # HTTP
+    case(
+        "http-accept",
+        rfc9110.Rule("Accept"),
+        "text/html, application/xhtml+xml, application/xml;q=0.9, */*;q=0.8",
+    ),
+    case(
+        "http-content-type",
+        rfc9110.Rule("Content-Type"),
+        'multipart/form-data; boundary="----abc123"; charset=utf-8',
+    ),
+    case(
+        "http-request-line",
+        rfc7230.Rule("request-line"),
+        "GET /index.html?x=1 HTTP/1.1\r\n",
+    ),
+]
+
+
+@pytest.mark.parametrize("rule, src", CASES)
+def test_parse_all(benchmark: typing.Any, rule: Rule, src: str):
+    benchmark.group = "parse_all"
+    node = benchmark(rule.parse_all, src)
+    assert node.value == src
+
+
+@pytest.mark.parametrize("rule, src", CASES)
+def test_recognize(benchmark: typing.Any, rule: Rule, src: str):
+    benchmark.group = "recognize"
+    assert benchmark(rule.recognize, src)
+
+
+@pytest.mark.parametrize("rule, src", CASES)
+def test_parse_all_arena(benchmark: typing.Any, rule: Rule, src: str):
+    benchmark.group = "parse_all arena"
+    node = benchmark(rule.parse_all, src, arena=True)
+    assert node.value == src
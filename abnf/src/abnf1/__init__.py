@@ -7,14 +7,29 @@ if sys.version_info >= (3, 8):
 else:
     from importlib_metadata import metadata, PackageNotFoundError  # pragma: no cover
 
-from src.abnf1.parser import GrammarError, LiteralNode, Node, NodeVisitor, ParseError, Rule
+from src.abnf1.parser import (
+    ArenaNode,
+    GrammarError,
+    LazyNode,
+    LiteralNode,
+    Node,
+    NodeVisitor,
+    ParseError,
+    ParseProfile,
+    ParseSession,
+    Rule,
+)
 
 __all__ = [
     "Rule",
     "Node",
     "LiteralNode",
+    "LazyNode",
+    "ArenaNode",
     "NodeVisitor",
     "ParseError",
+    "ParseSession",
+    "ParseProfile",
     "GrammarError",
     "__version__",
 ]
@@ -0,0 +1,372 @@
+"""Compiles regular rules to DFAs.
+
+A rule is regular if it does not refer to itself, directly or through other rules, and
+uses no prose-vals, excluded rules or first-match alternation.  Such a rule can be
+matched by a deterministic finite automaton in a single pass over the source, instead
+of by the generic parser combinators, which allocate Match and Node objects for every
+character.
+
+    from abnf.compiler import compile_grammar
+    from abnf.grammars import rfc3986
+
+    compile_grammar(rfc3986.Rule)
+    node = rfc3986.Rule('URI').parse_all('http://example.com/a?b')
+
+A compiled rule returns LazyNode objects, whose children are parsed with the rule
+definition on first access; the value is available without building the tree.
+
+Compiled rules yield matches longest first.  For ambiguous grammars the tree built for
+a given match may therefore differ from the one built without compilation.
+
+Python's re module is not used because it reports a single match, while an ABNF parser
+needs every offset at which a rule can end in order to backtrack.
+"""
+
+from __future__ import annotations
+
+import functools
+import sys
+import typing
+from bisect import bisect_left, bisect_right
+
+from src.abnf1.parser import (
+    Alternation,
+    Concatenation,
+    Literal,
+    Option,
+    Parser,
+    Repetition,
+    Rule,
+)
+
+DEFAULT_MAX_NFA_STATES = 20000
+DEFAULT_MAX_DFA_STATES = 2000
+
+Interval = typing.Tuple[int, int]
+
+
+class NotRegularError(Exception):
+    """Raised when a rule cannot be compiled to a DFA."""
+
+
+# all cased characters are below this code point (Unicode 15).
+_CASED_LIMIT = 0x20000
+
+
+@functools.lru_cache(maxsize=None)
+def _casefold_table() -> typing.Dict[str, typing.Tuple[str, ...]]:
+    """Maps each single-character casefold to all characters that fold to it."""
+
+    table: typing.Dict[str, typing.List[str]] = {}
+    for code_point in range(_CASED_LIMIT):
+        char = chr(code_point)
+        folded = char.casefold()
+        if len(folded) == 1:
+            table.setdefault(folded, []).append(char)
+    return {key: tuple(value) for key, value in table.items()}
+
+
+def _folded_chars(folded: str) -> typing.Tuple[str, ...]:
+    return _casefold_table().get(folded, (folded,))
+
+
+def _char_intervals(chars: typing.Iterable[str]) -> typing.List[Interval]:
+    return [(ord(char), ord(char)) for char in chars]
+
+
+class _NFA:
+    """Thompson NFA; states are integers, edges carry inclusive code point intervals."""
+
+    def __init__(self, max_states: int):
+        self.max_states = max_states
+        self.epsilon: typing.List[typing.List[int]] = []
+        self.edges: typing.List[typing.List[typing.Tuple[int, int, int]]] = []
+
+    def new_state(self) -> int:
+        if len(self.epsilon) >= self.max_states:
+            raise NotRegularError("NFA exceeds %s states." % self.max_states)
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.epsilon) - 1
+
+    def fragment(self, intervals: typing.Iterable[Interval]) -> typing.Tuple[int, int]:
+        start, end = self.new_state(), self.new_state()
+        for low, high in intervals:
+            self.edges[start].append((low, high, end))
+        return start, end
+
+    def empty(self) -> typing.Tuple[int, int]:
+        start, end = self.new_state(), self.new_state()
+        self.epsilon[start].append(end)
+        return start, end
+
+
+class _NFABuilder:
+    def __init__(self, max_states: int):
+        self.nfa = _NFA(max_states)
+        self.rules: typing.List[Rule] = []
+
+    def build(self, parser: Parser) -> typing.Tuple[int, int]:
+        if isinstance(parser, Literal):
+            return self._literal(parser)
+        if isinstance(parser, Concatenation):
+            return self._concatenation(parser.parsers)
+        if isinstance(parser, Alternation):
+            if parser.first_match:
+                raise NotRegularError("First-match alternation %s." % parser)
+            return self._alternation(parser.parsers)
+        if isinstance(parser, Repetition):
+            return self._repetition(parser)
+        if isinstance(parser, Option):
+            return self.build(parser.parser)
+        if isinstance(parser, Rule):
+            return self._rule(parser)
+        raise NotRegularError("Unsupported parser %s." % parser)
+
+    def _literal(self, literal: Literal) -> typing.Tuple[int, int]:
+        if isinstance(literal.value, tuple):
+            low, high = literal.value
+            if len(low) != 1 or len(high) != 1:
+                raise NotRegularError("Unsupported range %s." % literal)
+            return self.nfa.fragment([(ord(low), ord(high))])
+
+        if not literal.value:
+            # an empty literal fails at the end of the source; a DFA cannot express that.
+            raise NotRegularError("Empty literal.")
+        if literal.case_sensitive:
+            chars = [_char_intervals(char) for char in literal.value]
+        else:
+            if len(literal.pattern) != len(literal.value):
+                raise NotRegularError("Unsupported literal %s." % literal)
+            chars = [_char_intervals(_folded_chars(char)) for char in literal.pattern]
+        return self._sequence(self.nfa.fragment(intervals) for intervals in chars)
+
+    def _sequence(
+        self, fragments: typing.Iterable[typing.Tuple[int, int]]
+    ) -> typing.Tuple[int, int]:
+        start, end = self.nfa.empty()
+        for fragment_start, fragment_end in fragments:
+            self.nfa.epsilon[end].append(fragment_start)
+            end = fragment_end
+        return start, end
+
+    def _concatenation(
+        self, parsers: typing.Sequence[Parser]
+    ) -> typing.Tuple[int, int]:
+        return self._sequence(self.build(parser) for parser in parsers)
+
+    def _alternation(self, parsers: typing.Sequence[Parser]) -> typing.Tuple[int, int]:
+        start, end = self.nfa.new_state(), self.nfa.new_state()
+        for parser in parsers:
+            fragment_start, fragment_end = self.build(parser)
+            self.nfa.epsilon[start].append(fragment_start)
+            self.nfa.epsilon[fragment_end].append(end)
+        return start, end
+
+    def _repetition(self, repetition: Repetition) -> typing.Tuple[int, int]:
+        repeat, element = repetition.repeat, repetition.element
+        fragments = [self.build(element) for _ in range(repeat.min)]
+        if repeat.max is None:
+            loop_start, loop_end = self.nfa.empty()
+            element_start, element_end = self.build(element)
+            self.nfa.epsilon[loop_start].append(element_start)
+            self.nfa.epsilon[element_end].append(loop_start)
+            fragments.append((loop_start, loop_end))
+        else:
+            for _ in range(repeat.max - repeat.min):
+                option_start, option_end = self.nfa.empty()
+                element_start, element_end = self.build(element)
+                self.nfa.epsilon[option_start].append(element_start)
+                self.nfa.epsilon[element_end].append(option_end)
+                fragments.append((option_start, option_end))
+        return self._sequence(fragments)
+
+    def _rule(self, rule: Rule) -> typing.Tuple[int, int]:
+        if rule in self.rules:
+            raise NotRegularError("Recursive rule %s." % rule)
+        if rule.exclude is not None:
+            raise NotRegularError("Rule %s has an excluded rule." % rule)
+        try:
+            definition = rule.definition
+        except AttributeError as exc:
+            raise NotRegularError("Undefined rule %s." % rule) from exc
+        self.rules.append(rule)
+        try:
+            return self.build(definition)
+        finally:
+            self.rules.pop()
+
+
+class DFA:
+    """A table-driven DFA over code point classes.
+
+    Class i holds the code points in [boundaries[i], boundaries[i + 1]).  transitions[s]
+    maps class to next state; state 0 is the start state.
+    """
+
+    def __init__(
+        self,
+        boundaries: typing.List[int],
+        transitions: typing.List[typing.Dict[int, int]],
+        accepting: typing.List[bool],
+    ):
+        self.boundaries = boundaries
+        self.transitions = transitions
+        self.accepting = accepting
+        # per state, character -> next state (-1 for none); filled in as characters are seen.
+        self._steps: typing.List[typing.Dict[str, int]] = [{} for _ in transitions]
+
+    def __len__(self):
+        return len(self.transitions)
+
+    def __str__(self):
+        return "%s(states=%s, classes=%s)" % (
+            self.__class__.__name__,
+            len(self),
+            len(self.boundaries),
+        )
+
+    def _step(self, state: int, char: str) -> int:
+        char_class = bisect_right(self.boundaries, ord(char)) - 1
+        next_state = self.transitions[state].get(char_class, -1)
+        self._steps[state][char] = next_state
+        return next_state
+
+    def ends(self, source: str, start: int) -> typing.List[int]:
+        """Returns, in increasing order, every offset at which a match beginning at start
+        can end."""
+
+        accepting = self.accepting
+        steps = self._steps
+        ends = [start] if accepting[0] else []
+        state = 0
+        for offset in range(start, len(source)):
+            char = source[offset]
+            next_state = steps[state].get(char)
+            if next_state is None:
+                next_state = self._step(state, char)
+            if next_state < 0:
+                break
+            state = next_state
+            if accepting[state]:
+                ends.append(offset + 1)
+        return ends
+
+    def match(self, source: str, start: int = 0) -> typing.Optional[int]:
+        """Returns the end of the longest match beginning at start, or None."""
+
+        ends = self.ends(source, start)
+        return ends[-1] if ends else None
+
+
+class _Closures:
+    """Epsilon closures of NFA states, reduced to the states that matter to the DFA:
+    those with character edges, and the final state."""
+
+    def __init__(self, nfa: _NFA, end: int):
+        self.nfa = nfa
+        self.end = end
+        self.closures: typing.Dict[int, typing.FrozenSet[int]] = {}
+
+    def state(self, state: int) -> typing.FrozenSet[int]:
+        try:
+            return self.closures[state]
+        except KeyError:
+            pass
+        epsilon, edges = self.nfa.epsilon, self.nfa.edges
+        stack = [state]
+        seen = {state}
+        while stack:
+            for target in epsilon[stack.pop()]:
+                if target not in seen:
+                    seen.add(target)
+                    stack.append(target)
+        closure = frozenset(s for s in seen if edges[s] or s == self.end)
+        self.closures[state] = closure
+        return closure
+
+    def states(self, states: typing.Iterable[int]) -> typing.FrozenSet[int]:
+        return frozenset().union(*(self.state(state) for state in states))
+
+
+def _determinize(nfa: _NFA, start: int, end: int, max_states: int) -> DFA:
+    points = {0}
+    for edges in nfa.edges:
+        for low, high, _ in edges:
+            points.add(low)
+            points.add(high + 1)
+    boundaries = sorted(points)
+    closures = _Closures(nfa, end)
+
+    start_set = closures.state(start)
+    index = {start_set: 0}
+    state_sets = [start_set]
+    transitions: typing.List[typing.Dict[int, int]] = []
+    accepting: typing.List[bool] = []
+    while len(transitions) < len(state_sets):
+        state_set = state_sets[len(transitions)]
+        accepting.append(end in state_set)
+        moves: typing.Dict[int, typing.Set[int]] = {}
+        for state in state_set:
+            for low, high, target in nfa.edges[state]:
+                for char_class in range(
+                    bisect_left(boundaries, low), bisect_left(boundaries, high + 1)
+                ):
+                    moves.setdefault(char_class, set()).add(target)
+        row: typing.Dict[int, int] = {}
+        for char_class, targets in moves.items():
+            target_set = closures.states(targets)
+            if target_set not in index:
+                if len(state_sets) >= max_states:
+                    raise NotRegularError("DFA exceeds %s states." % max_states)
+                index[target_set] = len(state_sets)
+                state_sets.append(target_set)
+            row[char_class] = index[target_set]
+        transitions.append(row)
+    return DFA(boundaries, transitions, accepting)
+
+
+def compile_rule(
+    rule: Rule,
+    max_nfa_states: int = DEFAULT_MAX_NFA_STATES,
+    max_dfa_states: int = DEFAULT_MAX_DFA_STATES,
+) -> DFA:
+    """Compiles rule to a DFA.  Rules it refers to are inlined.
+
+    :raises NotRegularError: if rule is not regular, or the automaton would exceed the
+        given number of states.
+    """
+
+    builder = _NFABuilder(max_nfa_states)
+    start, end = builder.build(rule)
+    return _determinize(builder.nfa, start, end, max_dfa_states)
+
+
+def compile_grammar(
+    rule_cls: typing.Type[Rule],
+    max_nfa_states: int = DEFAULT_MAX_NFA_STATES,
+    max_dfa_states: int = DEFAULT_MAX_DFA_STATES,
+) -> typing.List[Rule]:
+    """Compiles every regular rule of rule_cls, so that Rule.lparse matches it with a DFA.
+    Call this after the grammar is loaded; rules changed afterwards should be compiled
+    again.
+
+    :returns: the rules that were compiled.
+    """
+
+    compiled = []
+    for rule in rule_cls.rules():
+        rule.matcher = None
+        try:
+            rule.matcher = compile_rule(rule, max_nfa_states, max_dfa_states)
+        except NotRegularError:
+            continue
+        compiled.append(rule)
+    return compiled
+
+
+def uncompile_grammar(rule_cls: typing.Type[Rule]) -> None:
+    """Removes compiled DFAs from the rules of rule_cls."""
+
+    for rule in rule_cls.rules():
+        rule.matcher = None
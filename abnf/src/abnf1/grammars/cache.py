@@ -0,0 +1,208 @@
+"""On-disk cache of loaded grammars.
+
+Building a grammar means parsing the ABNF source of every rule and walking the parse
+trees, which takes seconds for the larger RFC grammars.  The load_grammar_rules and
+load_grammar decorators therefore pickle the rules they build, and later imports load
+the pickle instead.
+
+Cache files live in a subdirectory named after a digest of the abnf version and parser
+source, so environments with different versions of abnf don't share (or remove) each
+other's files.  Within it, a cache file is keyed by a hash of the grammar source and the
+names of imported rules, so any change to those builds the grammar again.
+Imported rules are not stored; they are assigned again after loading, from the module
+that defines them.
+
+The cache lives in $ABNF_CACHE_DIR, or else $XDG_CACHE_HOME/abnf (~/.cache/abnf).  Files
+not owned by the current user are ignored.
+Set ABNF_NO_CACHE=1, or set grammar_cache_enabled to False before importing grammars,
+to turn it off.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import importlib
+import os
+import pathlib
+import pickle
+import tempfile
+import typing
+
+from src.abnf1 import __version__
+from src.abnf1 import parser
+from src.abnf1.parser import Rule
+
+CACHE_DIR_ENV = "ABNF_CACHE_DIR"
+NO_CACHE_ENV = "ABNF_NO_CACHE"
+
+# bump when the layout of cache files changes.
+CACHE_FORMAT = 1
+
+grammar_cache_enabled = True
+
+RuleFactory = typing.Callable[[], None]
+
+
+def cache_dir() -> pathlib.Path:
+    """Returns the directory that holds the grammar cache."""
+
+    path = os.environ.get(CACHE_DIR_ENV)
+    if path:
+        return pathlib.Path(path)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return pathlib.Path(xdg_cache) / "abnf"
+
+
+def cache_enabled() -> bool:
+    return grammar_cache_enabled and not os.environ.get(NO_CACHE_ENV)
+
+
+@functools.lru_cache(maxsize=None)
+def _library_digest() -> str:
+    # __version__ is empty for a source checkout, so the parser source is hashed too.
+    digest = hashlib.sha256()
+    digest.update(("%d\0%s\0" % (CACHE_FORMAT, __version__)).encode("utf-8"))
+    with open(parser.__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def _namespace_dir() -> pathlib.Path:
+    return cache_dir() / ("v%d-%s" % (CACHE_FORMAT, _library_digest()))
+
+
+def _grammar_key(rule_cls: typing.Type[Rule], imported_names: typing.List[str]) -> str:
+    grammar = rule_cls.grammar
+    source = grammar if isinstance(grammar, str) else "\r\n".join(grammar)
+    digest = hashlib.sha256()
+    for part in [
+        rule_cls.__module__,
+        rule_cls.__qualname__,
+        source,
+        *imported_names,
+    ]:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:32]
+
+
+def _cache_prefix(rule_cls: typing.Type[Rule]) -> str:
+    return "%s.%s-" % (rule_cls.__module__, rule_cls.__qualname__)
+
+
+def _cache_path(rule_cls: typing.Type[Rule], key: str) -> pathlib.Path:
+    return _namespace_dir() / ("%s%s.pickle" % (_cache_prefix(rule_cls), key))
+
+
+class _GrammarPickler(pickle.Pickler):
+    """Pickles the rules of one grammar.  Rules of other grammars, core rules and
+    imported rules are stored as references."""
+
+    def __init__(
+        self,
+        file: typing.BinaryIO,
+        rule_cls: typing.Type[Rule],
+        imported_names: typing.List[str],
+    ):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rule_cls = rule_cls
+        self.imported_names = {name.casefold() for name in imported_names}
+
+    def persistent_id(self, obj: typing.Any) -> typing.Optional[typing.Tuple[str, ...]]:
+        # the decorator runs before the class is bound to its name in the module, so
+        # the grammar class and its imported rules cannot be pickled by reference.
+        if obj is self.rule_cls:
+            return ("grammar",)
+        if isinstance(obj, Rule):
+            if type(obj) is not self.rule_cls:
+                return ("rule", type(obj).__module__, type(obj).__qualname__, obj.name)
+            if obj.name.casefold() in self.imported_names:
+                return ("imported", obj.name)
+        return None
+
+
+class _GrammarUnpickler(pickle.Unpickler):
+    def __init__(self, file: typing.BinaryIO, rule_cls: typing.Type[Rule]):
+        super().__init__(file)
+        self.rule_cls = rule_cls
+
+    def persistent_load(self, pid: typing.Tuple[str, ...]) -> typing.Any:
+        if pid[0] == "grammar":
+            return self.rule_cls
+        if pid[0] == "imported":
+            return self.rule_cls(pid[1])
+        kind, module, qualname, name = pid
+        if kind != "rule":
+            raise pickle.UnpicklingError("Unknown persistent id %r." % (pid,))
+        obj: typing.Any = importlib.import_module(module)
+        for attr in qualname.split("."):
+            obj = getattr(obj, attr)
+        return obj(name)
+
+
+def _load(rule_cls: typing.Type[Rule], path: pathlib.Path) -> bool:
+    try:
+        if hasattr(os, "getuid") and path.stat().st_uid != os.getuid():
+            # someone else could have written it; unpickling runs arbitrary code.
+            return False
+        with path.open("rb") as f:
+            names = pickle.load(f)
+            # create the rules in their original order before any definition refers
+            # to them.
+            for name in names:
+                rule_cls(name)
+            _GrammarUnpickler(f, rule_cls).load()
+    except FileNotFoundError:
+        return False
+    except Exception:  # pylint: disable=broad-except
+        # a damaged or incompatible cache file; the grammar is built again.
+        return False
+    return True
+
+
+def _store(
+    rule_cls: typing.Type[Rule], imported_names: typing.List[str], path: pathlib.Path
+) -> None:
+    rules = rule_cls.rules()
+    try:
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump([rule.name for rule in rules], f)
+                _GrammarPickler(f, rule_cls, imported_names).dump(rules)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        # remove files left by earlier versions of the grammar, with this version of abnf.
+        for stale in path.parent.glob(_cache_prefix(rule_cls) + "*.pickle"):
+            if stale != path:
+                stale.unlink()
+    except (OSError, pickle.PicklingError, RecursionError):
+        # the cache is an optimization; a read-only home directory is not an error.
+        pass
+
+
+def load_cached(
+    rule_cls: typing.Type[Rule],
+    build: RuleFactory,
+    imported_rules: typing.Optional[typing.List[typing.Tuple[str, Rule]]] = None,
+) -> None:
+    """Populates rule_cls from the grammar cache, or calls build and caches the result.
+    imported rules are assigned in either case."""
+
+    imported_rules = imported_rules or []
+    imported_names = [name for name, _ in imported_rules]
+    if cache_enabled():
+        path = _cache_path(rule_cls, _grammar_key(rule_cls, imported_names))
+        if not _load(rule_cls, path):
+            build()
+            _store(rule_cls, imported_names, path)
+    else:
+        build()
+    for name, rule in imported_rules:
+        rule_cls(name, rule.definition)
@@ -2,12 +2,14 @@
 
 from typing import List, Optional, Tuple, Type
 from src.abnf1.parser import Rule
+from .cache import load_cached
 
 def load_grammar_rules(imported_rules: Optional[List[Tuple[str, Rule]]]=None):
     """A decorator that loads grammar rules following class declaration.  The code assumes
     that cls is a Rule subclass with a grammar attribute.
     The imported_rules parameter allows one to import rules from other modules. For examples,
     see for instance rfc7230.py.
+    The rules built are kept in the grammar cache; see cache.py.
     """
 
     def rule_decorator(cls: Type[Rule]):
@@ -16,11 +18,11 @@ def load_grammar_rules(imported_rules: Optional[List[Tuple[str, Rule]]]=None):
         if isinstance(cls.grammar, str):
             raise TypeError('This decorator must be used with a grammar of tyoe list')
 
-        for src in cls.grammar:
-            cls.create(src)
-        if imported_rules:
-            for rule_def in imported_rules:
-                cls(rule_def[0], rule_def[1].definition)
+        def build():
+            for src in cls.grammar:
+                cls.create(src)
+
+        load_cached(cls, build, imported_rules)
         return cls
 
     return rule_decorator
@@ -31,16 +33,15 @@ def load_grammar(imported_rules: Optional[List[Tuple[str, Rule]]]=None):
     that cls is a Rule subclass with a grammar attribute.
     The imported_rules parameter allows one to import rules from other modules. For examples,
     see for instance rfc7230.py.
+    The rules built are kept in the grammar cache; see cache.py.
     """
 
     def rule_decorator(cls: Type[Rule]):
         """The function returned by decorator."""
         if isinstance(cls.grammar, list):
             raise TypeError('This decorator must be used with a grammar of tyoe str.')
-        cls.load_grammar(cls.grammar)
-        if imported_rules:
-            for rule_def in imported_rules:
-                cls(rule_def[0], rule_def[1].definition)
+        grammar = cls.grammar
+        load_cached(cls, lambda: cls.load_grammar(grammar), imported_rules)
         return cls
 
     return rule_decorator
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import functools
+import json
 import pathlib
+import time
 import typing
-from collections import OrderedDict
-from itertools import filterfalse
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import filterfalse, islice
 from weakref import WeakSet
 
 from .typing import Protocol
@@ -13,10 +20,18 @@ Nodes = typing.List["Node"]
 
 
 class Match:
+    __slots__ = ("nodes", "start")
+
     def __init__(self, nodes: Nodes, start: int):
         self.nodes = nodes
         self.start = start
 
+    def extend(self, other: Match) -> Match:
+        """Returns the match of self followed by other."""
+        if not self.nodes:
+            return other
+        return Match(self.nodes + other.nodes, other.start)
+
     def __hash__(self) -> int:
         value = "".join(n.value for n in self.nodes)
         return hash((value, self.start))
@@ -38,7 +53,18 @@ def sorted_by_longest_match(matches: typing.Iterable[Match]) -> list[Match]:
     return sorted(matches, key=lambda item: item.start, reverse=True)
 
 
-def next_longest(matches: MatchSet):
+def unique_matches(matches: typing.Iterable[Match]) -> dict[int, Match]:
+    """Dedupes matches that begin at the same offset.  Two such matches that also end
+    at the same offset consume the same text, so they are equal; this avoids hashing
+    the full match value.  The first match for each end offset is kept."""
+    unique: dict[int, Match] = {}
+    for match in matches:
+        if match.start not in unique:
+            unique[match.start] = match
+    return unique
+
+
+def next_longest(matches: typing.Iterable[Match]):
     for match in sorted_by_longest_match([x for x in matches]):
         yield match
 
@@ -52,6 +78,11 @@ class Parser(Protocol):
         ...  # pragma: no cover
 
 
+class Matcher(Protocol):
+    def ends(self, source: Source, start: int) -> typing.List[int]:
+        ...  # pragma: no cover
+
+
 ParseCacheKey = typing.Tuple[str, int]
 ParseCacheValue = typing.Union[MatchSet, "ParseError"]
 
@@ -123,6 +154,229 @@ class ParseCache(typing.MutableMapping[ParseCacheKey, ParseCacheValue]):
             yield obj
 
 
+Ends = typing.Collection[int]
+MemoKey = typing.Tuple[int, int]
+MemoValue = typing.Tuple[
+    Parser, typing.Union[typing.Tuple[Match, ...], "ParseError", Parser]
+]
+EndsMemoValue = typing.Tuple[Parser, Ends]
+
+
+class ParseSession:
+    """Packrat memo table for a single parse.  Results of Rule, Alternation,
+    Concatenation and Repetition are stored by (id(parser), offset), so each parser is
+    evaluated at most once per offset.  Rule.parse and Rule.parse_all start a fresh
+    session for every call; pass one in to set a size bound or to read the stats
+    afterwards.
+
+        session = ParseSession(max_size=10000)
+        rfc5322.Rule('message').parse_all(source, session=session)
+        print(session.hits, session.misses)
+    """
+
+    max_memo_size: typing.Optional[int] = None
+
+    def __init__(self, max_size: typing.Optional[int] = None):
+        if max_size is None:
+            max_size = self.max_memo_size
+        if max_size and max_size < 0:
+            raise ValueError("max size must be non-negative.")
+        self.max_size = max_size
+        self.source: typing.Optional[Source] = None
+        self.arena: typing.Optional[MatchArena] = None
+        self.profile: typing.Optional[ParseProfile] = None
+        self.memo: dict[MemoKey, MemoValue] = {}
+        self.ends_memo: dict[MemoKey, EndsMemoValue] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.memo) + len(self.ends_memo)
+
+    def __str__(self):
+        return f"{self.__class__.__name__}(max_size = {self.max_size}, size = {len(self)}, misses = {self.misses}, hits = {self.hits})"
+
+    def reset(self, source: typing.Optional[Source] = None) -> None:
+        self.source = source
+        self.memo = {}
+        self.ends_memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    @contextlib.contextmanager
+    def activate(
+        self,
+        source: Source,
+        arena: bool = False,
+        profile: typing.Optional[ParseProfile] = None,
+    ) -> typing.Iterator[ParseSession]:
+        """Resets the session and makes it the active session for source.  If arena is
+        True, matches are recorded in a MatchArena instead of lists of Node objects.
+        Rule calls are recorded in profile, if given.  On exit the memo tables are
+        released; the stats are kept."""
+
+        self.reset(source)
+        self.arena = MatchArena(source) if arena else None
+        self.profile = profile
+        token = _current_session.set(self)
+        try:
+            yield self
+        finally:
+            _current_session.reset(token)
+            self.source = None
+            self.arena = None
+            self.profile = None
+            self.memo = {}
+            self.ends_memo = {}
+
+    def _make_room(self, memo: dict[MemoKey, typing.Any]) -> None:
+        # entries are evicted oldest first; those are the ones furthest behind
+        # the current offset.
+        if self.max_size and len(memo) >= self.max_size:
+            del memo[next(iter(memo))]
+
+    def lparse(
+        self,
+        parser: Parser,
+        lparse: typing.Callable[[typing.Any, Source, int], Matches],
+        source: Source,
+        start: int,
+    ) -> Matches:
+        key = (id(parser), start)
+        try:
+            _, value = self.memo[key]
+        except KeyError:
+            self.misses = self.misses + 1
+            try:
+                value = tuple(lparse(parser, source, start))
+            except ParseError as exc:
+                # a failure at start is stored as the parser that raised it; otherwise
+                # a bare copy, since the traceback would keep every frame of the failed
+                # parse alive.
+                if exc.start == start:
+                    value = exc.parser
+                else:
+                    value = ParseError(exc.parser, exc.start)
+            self._make_room(self.memo)
+            # the entry holds on to parser so that its id is not reused by another
+            # parser while the entry exists.
+            self.memo[key] = (parser, value)
+        else:
+            self.hits = self.hits + 1
+
+        if isinstance(value, tuple):
+            yield from value
+        # raise a fresh exception so that tracebacks do not pile up on a cached one.
+        elif isinstance(value, ParseError):
+            raise ParseError(value.parser, value.start)
+        else:
+            raise ParseError(value, start)
+
+    def ends(
+        self,
+        parser: Parser,
+        ends: typing.Callable[[typing.Any, Source, int], Ends],
+        source: Source,
+        start: int,
+    ) -> Ends:
+        key = (id(parser), start)
+        try:
+            _, value = self.ends_memo[key]
+        except KeyError:
+            self.misses = self.misses + 1
+            value = ends(parser, source, start)
+            self._make_room(self.ends_memo)
+            self.ends_memo[key] = (parser, value)
+        else:
+            self.hits = self.hits + 1
+        return value
+
+
+_current_session: contextvars.ContextVar[
+    typing.Optional[ParseSession]
+] = contextvars.ContextVar("abnf_parse_session", default=None)
+
+
+def active_session(source: Source) -> typing.Optional[ParseSession]:
+    """Returns the ParseSession of the parse in progress on source, if any."""
+    session = _current_session.get()
+    if session is None or session.source is not source:
+        return None
+    return session
+
+
+def active_arena(source: Source) -> typing.Optional[MatchArena]:
+    """Returns the MatchArena of the parse in progress on source, if any."""
+    session = _current_session.get()
+    if session is None or session.source is not source:
+        return None
+    return session.arena
+
+
+def active_profile(source: Source) -> typing.Optional[ParseProfile]:
+    """Returns the ParseProfile of the parse in progress on source, if any."""
+    session = _current_session.get()
+    if session is None or session.source is not source:
+        return None
+    return session.profile
+
+
+def memoized(lparse: typing.Callable[[typing.Any, Source, int], Matches]):
+    """Decorator for lparse methods; results are looked up in the active ParseSession
+    when there is one for source."""
+
+    @functools.wraps(lparse)
+    def wrapper(self: typing.Any, source: Source, start: int) -> Matches:
+        session = active_session(source)
+        if session is None:
+            return lparse(self, source, start)
+        return session.lparse(self, lparse, source, start)
+
+    return wrapper
+
+
+def memoized_ends(ends: typing.Callable[[typing.Any, Source, int], Ends]):
+    """Decorator for ends methods; the counterpart of memoized."""
+
+    @functools.wraps(ends)
+    def wrapper(self: typing.Any, source: Source, start: int) -> Ends:
+        session = active_session(source)
+        if session is None:
+            return ends(self, source, start)
+        return session.ends(self, ends, source, start)
+
+    return wrapper
+
+
+def profiled(lparse: typing.Callable[[typing.Any, Source, int], Matches]):
+    """Decorator for Rule.lparse; calls are recorded in the ParseProfile of the active
+    ParseSession, if it has one."""
+
+    @functools.wraps(lparse)
+    def wrapper(self: typing.Any, source: Source, start: int) -> Matches:
+        profile = active_profile(source)
+        if profile is None:
+            return lparse(self, source, start)
+        return profile.lparse(self, lparse, source, start)
+
+    return wrapper
+
+
+def parser_ends(parser: Parser, source: Source, start: int) -> Ends:
+    """Returns the offsets at which matches of parser beginning at start end, without
+    building Match or Node objects.  Parsers without an ends method fall back to
+    lparse."""
+
+    try:
+        ends = getattr(parser, "ends")
+    except AttributeError:
+        try:
+            return {match.start for match in parser.lparse(source, start)}
+        except ParseError:
+            return ()
+    return ends(source, start)
+
+
 class Alternation:  # pylint: disable=too-few-public-methods
     """Implements the ABNF alternation operator. -- Alternation(parser1, parser2, ...)
     returns a parser that invokes parser1, parser2, ... in turn and returns the result
@@ -134,8 +388,10 @@ class Alternation:  # pylint: disable=too-few-public-methods
         self.parsers = list(parsers)
         self.first_match = first_match
 
+    @memoized
     def lparse(self, source: Source, start: int) -> Matches:
         match_found = False
+        fan_out = 0
         for parser in self.parsers:
             try:
                 # note that parser,lparse could return an empty list, say from
@@ -145,11 +401,27 @@ class Alternation:  # pylint: disable=too-few-public-methods
                     yield (item)
             except ParseError:
                 continue
+            fan_out = fan_out + 1
             if self.first_match:
-                return
-        if not match_found:
+                break
+        profile = active_profile(source)
+        if profile is not None:
+            profile.alternation(fan_out)
+        # with first_match, the first alternative that does not fail ends the
+        # alternation, even if it yielded nothing.
+        if not match_found and not (self.first_match and fan_out):
             raise ParseError(self, start)
 
+    @memoized_ends
+    def ends(self, source: Source, start: int) -> Ends:
+        ends: typing.Set[int] = set()
+        for parser in self.parsers:
+            parser_matches = parser_ends(parser, source, start)
+            ends.update(parser_matches)
+            if self.first_match and parser_matches:
+                break
+        return ends
+
     def __str__(self):
         return self.str_template % ", ".join(map(str, self.parsers))
 
@@ -165,6 +437,7 @@ class Concatenation:  # pylint: disable=too-few-public-methods
     def __init__(self, *parsers: Parser):
         self.parsers = parsers
 
+    @memoized
     def lparse(self, source: Source, start: int):
         match_list: list[Match] = [Match([], start)]
         for parser in self.parsers:
@@ -172,7 +445,7 @@ class Concatenation:  # pylint: disable=too-few-public-methods
             for match in match_list:
                 try:
                     for m in parser.lparse(source, match.start):
-                        current_match_list.append(Match(match.nodes + m.nodes, m.start))
+                        current_match_list.append(match.extend(m))
                 except ParseError:
                     pass
             if current_match_list:
@@ -182,6 +455,18 @@ class Concatenation:  # pylint: disable=too-few-public-methods
         for match in sorted_by_longest_match(match_list):
             yield match
 
+    @memoized_ends
+    def ends(self, source: Source, start: int) -> Ends:
+        ends: typing.Set[int] = {start}
+        for parser in self.parsers:
+            next_ends: typing.Set[int] = set()
+            for end in ends:
+                next_ends.update(parser_ends(parser, source, end))
+            if not next_ends:
+                return ()
+            ends = next_ends
+        return ends
+
     def __str__(self):
         return self.str_template % ", ".join(map(str, self.parsers))
 
@@ -208,6 +493,12 @@ class Repetition:  # pylint: disable=too-few-public-methods
         self.lparse_cache = ParseCache()
 
     def lparse(self, source: Source, start: int) -> Matches:
+        if active_session(source) is not None:
+            # the session memo takes the place of lparse_cache.
+            return self._lparse(source, start)
+        return self._lparse_cached(source, start)
+
+    def _lparse_cached(self, source: Source, start: int) -> Matches:
         cache_key = (source, start)
         try:
             cached_matchset = self.lparse_cache[cache_key]
@@ -220,44 +511,83 @@ class Repetition:  # pylint: disable=too-few-public-methods
                 yield match
             return
 
+        try:
+            match_set = set(self._lparse(source, start))
+        except ParseError as exc:
+            self.lparse_cache[cache_key] = exc
+            raise
+
+        self.lparse_cache[cache_key] = match_set
+        for match in next_longest(match_set):
+            yield match
+
+    @memoized
+    def _lparse(self, source: Source, start: int) -> Matches:
+        # all matches begin at start, so they are keyed by their end offset.
         if self.repeat.min == 0:
-            match_set: MatchSet = set([Match([], start)])
+            matches = {start: Match([], start)}
         else:
             concat_parser = Concatenation(*([self.element] * self.repeat.min))
-            try:
-                # if this raises a ParseError, then the minimum match was not reached.
-                match_set = set(concat_parser.lparse(source, start))
-            except ParseError as exc:
-                self.lparse_cache[cache_key] = exc
-                raise
+            # if this raises a ParseError, then the minimum match was not reached.
+            matches = unique_matches(concat_parser.lparse(source, start))
 
-        last_match_set = set(match_set)
+        last_matches = matches
         match_count = self.repeat.min
 
         while True:
             if self.repeat.max is not None and match_count == self.repeat.max:
                 break
 
-            new_match_set: MatchSet = set()
-            for match in last_match_set:
+            new_matches: dict[int, Match] = {}
+            for match in last_matches.values():
                 g = self.element.lparse(source, match.start)
                 try:
-                    for item in (Match(match.nodes + m.nodes, m.start) for m in g):
-                        new_match_set.add(item)
+                    for m in g:
+                        if m.start not in new_matches:
+                            new_matches[m.start] = match.extend(m)
                 except ParseError:
                     pass
 
-            if not new_match_set <= match_set:
+            if not new_matches.keys() <= matches.keys():
                 match_count = match_count + 1
-                match_set = match_set | new_match_set
-                last_match_set = new_match_set
+                matches = {**new_matches, **matches}
+                last_matches = new_matches
             else:
                 break
 
-        self.lparse_cache[cache_key] = match_set
-        for match in next_longest(match_set):
+        for match in next_longest(matches.values()):
             yield match
 
+    @memoized_ends
+    def ends(self, source: Source, start: int) -> Ends:
+        ends: typing.Set[int] = {start}
+        for _ in range(self.repeat.min):
+            next_ends: typing.Set[int] = set()
+            for end in ends:
+                next_ends.update(parser_ends(self.element, source, end))
+            if not next_ends:
+                return ()
+            ends = next_ends
+
+        last_ends = ends
+        match_count = self.repeat.min
+        while self.repeat.max is None or match_count < self.repeat.max:
+            new_ends: typing.Set[int] = set()
+            for end in last_ends:
+                new_ends.update(parser_ends(self.element, source, end))
+            if new_ends <= ends:
+                break
+            match_count = match_count + 1
+            ends = ends | new_ends
+            last_ends = new_ends
+        return ends
+
+    def __getstate__(self):
+        # cached results are not worth pickling.
+        state = self.__dict__.copy()
+        state["lparse_cache"] = ParseCache(self.lparse_cache.max_size)
+        return state
+
     def __str__(self):
         return "Repetition(%s, %s)" % (self.repeat, self.element)
 
@@ -282,6 +612,9 @@ class Option:  # pylint: disable=too-few-public-methods
         """
         return self.parser.lparse(source, start)
 
+    def ends(self, source: Source, start: int) -> Ends:
+        return self.parser.ends(source, start)
+
     def __str__(self):
         return self.str_template % str(self.alternation)
 
@@ -326,12 +659,24 @@ class Literal:  # pylint: disable=too-few-public-methods
         try:
             src = source[start]
             if self.value[0] <= src <= self.value[1]:
-                yield Match([typing.cast(Node, LiteralNode(src, start, 1))], start + 1)
+                yield literal_match(source, start, start + 1)
             else:
                 raise ParseError(self, start)
         except IndexError as e:
             raise ParseError(self, start) from e
 
+    def ends(self, source: Source, start: int) -> Ends:
+        if isinstance(self.value, tuple):
+            if start < len(source) and self.value[0] <= source[start] <= self.value[1]:
+                return (start + 1,)
+            return ()
+        if start < len(source):
+            src = source[start : start + len(self.value)]
+            match = src if self.case_sensitive else src.casefold()
+            if match == self.pattern:
+                return (start + len(src),)
+        return ()
+
     def _lparse_value(self, source: str, start: int) -> Matches:
         """Parse source when self.value represents a literal."""
         # we check position to ensure that the case pattern = '' and start >= len(source)
@@ -340,10 +685,7 @@ class Literal:  # pylint: disable=too-few-public-methods
             src = source[start : start + len(self.value)]
             match = src if self.case_sensitive else src.casefold()
             if match == self.pattern:  # pylint: disable=no-else-return
-                yield Match(
-                    [typing.cast(Node, LiteralNode(src, start, len(src)))],
-                    start + len(src),
-                )
+                yield literal_match(source, start, start + len(src))
             else:
                 raise ParseError(self, start)
         else:
@@ -367,12 +709,28 @@ class Literal:  # pylint: disable=too-few-public-methods
         )
 
 
+def literal_match(source: Source, start: int, end: int) -> Match:
+    arena = active_arena(source)
+    if arena is None:
+        node = LiteralNode(source[start:end], start, end - start)
+        return Match([typing.cast(Node, node)], end)
+    return arena.literal(start, end)
+
+
 class Prose:
     def lparse(self, source: Source, start: int) -> Matches:
         raise ParseError(self, start)
 
+    def ends(
+        self, source: Source, start: int
+    ) -> Ends:  # pylint: disable=unused-argument
+        return ()
+
 T = typing.TypeVar("T", bound="Rule")
 
+# number of sources handed to a worker at a time by Rule.validate_many and parse_many.
+DEFAULT_CHUNK_SIZE = 1000
+
 
 class Rule:
     """A parser generated from an ABNF rule.
@@ -384,6 +742,9 @@ class Rule:
 
     grammar: typing.Union[str, typing.List[str]] = []
 
+    # set by abnf1.compiler.compile_grammar for rules that compile to a DFA.
+    matcher: typing.Optional[Matcher] = None
+
     _obj_map: typing.Dict[typing.Tuple[typing.Type["Rule"], str], "Rule"] = {}
 
     def __new__(
@@ -450,13 +811,33 @@ class Rule:
         """
         self.exclude = rule
 
+    @profiled
+    @memoized
     def lparse(self, source: Source, start: int) -> Matches:
+        if self.matcher is not None:
+            return self._lparse_compiled(self.matcher, source, start)
+        return self._lparse(source, start)
+
+    def _lparse_compiled(
+        self, matcher: Matcher, source: Source, start: int
+    ) -> Matches:
+        ends = matcher.ends(source, start)
+        if not ends:
+            raise ParseError(self, start)
+        arena = active_arena(source)
+        for end in reversed(ends):
+            if arena is None:
+                yield Match([LazyNode(self, source, start, end)], end)
+            else:
+                yield arena.lazy(self, start, end)
+
+    def _lparse(self, source: Source, start: int) -> Matches:
         def exclude(match: Match) -> bool:
             if self.exclude is None:
                 return False
 
             try:
-                self.exclude.parse_all("".join(item.value for item in match.nodes))
+                self.exclude.parse_all(source[start : match.start])
             except ParseError:
                 return False
             else:
@@ -467,18 +848,34 @@ class Rule:
         except AttributeError as exc:
             raise GrammarError('Undefined rule "%s".' % self.name) from exc
 
-        matches = set(filterfalse(exclude, g))
+        matches = unique_matches(filterfalse(exclude, g))
+        arena = active_arena(source)
         if matches:
-            for match in matches:
-                yield Match([Node(self.name, *match.nodes)], match.start)
+            for match in matches.values():
+                if arena is None:
+                    yield Match([Node(self.name, *match.nodes)], match.start)
+                else:
+                    yield arena.rule(self, start, match)
         else:
             raise ParseError(self, start) from None
 
-    def parse(self, source: str, start: int) -> tuple["Node", int]:
+    def parse(
+        self,
+        source: str,
+        start: int,
+        session: typing.Optional[ParseSession] = None,
+        arena: bool = False,
+        profile: typing.Optional[ParseProfile] = None,
+    ) -> tuple["Node", int]:
         """
         :param source: source data
         :type str:
         :param start=0: offset at which to begin parsing.
+        :param session: ParseSession used for memoization; a new one is created if
+            None.  The session is reset before parsing.
+        :param arena: if True, the parse tree is stored in a NodeArena and an
+            ArenaNode is returned; child nodes are created as they are accessed.
+        :param profile: ParseProfile in which rule calls are recorded.
         :returns: parse tree, new offset at which to continue parsing
         :rtype: Node, int
         :raises ParseError: if source cannot be parsed using rule.
@@ -486,22 +883,34 @@ class Rule:
             non-terminal in the grammar is not defined or imported.
         """
 
-        g = self.lparse(source, start)
-        matches = set(g)
+        if session is None:
+            session = ParseSession()
+        with session.activate(source, arena, profile):
+            g = self.lparse(source, start)
+            matches = unique_matches(g)
         assert matches
         # we return the longest match.  It is possible that there is more than one
         # match of maximal length.  Call lparse to see all amatches
-        longest_match = next(next_longest(matches))
+        longest_match = next(next_longest(matches.values()))
         return (longest_match.nodes[0], longest_match.start)
 
-    def parse_all(self, source: str) -> "Node":
+    def parse_all(
+        self,
+        source: str,
+        session: typing.Optional[ParseSession] = None,
+        arena: bool = False,
+        profile: typing.Optional[ParseProfile] = None,
+    ) -> "Node":
         """
         Parses the source from beginning to end.  If not all of the source is consumed, a
         ParseError is raised.
 
         :param source: source data
         :type str:
-        :param start=0: offset at which to begin parsing.
+        :param session: ParseSession used for memoization; a new one is created if
+            None.  The session is reset before parsing.
+        :param arena: if True, the parse tree is stored in a NodeArena; see parse.
+        :param profile: ParseProfile in which rule calls are recorded.
         :returns: parse tree
         :rtype: Node
         :raises ParseError: if source cannot be parsed using rule.
@@ -509,11 +918,98 @@ class Rule:
             non-terminal in the grammar is not defined or imported.
         """
 
-        node, start = self.parse(source, 0)
+        node, start = self.parse(source, 0, session, arena, profile)
         if start < len(source):
             raise ParseError(self, start)
         return node
 
+    @memoized_ends
+    def ends(self, source: Source, start: int) -> Ends:
+        if self.matcher is not None:
+            ends: Ends = self.matcher.ends(source, start)
+        else:
+            try:
+                definition = self.definition
+            except AttributeError as exc:
+                raise GrammarError('Undefined rule "%s".' % self.name) from exc
+            ends = parser_ends(definition, source, start)
+        if self.exclude is not None:
+            exclude = self.exclude
+            ends = [end for end in ends if not exclude.recognize(source[start:end])]
+        return ends
+
+    def recognize(
+        self, source: str, session: typing.Optional[ParseSession] = None
+    ) -> bool:
+        """
+        Returns True if the whole source matches the rule.  Unlike parse_all, no Match or
+        Node objects are created.
+
+        :param source: source data
+        :type str:
+        :param session: ParseSession used for memoization; a new one is created if
+            None.  The session is reset before parsing.
+        :returns: bool
+        :raises GrammarError: if rule has no definition.
+        """
+
+        if session is None:
+            session = ParseSession()
+        with session.activate(source):
+            return len(source) in self.ends(source, 0)
+
+    def validate_many(
+        self,
+        sources: typing.Iterable[str],
+        workers: typing.Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> typing.Iterator[bool]:
+        """
+        Recognizes each of sources, in order; see recognize.  Each source is parsed in
+        its own session, so nothing is cached from one source to the next.
+
+        :param sources: iterable of source data; it is consumed lazily.
+        :param workers: number of worker processes.  If None or 1, sources are
+            validated in this process.
+        :param chunk_size: number of sources handed to a worker at a time.
+        :returns: iterator of bool
+        :raises GrammarError: if rule has no definition.
+        """
+
+        return _map_many(self, _recognize_chunk, sources, workers, chunk_size)
+
+    def parse_many(
+        self,
+        sources: typing.Iterable[str],
+        workers: typing.Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> typing.Iterator[typing.Union["Node", "ParseError"]]:
+        """
+        Parses each of sources, in order, as parse_all does.  A source that does not
+        parse yields its ParseError instead of raising it.  With workers, parse trees
+        are pickled back to this process, so LazyNode objects arrive as complete Node
+        trees.
+
+        :param sources: iterable of source data; it is consumed lazily.
+        :param workers: number of worker processes.  If None or 1, sources are parsed
+            in this process.
+        :param chunk_size: number of sources handed to a worker at a time.
+        :returns: iterator of Node or ParseError
+        :raises GrammarError: if rule has no definition.
+        """
+
+        return _map_many(self, _parse_chunk, sources, workers, chunk_size)
+
+    def __reduce__(self):
+        # unpickling looks the rule up by name, so the symbol table stays intact.
+        return (self.__class__, (self.name,), self.__dict__)
+
+    def __setstate__(self, state: typing.Dict[str, typing.Any]) -> None:
+        # a rule already defined in this process, e.g. by importing its grammar module,
+        # keeps its definition.
+        if not hasattr(self, "definition"):
+            self.__dict__.update(state)
+
     def __str__(self):
         return "%s('%s')" % (self.__class__.__name__, self.name)
 
@@ -591,6 +1087,256 @@ class Rule:
         return [v for k, v in cls._obj_map.items() if k[0] is cls]
 
 
+#### Profiling ####
+
+
+class RuleStats:  # pylint: disable=too-few-public-methods
+    """Counters kept by ParseProfile for a rule."""
+
+    __slots__ = (
+        "rule",
+        "invocations",
+        "matches",
+        "time",
+        "self_time",
+        "max_fan_out",
+        "active",
+    )
+
+    def __init__(self, rule: Rule):
+        self.rule = rule
+        self.invocations = 0
+        self.matches = 0
+        self.time = 0.0
+        self.self_time = 0.0
+        self.max_fan_out = 0
+        # number of calls of the rule in progress; time is added by the outermost.
+        self.active = 0
+
+    def as_dict(self) -> typing.Dict[str, typing.Any]:
+        grammar = type(self.rule)
+        return {
+            "rule": self.rule.name,
+            "grammar": "%s.%s" % (grammar.__module__, grammar.__qualname__),
+            **{column: getattr(self, column) for column in ParseProfile.columns},
+        }
+
+
+class ParseProfile:
+    """Per-rule statistics for parses run with Rule.parse(..., profile=profile).
+
+        profile = ParseProfile()
+        for source in sources:
+            rfc5322.Rule('message').parse_all(source, profile=profile)
+        print(profile.table(sort='self_time', limit=20))
+
+    invocations counts calls of the rule, including those answered from the ParseSession
+    memo, and matches the matches they produced.  time is the time spent producing those
+    matches, including nested rules but counting recursive calls once; self_time leaves
+    nested rules out.  max_fan_out is
+    the largest number of alternatives that matched at one offset, over the alternations
+    evaluated while the rule was innermost.  Statistics accumulate until clear is
+    called.
+    """
+
+    columns = ("invocations", "matches", "time", "self_time", "max_fan_out")
+
+    def __init__(self) -> None:
+        self.stats: typing.Dict[Rule, RuleStats] = {}
+        # [stats, time spent in nested rules] for each rule producing a match.
+        self._frames: typing.List[typing.List[typing.Any]] = []
+
+    def __len__(self):
+        return len(self.stats)
+
+    def __str__(self):
+        return self.table()
+
+    def clear(self) -> None:
+        self.stats = {}
+
+    def lparse(
+        self,
+        rule: Rule,
+        lparse: typing.Callable[[typing.Any, Source, int], Matches],
+        source: Source,
+        start: int,
+    ) -> Matches:
+        try:
+            stats = self.stats[rule]
+        except KeyError:
+            stats = self.stats[rule] = RuleStats(rule)
+        stats.invocations = stats.invocations + 1
+        matches = lparse(rule, source, start)
+        frames = self._frames
+        while True:
+            frame: typing.List[typing.Any] = [stats, 0.0]
+            frames.append(frame)
+            stats.active = stats.active + 1
+            begin = time.perf_counter()
+            try:
+                match = next(matches)
+            except StopIteration:
+                return
+            finally:
+                elapsed = time.perf_counter() - begin
+                frames.pop()
+                stats.active = stats.active - 1
+                if not stats.active:
+                    stats.time = stats.time + elapsed
+                stats.self_time = stats.self_time + elapsed - frame[1]
+                if frames:
+                    frames[-1][1] = frames[-1][1] + elapsed
+            stats.matches = stats.matches + 1
+            yield match
+
+    def alternation(self, fan_out: int) -> None:
+        if self._frames:
+            stats = self._frames[-1][0]
+            stats.max_fan_out = max(stats.max_fan_out, fan_out)
+
+    def rows(
+        self, sort: str = "time", limit: typing.Optional[int] = None
+    ) -> typing.List[RuleStats]:
+        """Returns the statistics sorted by column sort, largest first, or by rule name
+        if sort is "rule"."""
+
+        if sort == "rule":
+            rows = sorted(self.stats.values(), key=lambda stats: stats.rule.name)
+        elif sort in self.columns:
+            rows = sorted(
+                self.stats.values(),
+                key=lambda stats: getattr(stats, sort),
+                reverse=True,
+            )
+        else:
+            raise ValueError(
+                "sort must be one of %s." % ", ".join(("rule",) + self.columns)
+            )
+        return rows[:limit]
+
+    def table(self, sort: str = "time", limit: typing.Optional[int] = None) -> str:
+        """Returns the statistics as a text table; see rows."""
+
+        rows = self.rows(sort, limit)
+        width = max([len("rule")] + [len(stats.rule.name) for stats in rows])
+        lines = [
+            "%-*s %11s %11s %10s %10s %11s"
+            % (width, "rule", *self.columns)
+        ]
+        for stats in rows:
+            lines.append(
+                "%-*s %11d %11d %10.6f %10.6f %11d"
+                % (
+                    width,
+                    stats.rule.name,
+                    stats.invocations,
+                    stats.matches,
+                    stats.time,
+                    stats.self_time,
+                    stats.max_fan_out,
+                )
+            )
+        return "\n".join(lines)
+
+    def to_json(
+        self,
+        sort: str = "time",
+        limit: typing.Optional[int] = None,
+        **kwargs: typing.Any,
+    ) -> str:
+        """Returns the statistics as a JSON array of objects; see rows.  kwargs are
+        passed to json.dumps."""
+
+        rows = self.rows(sort, limit)
+        return json.dumps([stats.as_dict() for stats in rows], **kwargs)
+
+
+#### Batch parsing ####
+# Rule.validate_many and Rule.parse_many hand chunks of sources to these functions,
+# either directly or in worker processes.
+
+_worker_rule: typing.Optional[Rule] = None
+
+
+def _init_worker(rule: Rule) -> None:
+    global _worker_rule  # pylint: disable=global-statement
+    _worker_rule = rule
+
+
+def _recognize_chunk(
+    sources: typing.List[str], rule: typing.Optional[Rule] = None
+) -> typing.List[bool]:
+    rule = rule or _worker_rule
+    assert rule is not None
+    session = ParseSession()
+    return [rule.recognize(source, session) for source in sources]
+
+
+def _parse_chunk(
+    sources: typing.List[str], rule: typing.Optional[Rule] = None
+) -> typing.List[typing.Union["Node", "ParseError"]]:
+    rule = rule or _worker_rule
+    assert rule is not None
+    session = ParseSession()
+    results: typing.List[typing.Union[Node, ParseError]] = []
+    for source in sources:
+        try:
+            results.append(rule.parse_all(source, session))
+        except ParseError as exc:
+            results.append(ParseError(exc.parser, exc.start))
+    return results
+
+
+def _chunks(
+    sources: typing.Iterable[str], chunk_size: int
+) -> typing.Iterator[typing.List[str]]:
+    iterator = iter(sources)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _map_many(
+    rule: Rule,
+    func: typing.Callable[..., typing.List[typing.Any]],
+    sources: typing.Iterable[str],
+    workers: typing.Optional[int],
+    chunk_size: int,
+) -> typing.Iterator[typing.Any]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be positive.")
+    return _map_chunks(rule, func, _chunks(sources, chunk_size), workers or 1)
+
+
+def _map_chunks(
+    rule: Rule,
+    func: typing.Callable[..., typing.List[typing.Any]],
+    chunks: typing.Iterator[typing.List[str]],
+    workers: int,
+) -> typing.Iterator[typing.Any]:
+    if workers == 1:
+        for chunk in chunks:
+            yield from func(chunk, rule)
+        return
+
+    # at most 2 * workers chunks are in flight, so memory stays bounded for long inputs.
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(rule,)
+    ) as executor:
+        pending: typing.Deque[Future[typing.List[typing.Any]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(func, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
 #### Node classes ####
 # A parser returns a parse tree of Node objects.  Usually one would then walk the node tree
 # with a visitor object to do whatever.  A NodeVisitor class, found below, implements
@@ -621,12 +1367,55 @@ class Node:  # pylint: disable=too-few-public-methods
 
     def __eq__(self, other: typing.Any):
         return (
-            self.__class__ == other.__class__
+            isinstance(other, Node)
             and self.name == other.name
             and self.children == other.children
         )
 
 
+class LazyNode(Node):
+    """A Node for a match found by a compiled rule.  The value is a slice of the source;
+    children are parsed on first access, using the rule definition."""
+
+    __slots__ = ("rule", "source", "offset", "end", "_children")
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, rule: Rule, source: Source, offset: int, end: int
+    ) -> None:
+        self.name = rule.name
+        self.rule = rule
+        self.source = source
+        self.offset = offset
+        self.end = end
+        self._children: typing.Optional[typing.List[Node]] = None
+
+    @property  # type: ignore[override]
+    def children(self) -> typing.List[Node]:
+        if self._children is None:
+            self._children = self._parse_children()
+        return self._children
+
+    @children.setter
+    def children(self, value: typing.List[Node]) -> None:
+        self._children = value
+
+    @property
+    def value(self) -> str:
+        return self.source[self.offset : self.end]
+
+    def __reduce__(self):
+        return (Node, (self.name, *self.children))
+
+    def _parse_children(self) -> typing.List[Node]:
+        with ParseSession().activate(self.source):
+            for match in self.rule.definition.lparse(self.source, self.offset):
+                if match.start == self.end:
+                    return match.nodes
+        raise AssertionError(
+            "%s does not match the compiled rule at %s" % (self.rule, self.offset)
+        )
+
+
 class LiteralNode:  # pylint: disable=too-few-public-methods
     """LiteralNode objects are used to build parse trees."""
 
@@ -660,6 +1449,244 @@ class LiteralNode:  # pylint: disable=too-few-public-methods
         )
 
 
+#### Arena parse trees ####
+# With Rule.parse(..., arena=True), matches do not carry lists of Node objects.  Nodes
+# are records in a MatchArena, and a match refers to a chain of cells listing its nodes,
+# so extending a match adds a cell instead of copying a list.  The parse tree that is
+# returned is copied to a NodeArena, and Node objects are created only for the parts of
+# the tree that are visited.
+
+# rule id of a literal record.
+LITERAL = -1
+# children of a record matched by a compiled rule; they are parsed when accessed.
+LAZY = -2
+
+
+class ArenaMatch(Match):
+    """A match whose nodes are a chain of cells in a MatchArena."""
+
+    __slots__ = ("arena", "chain")
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, arena: MatchArena, chain: int, start: int
+    ):
+        self.arena = arena
+        self.chain = chain
+        self.start = start
+
+    @property
+    def nodes(self) -> Nodes:  # type: ignore[override]
+        return self.arena.tree(self.chain)
+
+    def extend(self, other: Match) -> Match:
+        chain = self.arena.join(self.chain, self.arena.chain(other))
+        return ArenaMatch(self.arena, chain, other.start)
+
+
+class MatchArena:
+    """Node records and match chains for a single parse.
+
+    A node record is (rule id, start, end, children), children being the chain of its
+    child nodes.  A chain cell is (item, previous cell): chains are linked from the last
+    node to the first, and end at -1.  An item is a node index, or the complement of a
+    chain that is spliced in at that point, so joining two chains takes one cell.
+    """
+
+    def __init__(self, source: Source):
+        self.source = source
+        self.rules: typing.List[Rule] = []
+        self._rule_ids: typing.Dict[int, int] = {}
+        self.node_rules = array("i")
+        self.node_starts = array("q")
+        self.node_ends = array("q")
+        self.node_children = array("q")
+        self.cell_items = array("q")
+        self.cell_prev = array("q")
+
+    def __len__(self):
+        return len(self.node_rules)
+
+    def literal(self, start: int, end: int) -> ArenaMatch:
+        return self._leaf(LITERAL, start, end, -1)
+
+    def lazy(self, rule: Rule, start: int, end: int) -> ArenaMatch:
+        return self._leaf(self._rule_id(rule), start, end, LAZY)
+
+    def rule(self, rule: Rule, start: int, match: Match) -> ArenaMatch:
+        return self._leaf(self._rule_id(rule), start, match.start, self.chain(match))
+
+    def chain(self, match: Match) -> int:
+        """Returns the chain of match.  An empty Match is the empty chain."""
+        if isinstance(match, ArenaMatch) and match.arena is self:
+            return match.chain
+        if not match.nodes:
+            return -1
+        raise TypeError("%s was not matched in this arena." % match)
+
+    def join(self, head: int, tail: int) -> int:
+        """Returns the chain of the nodes of head followed by the nodes of tail."""
+        if tail < 0:
+            return head
+        if head < 0:
+            return tail
+        if self.cell_prev[tail] < 0:
+            # a single node, as matched by a rule or a literal.
+            return self._cell(self.cell_items[tail], head)
+        return self._cell(~tail, head)
+
+    def items(self, chain: int) -> typing.List[int]:
+        """Returns the node indexes of chain, first to last."""
+        items: typing.List[int] = []
+        pending = [chain]
+        while pending:
+            cell = pending.pop()
+            while cell >= 0:
+                item = self.cell_items[cell]
+                cell = self.cell_prev[cell]
+                if item < 0:
+                    pending.append(cell)
+                    cell = ~item
+                else:
+                    items.append(item)
+        items.reverse()
+        return items
+
+    def tree(self, chain: int) -> Nodes:
+        """Copies the nodes of chain and their descendants to a new NodeArena, and
+        returns views of the nodes of chain."""
+
+        tree = NodeArena(self.source, self.rules)
+        pending: typing.Deque[typing.Tuple[int, int]] = deque()
+        roots = self._copy(tree, self.items(chain), pending)
+        while pending:
+            node, index = pending.popleft()
+            children = self.node_children[node]
+            if children == LAZY:
+                tree.first_child[index] = LAZY
+            else:
+                indexes = self._copy(tree, self.items(children), pending)
+                if indexes:
+                    tree.first_child[index] = indexes[0]
+        return [tree.node(index) for index in roots]
+
+    def _copy(
+        self,
+        tree: NodeArena,
+        nodes: typing.List[int],
+        pending: typing.Deque[typing.Tuple[int, int]],
+    ) -> typing.List[int]:
+        indexes = [
+            tree.add(
+                self.node_rules[node], self.node_starts[node], self.node_ends[node]
+            )
+            for node in nodes
+        ]
+        for index, next_index in zip(indexes, indexes[1:]):
+            tree.next_sibling[index] = next_index
+        for node, index in zip(nodes, indexes):
+            if self.node_rules[node] != LITERAL:
+                pending.append((node, index))
+        return indexes
+
+    def _rule_id(self, rule: Rule) -> int:
+        try:
+            return self._rule_ids[id(rule)]
+        except KeyError:
+            # self.rules keeps rule alive, so its id is not reused.
+            self.rules.append(rule)
+            rule_id = self._rule_ids[id(rule)] = len(self.rules) - 1
+            return rule_id
+
+    def _leaf(self, rule_id: int, start: int, end: int, children: int) -> ArenaMatch:
+        self.node_rules.append(rule_id)
+        self.node_starts.append(start)
+        self.node_ends.append(end)
+        self.node_children.append(children)
+        return ArenaMatch(self, self._cell(len(self.node_rules) - 1, -1), end)
+
+    def _cell(self, item: int, prev: int) -> int:
+        self.cell_items.append(item)
+        self.cell_prev.append(prev)
+        return len(self.cell_items) - 1
+
+
+class NodeArena:
+    """A parse tree stored as arrays of (rule id, start, end, first child, next sibling)
+    records, -1 standing for no node.  node(index) returns a Node for a record."""
+
+    def __init__(self, source: Source, rules: typing.List[Rule]):
+        self.source = source
+        self.rules = rules
+        self.rule_ids = array("i")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.first_child = array("q")
+        self.next_sibling = array("q")
+
+    def __len__(self):
+        return len(self.rule_ids)
+
+    def add(self, rule_id: int, start: int, end: int) -> int:
+        self.rule_ids.append(rule_id)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.first_child.append(-1)
+        self.next_sibling.append(-1)
+        return len(self.rule_ids) - 1
+
+    def children(self, index: int) -> typing.Iterator[int]:
+        child = self.first_child[index]
+        while child >= 0:
+            yield child
+            child = self.next_sibling[child]
+
+    def node(self, index: int) -> Node:
+        """Returns a LiteralNode, LazyNode or ArenaNode for the record at index."""
+        rule_id = self.rule_ids[index]
+        start = self.starts[index]
+        end = self.ends[index]
+        if rule_id == LITERAL:
+            node = LiteralNode(self.source[start:end], start, end - start)
+            return typing.cast(Node, node)
+        if self.first_child[index] == LAZY:
+            return LazyNode(self.rules[rule_id], self.source, start, end)
+        return ArenaNode(self, index)
+
+
+class ArenaNode(Node):
+    """A Node for a record in a NodeArena.  The value is a slice of the source; child
+    Node objects are created on first access."""
+
+    __slots__ = ("arena", "index", "_children")
+
+    def __init__(  # pylint: disable=super-init-not-called
+        self, arena: NodeArena, index: int
+    ) -> None:
+        self.name = arena.rules[arena.rule_ids[index]].name
+        self.arena = arena
+        self.index = index
+        self._children: typing.Optional[typing.List[Node]] = None
+
+    @property  # type: ignore[override]
+    def children(self) -> typing.List[Node]:
+        if self._children is None:
+            arena = self.arena
+            self._children = [arena.node(child) for child in arena.children(self.index)]
+        return self._children
+
+    @children.setter
+    def children(self, value: typing.List[Node]) -> None:
+        self._children = value
+
+    @property
+    def value(self) -> str:
+        arena = self.arena
+        return arena.source[arena.starts[self.index] : arena.ends[self.index]]
+
+    def __reduce__(self):
+        return (Node, (self.name, *self.children))
+
+
 class NodeVisitor:  # pylint: disable=too-few-public-methods
     """An external visitor class."""
 
@@ -712,6 +1739,9 @@ class ParseError(Exception):
     def __str__(self):
         return "%s: %s" % (str(self.parser), self.start)
 
+    def __reduce__(self):
+        return (self.__class__, (self.parser, self.start, *self.args))
+
 
 class GrammarError(Exception):
     """Raised in response to errors detected in the grammar."""
@@ -0,0 +1,318 @@
+"""Incremental validation of HTTP header sections.
+
+HeaderStream takes the bytes of a message as they arrive, in chunks of any size, and
+emits the start line and each header field as soon as its terminating CRLF has been
+received.  Lines are checked with the rules of RFC 7230, and the values of fields
+defined in RFC 9110 with the rule of the same name.
+
+    stream = HeaderStream()
+    for chunk in chunks:
+        for event in stream.feed(chunk):
+            if event is NEED_DATA:
+                break
+            if isinstance(event, HeaderField):
+                print(event.name, event.value)
+    body = stream.unused_data
+
+Lines are found and decoded in place, in the chunk that was fed; only a line split
+across chunks is copied, to join its parts.  A line that does not match raises a
+ParseError whose start is the offset of the line in the stream.  obs-fold line folding
+is rejected, as RFC 9112 allows.
+
+Rules that are regular are compiled to DFAs on first use and kept for the life of the
+process; the others are matched with Rule.recognize.  request-line and Host are not
+regular, but their common forms (an origin-form target, a host name) are checked
+part by part with DFAs.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+import typing
+
+from src.abnf1.compiler import NotRegularError, compile_rule
+from src.abnf1.grammars import rfc3986, rfc7230, rfc9110
+from src.abnf1.parser import ParseError, Rule
+
+# fields that RFC 9110 defines a rule for.
+RFC9110_FIELDS = (
+    "Accept",
+    "Accept-Charset",
+    "Accept-Encoding",
+    "Accept-Language",
+    "Accept-Ranges",
+    "Allow",
+    "Authentication-Info",
+    "Authorization",
+    "Connection",
+    "Content-Encoding",
+    "Content-Language",
+    "Content-Length",
+    "Content-Location",
+    "Content-Range",
+    "Content-Type",
+    "Date",
+    "ETag",
+    "Expect",
+    "From",
+    "Host",
+    "If-Match",
+    "If-Modified-Since",
+    "If-None-Match",
+    "If-Range",
+    "If-Unmodified-Since",
+    "Last-Modified",
+    "Location",
+    "Max-Forwards",
+    "Proxy-Authenticate",
+    "Proxy-Authentication-Info",
+    "Proxy-Authorization",
+    "Range",
+    "Referer",
+    "Retry-After",
+    "Server",
+    "TE",
+    "Trailer",
+    "Upgrade",
+    "User-Agent",
+    "Vary",
+    "Via",
+    "WWW-Authenticate",
+)
+
+DEFAULT_MAX_LINE_LENGTH = 8192
+
+_LF = re.compile(b"\n")
+_CR = 13
+
+
+class NeedData:  # pylint: disable=too-few-public-methods
+    """Returned by HeaderStream.feed when the header section is not complete."""
+
+    def __repr__(self):
+        return "NEED_DATA"
+
+
+NEED_DATA = NeedData()
+
+
+class StartLine(typing.NamedTuple):
+    """The request line or status line, without CRLF."""
+
+    line: str
+
+
+class HeaderField(typing.NamedTuple):
+    """A header field; value has no leading or trailing whitespace."""
+
+    name: str
+    value: str
+
+
+class EndOfHeaders(typing.NamedTuple):
+    """The empty line that ends the header section."""
+
+
+Event = typing.Union[StartLine, HeaderField, EndOfHeaders, NeedData]
+
+
+@functools.lru_cache(maxsize=None)
+def _matcher(rule: Rule) -> typing.Callable[[str], bool]:
+    try:
+        dfa = compile_rule(rule)
+    except NotRegularError:
+        fast_path = _FAST_PATHS.get(rule)
+        if fast_path is None:
+            return rule.recognize
+        return lambda source: fast_path(source) or rule.recognize(source)
+
+    def match(source: str) -> bool:
+        return dfa.match(source) == len(source)
+
+    return match
+
+
+def _origin_form_request_line(source: str) -> bool:
+    # only origin-form targets begin with "/", and no part of a request line contains
+    # SP, so the line matches request-line exactly when each part matches its rule.
+    if not source.endswith("\r\n"):
+        return False
+    parts = source[:-2].split(" ")
+    if len(parts) != 3 or not parts[1].startswith("/"):
+        return False
+    method, target, version = parts
+    return (
+        _matcher(rfc7230.Rule("method"))(method)
+        and _matcher(rfc7230.Rule("origin-form"))(target)
+        and _matcher(rfc7230.Rule("HTTP-version"))(version)
+    )
+
+
+def _start_line(source: str) -> bool:
+    return _origin_form_request_line(source) or _matcher(rfc7230.Rule("status-line"))(
+        source
+    )
+
+
+def _reg_name_host(source: str) -> bool:
+    # uri-host is a first-match alternation of IP-literal, IPv4address and reg-name,
+    # which is why Host is not regular.  Neither of the first two matches a prefix of
+    # a host that begins with a character other than a digit or "[".
+    host, colon, port = source.partition(":")
+    if not host or host[0] in "0123456789[":
+        return False
+    return _matcher(rfc3986.Rule("reg-name"))(host) and (
+        not colon or _matcher(rfc3986.Rule("port"))(port)
+    )
+
+
+# exact shortcuts for the common forms of rules that cannot be compiled.  A shortcut
+# that returns False does not reject the source; the rule is matched instead.
+_FAST_PATHS: typing.Dict[Rule, typing.Callable[[str], bool]] = {
+    rfc7230.Rule("start-line"): _start_line,
+    rfc7230.Rule("request-line"): _origin_form_request_line,
+    rfc7230.Rule("Host"): _reg_name_host,
+    rfc9110.Rule("Host"): _reg_name_host,
+}
+
+
+def rfc9110_field_rules() -> typing.Dict[str, Rule]:
+    """Returns the RFC 9110 field rules, keyed by casefolded field name."""
+
+    return {name.casefold(): rfc9110.Rule(name) for name in RFC9110_FIELDS}
+
+
+@functools.lru_cache(maxsize=None)
+def _default_field_rules() -> typing.Dict[str, Rule]:
+    # shared by every HeaderStream that does not pass field_rules; not modified.
+    return rfc9110_field_rules()
+
+
+class HeaderStream:
+    """Validates the header section of one HTTP message as it arrives.
+
+    :param start_line: name of the rfc7230 rule for the first line, e.g. "request-line"
+        or "status-line"; None if the stream begins with the header fields, as for a
+        trailer section.
+    :param field_rules: rules for field values, keyed by field name; fields not listed
+        are only checked against header-field.  Defaults to the RFC 9110 fields.
+    :param max_line_length: longest line accepted, CRLF included.
+    :param compiled: if False, rules are matched with Rule.recognize rather than DFAs.
+    """
+
+    def __init__(
+        self,
+        start_line: typing.Optional[str] = "start-line",
+        field_rules: typing.Optional[typing.Mapping[str, Rule]] = None,
+        max_line_length: int = DEFAULT_MAX_LINE_LENGTH,
+        compiled: bool = True,
+    ):
+        if max_line_length < 2:
+            raise ValueError("max_line_length must be at least 2.")
+        self.start_line_rule = rfc7230.Rule(start_line) if start_line else None
+        self.field_rule = rfc7230.Rule("header-field")
+        self.field_rules = (
+            _default_field_rules()
+            if field_rules is None
+            else {name.casefold(): rule for name, rule in field_rules.items()}
+        )
+        self.max_line_length = max_line_length
+        self.compiled = compiled
+        # offset in the stream of the line being read.
+        self.offset = 0
+        self.done = False
+        self.unused_data = b""
+        self._expect_start_line = self.start_line_rule is not None
+        self._partial = bytearray()
+
+    def feed(
+        self, data: typing.Union[bytes, bytearray, memoryview]
+    ) -> typing.List[Event]:
+        """Consumes data and returns the events for the lines it completes, in order.
+        The list ends with NEED_DATA until the header section is complete, and with
+        EndOfHeaders once it is.  Bytes after the header section are kept in
+        unused_data.
+
+        :raises ParseError: if a line is not valid, or is longer than max_line_length.
+        """
+
+        view = memoryview(data).cast("B")
+        if self.done:
+            self.unused_data = self.unused_data + view.tobytes()
+            return []
+
+        events: typing.List[Event] = []
+        pos = 0
+        while not self.done:
+            match = _LF.search(view, pos)
+            if match is None:
+                break
+            end = match.end()
+            length = len(self._partial) + end - pos
+            self._check_length(length)
+            if self._partial:
+                # the rest of a line begun in an earlier chunk.
+                self._partial += view[pos:end]
+                line = memoryview(self._partial)
+                try:
+                    event = self._line(line)
+                finally:
+                    line.release()
+                self._partial = bytearray()
+            else:
+                event = self._line(view[pos:end])
+            self.offset = self.offset + length
+            pos = end
+            if event is not None:
+                events.append(event)
+
+        if self.done:
+            self.unused_data = view[pos:].tobytes()
+        else:
+            self._check_length(len(self._partial) + len(view) - pos)
+            self._partial += view[pos:]
+            events.append(NEED_DATA)
+        return events
+
+    def _check_length(self, length: int) -> None:
+        if length > self.max_line_length:
+            raise ParseError(self.field_rule, self.offset, "line too long")
+
+    def _line(self, line: memoryview) -> typing.Optional[Event]:
+        """Returns the event for line, which ends with LF."""
+
+        if len(line) < 2 or line[-2] != _CR:
+            raise ParseError(self.field_rule, self.offset, "line not ended by CRLF")
+
+        if len(line) == 2:
+            if self._expect_start_line:
+                # RFC 9112 asks servers to ignore empty lines before the request line.
+                return None
+            self.done = True
+            return EndOfHeaders()
+
+        if self._expect_start_line:
+            assert self.start_line_rule is not None
+            text = str(line, "latin-1")
+            if not self._match(self.start_line_rule, text):
+                raise ParseError(self.start_line_rule, self.offset)
+            self._expect_start_line = False
+            return StartLine(text[:-2])
+
+        text = str(line[:-2], "latin-1")
+        if not self._match(self.field_rule, text):
+            raise ParseError(self.field_rule, self.offset)
+        name, _, value = text.partition(":")
+        value_start = len(name) + 1 + len(value) - len(value.lstrip(" \t"))
+        value = value.strip(" \t")
+        rule = self.field_rules.get(name.casefold())
+        if rule is not None and not self._match(rule, value):
+            raise ParseError(rule, self.offset + value_start)
+        return HeaderField(name, value)
+
+    def _match(self, rule: Rule, source: str) -> bool:
+        if self.compiled:
+            return _matcher(rule)(source)
+        return rule.recognize(source)
+
@@ -0,0 +1,140 @@
+import typing
+
+import pytest
+
+from src.abnf1.compiler import *
+from src.abnf1.grammars import rfc3986, rfc9110
+from src.abnf1.parser import ArenaNode, LazyNode, Matcher, ParseError, Rule
+
+
+class CompilerRule(Rule):
+    pass
+
+
+CompilerRule.create('digits = 1*DIGIT')
+CompilerRule.create('word = 1*ALPHA')
+CompilerRule.create('pair = word "=" digits')
+CompilerRule.create('nested = "(" [nested] ")"')
+CompilerRule.create('keyword = "if" / "else"')
+CompilerRule.create('identifier = word')
+CompilerRule('identifier').exclude_rule(CompilerRule('keyword'))
+CompilerRule.create('prose = <some prose>')
+CompilerRule.create('choice = "a" / "ab"')
+CompilerRule('choice').first_match_alternation = True
+CompilerRule.create('kelvin = "k"')
+CompilerRule.create('bounded = 2*3"a"')
+
+
+@pytest.fixture(scope='module')
+def matchers() -> typing.Dict[Rule, Matcher]:
+    result: typing.Dict[Rule, Matcher] = {}
+    for rule_cls in (rfc3986.Rule, rfc9110.Rule, CompilerRule):
+        for rule in compile_grammar(rule_cls):
+            assert rule.matcher is not None
+            result[rule] = rule.matcher
+        uncompile_grammar(rule_cls)
+    return result
+
+
+@pytest.fixture
+def compiled_grammars(matchers: typing.Dict[Rule, Matcher]) -> typing.Iterator[None]:
+    for rule, matcher in matchers.items():
+        rule.matcher = matcher
+    yield
+    for rule in matchers:
+        rule.matcher = None
+
+
+@pytest.mark.parametrize("name", ['nested', 'identifier', 'prose', 'choice'])
+def test_not_regular(name: str):
+    with pytest.raises(NotRegularError):
+        compile_rule(CompilerRule(name))
+
+
+def test_max_dfa_states():
+    with pytest.raises(NotRegularError):
+        compile_rule(CompilerRule('pair'), max_dfa_states=2)
+
+
+def test_max_nfa_states():
+    with pytest.raises(NotRegularError):
+        compile_rule(CompilerRule('pair'), max_nfa_states=2)
+
+
+def test_dfa_ends():
+    dfa = compile_rule(CompilerRule('pair'))
+    assert dfa.ends('abc=123x', 0) == [5, 6, 7]
+    assert dfa.ends('abc=x', 0) == []
+    assert dfa.match('xabc=12', 1) == 7
+    assert dfa.match('=12', 0) is None
+    assert str(dfa)
+
+
+def test_dfa_bounded_repetition():
+    dfa = compile_rule(CompilerRule('bounded'))
+    assert dfa.ends('aaaaa', 0) == [2, 3]
+
+
+def test_dfa_case_insensitive():
+    dfa = compile_rule(CompilerRule('kelvin'))
+    # KELVIN SIGN casefolds to "k", so the generic parser accepts it too.
+    for src in ['k', 'K', 'K']:
+        assert dfa.match(src) == 1
+        assert CompilerRule('kelvin').parse_all(src).value == src
+
+
+def test_compile_grammar():
+    try:
+        compiled = compile_grammar(CompilerRule)
+        assert CompilerRule('pair') in compiled
+        assert CompilerRule('nested') not in compiled
+        assert CompilerRule('nested').matcher is None
+    finally:
+        uncompile_grammar(CompilerRule)
+    assert CompilerRule('pair').matcher is None
+
+
+def test_lazy_node(compiled_grammars: None):
+    node = CompilerRule('pair').parse_all('abc=123')
+    assert isinstance(node, LazyNode)
+    assert node.value == 'abc=123'
+    assert node._children is None
+    assert [child.name for child in node.children] == ['word', 'literal', 'digits']
+    assert isinstance(node.children[0], LazyNode)
+
+
+def test_lazy_node_arena(compiled_grammars: None):
+    node = CompilerRule('pair').parse_all('abc=123', arena=True)
+    assert isinstance(node, LazyNode)
+    rfc9110.Rule('Accept').matcher = None
+    node = rfc9110.Rule('Accept').parse_all('text/html, */*;q=0.8', arena=True)
+    assert isinstance(node, ArenaNode)
+    assert isinstance(node.children[0], LazyNode)
+    assert node == rfc9110.Rule('Accept').parse_all('text/html, */*;q=0.8')
+
+
+def test_compiled_parse_error(compiled_grammars: None):
+    with pytest.raises(ParseError):
+        CompilerRule('pair').parse_all('abc=')
+    with pytest.raises(ParseError):
+        CompilerRule('pair').parse_all('abc=12x')
+
+
+@pytest.mark.parametrize("rule_cls, name, src", [
+    (rfc3986.Rule, 'URI', 'http://www.example.com/some/path?query=string#frag'),
+    (rfc3986.Rule, 'URI', 'https://user:pass@[2001:db8::8a2e:370:7334]:8443/a/b/c?x=1'),
+    (rfc3986.Rule, 'URI', 'urn:example:animal:ferret:nose'),
+    (rfc3986.Rule, 'IPv6address', '::ffff:192.0.2.128'),
+    (rfc3986.Rule, 'path-abempty', '/a/b%20c/d'),
+    (rfc9110.Rule, 'Accept', 'text/html, application/xhtml+xml, application/xml;q=0.9, */*;q=0.8'),
+    (rfc9110.Rule, 'Content-Type', 'text/html; charset="utf-8"'),
+    (rfc9110.Rule, 'Date', 'Sun, 06 Nov 1994 08:49:37 GMT'),
+    (rfc9110.Rule, 'If-None-Match', 'W/"xyzzy", "r2d2xxxx", "c3piozzzz"'),
+])
+def test_compiled_tree_matches_generic(request: pytest.FixtureRequest, rule_cls: typing.Type[Rule], name: str, src: str):
+    expected = rule_cls(name).parse_all(src)
+    request.getfixturevalue('compiled_grammars')
+    node = rule_cls(name).parse_all(src)
+    assert node.value == src
+    assert node == expected
+    assert expected == node
@@ -0,0 +1,113 @@
+import typing
+
+import pytest
+
+from src.abnf1.grammars import cache
+from src.abnf1.grammars.misc import load_grammar_rules
+from src.abnf1.parser import Literal, Rule as _Rule
+
+
+class ImportRule(_Rule):
+    pass
+
+
+ImportRule("imported", Literal("x"))
+
+
+def make_grammar_with(grammar: typing.List[str], imported=None):
+    # each call creates a new class with the same qualified name, like a new process
+    # importing the grammar module.
+    class Grammar(_Rule):
+        pass
+
+    Grammar.grammar = grammar
+    return load_grammar_rules(imported)(Grammar)
+
+
+GRAMMAR = ['greeting = "hello" 1*SP name', 'name = 1*ALPHA / imported']
+IMPORTED = [("imported", ImportRule("imported"))]
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.delenv(cache.NO_CACHE_ENV, raising=False)
+    return tmp_path
+
+
+def test_grammar_cache_stores(cache_dir):
+    make_grammar_with(GRAMMAR, IMPORTED)
+    assert len(list(cache_dir.rglob("*.pickle"))) == 1
+
+
+def test_grammar_cache_load(cache_dir, monkeypatch):
+    built = make_grammar_with(GRAMMAR, IMPORTED)
+
+    def fail():
+        raise AssertionError("grammar was built again")
+
+    monkeypatch.setattr(cache, "_store", lambda *args: fail())
+    loaded = make_grammar_with(GRAMMAR, IMPORTED)
+    assert loaded is not built
+    assert [rule.name for rule in loaded.rules()] == [
+        rule.name for rule in built.rules()
+    ]
+    for source in ["hello world", "hello  x"]:
+        assert loaded("greeting").parse_all(source) == built("greeting").parse_all(
+            source
+        )
+    assert loaded("imported").definition == ImportRule("imported").definition
+
+
+def test_grammar_cache_invalidated(cache_dir):
+    make_grammar_with(GRAMMAR, IMPORTED)
+    first = set(cache_dir.rglob("*.pickle"))
+    changed = make_grammar_with(['greeting = "hi" 1*SP name', "name = 1*DIGIT"])
+    second = set(cache_dir.rglob("*.pickle"))
+    assert len(second) == 1
+    assert first != second
+    assert changed("greeting").parse_all("hi 42").value == "hi 42"
+
+
+def test_grammar_cache_damaged(cache_dir):
+    make_grammar_with(GRAMMAR, IMPORTED)
+    (path,) = cache_dir.rglob("*.pickle")
+    path.write_bytes(b"not a pickle")
+    grammar = make_grammar_with(GRAMMAR, IMPORTED)
+    assert grammar("greeting").parse_all("hello world").value == "hello world"
+
+
+def test_grammar_cache_disabled_env(cache_dir, monkeypatch):
+    monkeypatch.setenv(cache.NO_CACHE_ENV, "1")
+    grammar = make_grammar_with(GRAMMAR, IMPORTED)
+    assert grammar("greeting").parse_all("hello world").value == "hello world"
+    assert not list(cache_dir.rglob("*.pickle"))
+
+
+def test_grammar_cache_disabled_flag(cache_dir, monkeypatch):
+    monkeypatch.setattr(cache, "grammar_cache_enabled", False)
+    make_grammar_with(GRAMMAR, IMPORTED)
+    assert not list(cache_dir.rglob("*.pickle"))
+
+
+def test_grammar_cache_unwritable(tmp_path, monkeypatch):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, str(blocker / "abnf"))
+    monkeypatch.delenv(cache.NO_CACHE_ENV, raising=False)
+    grammar = make_grammar_with(GRAMMAR, IMPORTED)
+    assert grammar("greeting").parse_all("hello world").value == "hello world"
+
+
+def test_grammar_cache_namespaced_by_library(cache_dir):
+    other = cache_dir / "v1-0123456789abcdef"
+    other.mkdir()
+    make_grammar_with(GRAMMAR, IMPORTED)
+    (path,) = cache_dir.rglob("*.pickle")
+    assert path.parent != other
+    # an entry for the same grammar written by another version of abnf is kept.
+    other_path = other / path.name
+    other_path.write_bytes(path.read_bytes())
+    make_grammar_with(['greeting = "hi" 1*SP name', "name = 1*DIGIT"])
+    assert other_path.exists()
+    assert len(list(path.parent.glob("*.pickle"))) == 1
@@ -1,5 +1,7 @@
+import json
 import pathlib
-from typing import Any, cast, Tuple
+import pickle
+from typing import Any, cast, Dict, List, Optional, Tuple
 
 import pytest
 
@@ -334,3 +336,312 @@ def test_empty_charval_node():
     visitor = CharValNodeVisitor()
     parser = visitor.visit(node)
     assert parser
+
+
+def test_unique_matches():
+    match0 = Match([], 1)
+    match1 = Match([cast(Node, LiteralNode('a', 0, 1))], 1)
+    match2 = Match([], 2)
+    unique = unique_matches([match0, match1, match2])
+    assert list(unique) == [1, 2]
+    assert unique[1] is match0
+
+
+def test_parse_session_bad_max_size():
+    with pytest.raises(ValueError):
+        ParseSession(-1)
+
+
+def test_parse_session_str():
+    assert str(ParseSession())
+
+
+def test_parse_session_stats():
+    src = 'foo = "a" / "b" / *("c" / "d")\r\n'
+    session = ParseSession()
+    node = ABNFGrammarRule('rule').parse_all(src, session=session)
+    assert node.value == src
+    assert session.misses > 0
+    assert session.hits > 0
+    # the memo table is released once the parse is done.
+    assert len(session) == 0
+    assert session.source is None
+
+
+def test_parse_session_reset_per_parse_all():
+    src = 'foo = "a" / "b"\r\n'
+    session = ParseSession()
+    ABNFGrammarRule('rule').parse_all(src, session=session)
+    stats = (session.hits, session.misses)
+    ABNFGrammarRule('rule').parse_all(src, session=session)
+    assert (session.hits, session.misses) == stats
+
+
+def test_parse_session_max_size():
+    src = 'foo = "a" / "b" / *("c" / "d")\r\n'
+    sizes = []
+
+    class RecordingSession(ParseSession):
+        def lparse(self, *args: Any):
+            sizes.append(len(self.memo))
+            return super().lparse(*args)
+
+    session = RecordingSession(max_size=5)
+    node = ABNFGrammarRule('rule').parse_all(src, session=session)
+    assert node == ABNFGrammarRule('rule').parse_all(src)
+    assert max(sizes) <= 5
+
+
+def test_parse_session_parse_error():
+    session = ParseSession()
+    with pytest.raises(ParseError):
+        ABNFGrammarRule('rule').parse_all('foo = \r\n', session=session)
+    assert session.misses > 0
+
+
+def test_repetition_session_skips_lparse_cache():
+    rule = ABNFGrammarRule('rulename')
+    rule.parse_all('foo-bar')
+    repetition = cast(Concatenation, rule.definition).parsers[1]
+    assert isinstance(repetition, Repetition)
+    assert ('foo-bar', 1) not in repetition.lparse_cache
+
+
+@pytest.mark.parametrize("parser, src, expected", [
+    (Literal('ab'), 'abc', [2]),
+    (Literal('AB'), 'abc', [2]),
+    (Literal('AB', case_sensitive=True), 'abc', []),
+    (Literal(('a', 'c')), 'b', [1]),
+    (Literal(('a', 'c')), '', []),
+    (Alternation(Literal('a'), Literal('ab')), 'abc', [1, 2]),
+    (Alternation(Literal('a'), Literal('ab'), first_match=True), 'abc', [1]),
+    (Alternation(Literal('x'), Literal('ab'), first_match=True), 'abc', [2]),
+    (Concatenation(Literal('a'), Option(Literal('b'))), 'abc', [1, 2]),
+    (Concatenation(Literal('a'), Literal('c')), 'abc', []),
+    (Repetition(Repeat(1, 2), Literal('a')), 'aaa', [1, 2]),
+    (Repetition(Repeat(2, None), Literal('a')), 'aaab', [2, 3]),
+    (Repetition(Repeat(2, None), Literal('a')), 'ab', []),
+    (Repetition(Repeat(0, 0), Literal('a')), 'ab', [0]),
+    (Prose(), 'abc', []),
+])
+def test_parser_ends(parser: Parser, src: str, expected: List[int]):
+    assert sorted(parser_ends(parser, src, 0)) == expected
+
+
+def test_parser_ends_lparse_fallback():
+    class LparseOnly:
+        def __init__(self, parser: Parser):
+            self.parser = parser
+
+        def lparse(self, source: str, start: int):
+            return self.parser.lparse(source, start)
+
+    assert sorted(parser_ends(LparseOnly(Literal('a')), 'ab', 0)) == [1]
+    assert sorted(parser_ends(LparseOnly(Literal('b')), 'ab', 0)) == []
+
+
+@pytest.mark.parametrize("src, expected", [
+    ('foo = "a" / "b"\r\n', True),
+    ('foo = \r\n', False),
+    ('foo = "a"', False),
+])
+def test_recognize(src: str, expected: bool):
+    assert ABNFGrammarRule('rule').recognize(src) is expected
+
+
+def test_recognize_exclude():
+    class ExcludeRule(Rule):
+        pass
+
+    ExcludeRule.create('keyword = "if"')
+    ExcludeRule.create('identifier = 1*ALPHA')
+    ExcludeRule('identifier').exclude_rule(ExcludeRule('keyword'))
+    assert ExcludeRule('identifier').recognize('iff')
+    assert not ExcludeRule('identifier').recognize('if')
+
+
+def test_recognize_undefined_rule():
+    class UndefinedRule(Rule):
+        pass
+
+    with pytest.raises(GrammarError):
+        UndefinedRule('undefined').recognize('a')
+
+
+BATCH = ['foo = "a"\r\n', 'foo = \r\n', 'bar = 1*DIGIT\r\n', 'baz']
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_validate_many(workers: Optional[int]):
+    results = ABNFGrammarRule('rule').validate_many(iter(BATCH), workers=workers, chunk_size=3)
+    assert list(results) == [True, False, True, False]
+
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_parse_many(workers: Optional[int]):
+    results = list(ABNFGrammarRule('rule').parse_many(BATCH, workers=workers, chunk_size=1))
+    assert [type(result) for result in results] == [Node, ParseError, Node, ParseError]
+    assert results[0] == ABNFGrammarRule('rule').parse_all(BATCH[0])
+    assert cast(Node, results[2]).value == BATCH[2]
+
+
+@pytest.mark.parametrize("kwargs", [{'workers': 0}, {'chunk_size': 0}])
+def test_many_bad_args(kwargs: Dict[str, int]):
+    with pytest.raises(ValueError):
+        ABNFGrammarRule('rule').validate_many(BATCH, **kwargs)
+
+
+def test_rule_pickle():
+    rule = ABNFGrammarRule('rule')
+    assert pickle.loads(pickle.dumps(rule)) is rule
+
+
+class PickledRule(Rule):
+    pass
+
+
+def test_rule_unpickle_undefined():
+    data = pickle.dumps(PickledRule.create('pickled = "x" 1*DIGIT'))
+    del PickledRule._obj_map[(PickledRule, 'pickled')]
+    rule = pickle.loads(data)
+    assert rule is PickledRule('pickled')
+    assert rule.recognize('x12')
+
+
+def test_parse_error_pickle():
+    error = pickle.loads(pickle.dumps(ParseError(ABNFGrammarRule('rule'), 3)))
+    assert error.parser is ABNFGrammarRule('rule')
+    assert error.start == 3
+
+
+def test_repetition_pickle_drops_cache():
+    parser = Repetition(Repeat(1, 2), Literal('a'))
+    list(parser.lparse('aa', 0))
+    assert len(parser.lparse_cache) == 1
+    assert len(pickle.loads(pickle.dumps(parser)).lparse_cache) == 0
+
+
+@pytest.mark.parametrize("src", [
+    'foo = "a" / "b" / *("c" / "d")\r\n',
+    'bar = 1*DIGIT [ "x" ] <prose>\r\n',
+    'baz = %x41-5A 2*3( "a" %d98 )\r\n',
+])
+def test_arena_tree(src: str):
+    expected = ABNFGrammarRule('rule').parse_all(src)
+    node = ABNFGrammarRule('rule').parse_all(src, arena=True)
+    assert isinstance(node, ArenaNode)
+    assert node._children is None
+    assert node.value == src
+    assert node == expected
+    assert expected == node
+
+
+def test_arena_tree_visitor():
+    node = ABNFGrammarRule('rule').parse_all('foo = "a" / "b"\r\n', arena=True)
+    rule = ABNFGrammarNodeVisitor(Rule).visit(node)
+    assert rule.parse_all('b').value == 'b'
+
+
+def test_arena_tree_pickle():
+    src = 'foo = "a" / "b"\r\n'
+    node = pickle.loads(pickle.dumps(ABNFGrammarRule('rule').parse_all(src, arena=True)))
+    assert type(node) is Node
+    assert node == ABNFGrammarRule('rule').parse_all(src)
+
+
+def test_arena_tree_parse_error():
+    with pytest.raises(ParseError):
+        ABNFGrammarRule('rule').parse_all('foo = \r\n', arena=True)
+
+
+def test_arena_tree_exclude():
+    class ArenaExcludeRule(Rule):
+        pass
+
+    ArenaExcludeRule.create('keyword = "if"')
+    ArenaExcludeRule.create('identifier = 1*ALPHA')
+    ArenaExcludeRule('identifier').exclude_rule(ArenaExcludeRule('keyword'))
+    assert ArenaExcludeRule('identifier').parse_all('iff', arena=True).value == 'iff'
+    with pytest.raises(ParseError):
+        ArenaExcludeRule('identifier').parse_all('if', arena=True)
+
+
+def test_match_arena_join():
+    arena = MatchArena('abcd')
+    a, b, c, d = (arena.literal(i, i + 1) for i in range(4))
+    ab = a.extend(b)
+    cd = c.extend(d)
+    abcd = ab.extend(cd)
+    assert isinstance(abcd, ArenaMatch)
+    assert abcd.start == 4
+    assert arena.items(abcd.chain) == [0, 1, 2, 3]
+    # the matches that were extended are unchanged.
+    assert arena.items(ab.chain) == [0, 1]
+    assert [node.value for node in abcd.nodes] == ['a', 'b', 'c', 'd']
+    assert Match([], 0).extend(cd) is cd
+    assert abcd.extend(Match([], 4)).nodes == abcd.nodes
+
+
+def test_match_arena_foreign_match():
+    arena = MatchArena('a')
+    with pytest.raises(TypeError):
+        arena.literal(0, 1).extend(Match([cast(Node, LiteralNode('a', 0, 1))], 1))
+
+
+def test_node_arena():
+    node = ABNFGrammarRule('rulename').parse_all('ab', arena=True)
+    assert isinstance(node, ArenaNode)
+    arena = node.arena
+    assert len(arena) == 5
+    assert [arena.node(child).name for child in arena.children(node.index)] == ['ALPHA', 'ALPHA']
+
+
+def test_parse_profile():
+    src = 'foo = "a" / "b" / *("c" / "d")\r\n'
+    profile = ParseProfile()
+    node = ABNFGrammarRule('rule').parse_all(src, profile=profile)
+    assert node == ABNFGrammarRule('rule').parse_all(src)
+    stats = profile.stats[ABNFGrammarRule('rule')]
+    assert stats.invocations == 1
+    assert stats.matches >= 1
+    assert stats.time >= stats.self_time > 0
+    assert profile.stats[ABNFGrammarRule('rulename')].invocations >= 1
+    # rules nested in rule are included in its time.
+    assert all(other.time <= stats.time for other in profile.stats.values())
+    invocations = stats.invocations
+    ABNFGrammarRule('rule').parse_all(src, profile=profile)
+    assert stats.invocations == 2 * invocations
+    profile.clear()
+    assert len(profile) == 0
+
+
+def test_parse_profile_fan_out():
+    class FanOutRule(Rule):
+        pass
+
+    FanOutRule.create('ambiguous = "a" / "a" / "ab" / "x"')
+    profile = ParseProfile()
+    FanOutRule('ambiguous').parse_all('ab', profile=profile)
+    assert profile.stats[FanOutRule('ambiguous')].max_fan_out == 3
+
+
+def test_parse_profile_parse_error():
+    profile = ParseProfile()
+    with pytest.raises(ParseError):
+        ABNFGrammarRule('rule').parse_all('foo = \r\n', profile=profile)
+    assert profile.stats[ABNFGrammarRule('rule')].matches == 0
+    assert profile.stats[ABNFGrammarRule('rule')].invocations == 1
+
+
+def test_parse_profile_output():
+    profile = ParseProfile()
+    ABNFGrammarRule('rule').parse_all('foo = "a" / "b"\r\n', profile=profile)
+    lines = profile.table(sort='invocations', limit=3).splitlines()
+    assert lines[0].split() == ['rule', *ParseProfile.columns]
+    assert len(lines) == 4
+    rows = json.loads(profile.to_json(sort='rule'))
+    assert [row['rule'] for row in rows] == sorted(row['rule'] for row in rows)
+    assert set(rows[0]) == {'rule', 'grammar', *ParseProfile.columns}
+    assert str(profile) == profile.table()
+    with pytest.raises(ValueError):
+        profile.rows(sort='bogus')
@@ -0,0 +1,195 @@
+import typing
+
+import pytest
+
+from src.abnf1.grammars import rfc7230, rfc9110
+from src.abnf1.parser import ParseError
+from src.abnf1.streaming import *
+
+REQUEST = (
+    b"GET /index.html?q=1 HTTP/1.1\r\n"
+    b"Host: www.example.com\r\n"
+    b"Accept: text/html, */*;q=0.8\r\n"
+    b"Content-Length: 4\r\n"
+    b"X-Custom:  hello world \r\n"
+    b"\r\n"
+)
+
+EVENTS = [
+    StartLine("GET /index.html?q=1 HTTP/1.1"),
+    HeaderField("Host", "www.example.com"),
+    HeaderField("Accept", "text/html, */*;q=0.8"),
+    HeaderField("Content-Length", "4"),
+    HeaderField("X-Custom", "hello world"),
+    EndOfHeaders(),
+]
+
+
+def feed_chunks(stream: HeaderStream, data: bytes, size: int) -> typing.List[Event]:
+    events: typing.List[Event] = []
+    for i in range(0, len(data), size):
+        events.extend(
+            event for event in stream.feed(data[i : i + size]) if event is not NEED_DATA
+        )
+    return events
+
+
+def test_header_stream():
+    stream = HeaderStream()
+    assert stream.feed(REQUEST + b"BODY") == EVENTS
+    assert stream.done
+    assert stream.unused_data == b"BODY"
+    assert stream.offset == len(REQUEST)
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 16])
+def test_header_stream_chunks(size: int):
+    stream = HeaderStream()
+    assert feed_chunks(stream, REQUEST + b"BODY", size) == EVENTS
+    assert stream.unused_data == b"BODY"
+    assert stream.offset == len(REQUEST)
+
+
+def test_header_stream_need_data():
+    stream = HeaderStream()
+    assert stream.feed(b"GET / HTTP/1.1\r\nHost: exa") == [
+        StartLine("GET / HTTP/1.1"),
+        NEED_DATA,
+    ]
+    assert stream.feed(b"mple.com\r") == [NEED_DATA]
+    assert stream.feed(b"\n") == [HeaderField("Host", "example.com"), NEED_DATA]
+    assert stream.feed(b"\r\n") == [EndOfHeaders()]
+    assert stream.feed(b"more") == []
+    assert stream.unused_data == b"more"
+
+
+def test_header_stream_memoryview():
+    data = bytearray(REQUEST)
+    assert HeaderStream().feed(memoryview(data)) == EVENTS
+
+
+def test_header_stream_leading_empty_lines():
+    assert HeaderStream().feed(b"\r\n\r\n" + REQUEST) == EVENTS
+
+
+def test_header_stream_trailer():
+    stream = HeaderStream(start_line=None)
+    assert stream.feed(b"Expires: 0\r\n\r\n") == [
+        HeaderField("Expires", "0"),
+        EndOfHeaders(),
+    ]
+
+
+def test_header_stream_status_line():
+    stream = HeaderStream(start_line="status-line")
+    assert stream.feed(b"HTTP/1.1 200 OK\r\n\r\n") == [
+        StartLine("HTTP/1.1 200 OK"),
+        EndOfHeaders(),
+    ]
+    with pytest.raises(ParseError):
+        HeaderStream(start_line="status-line").feed(b"GET / HTTP/1.1\r\n")
+
+
+def test_header_stream_not_compiled():
+    assert HeaderStream(compiled=False).feed(REQUEST) == EVENTS
+
+
+def test_header_stream_field_rules():
+    stream = HeaderStream(field_rules={"X-Number": rfc9110.Rule("Max-Forwards")})
+    assert stream.feed(b"GET / HTTP/1.1\r\nx-number: 10\r\nAccept: ;;\r\n\r\n")[
+        -1
+    ] == EndOfHeaders()
+    with pytest.raises(ParseError):
+        HeaderStream(field_rules={"x-number": rfc9110.Rule("Max-Forwards")}).feed(
+            b"GET / HTTP/1.1\r\nX-Number: ten\r\n"
+        )
+
+
+@pytest.mark.parametrize(
+    "data, rule, offset",
+    [
+        (b"GET / HTTP/1.1\r\nBad Name: x\r\n", rfc7230.Rule("header-field"), 16),
+        (
+            b"GET / HTTP/1.1\r\nHost: a\r\nContent-Length: 1x\r\n",
+            rfc9110.Rule("Content-Length"),
+            25 + len("Content-Length: "),
+        ),
+        (b"GET / HTTP/1.1\r\nHost: a\r\n folded\r\n", rfc7230.Rule("header-field"), 25),
+        (b"GET / HTTP/1.1\r\nHost: a\n", rfc7230.Rule("header-field"), 16),
+        (b"GET /\r\n", rfc7230.Rule("start-line"), 0),
+    ],
+)
+def test_header_stream_invalid(data: bytes, rule, offset: int):
+    for size in [1, len(data)]:
+        with pytest.raises(ParseError) as excinfo:
+            feed_chunks(HeaderStream(), data, size)
+        assert excinfo.value.parser == rule
+        assert excinfo.value.start == offset
+
+
+def test_header_stream_line_too_long():
+    stream = HeaderStream(max_line_length=32)
+    stream.feed(b"GET / HTTP/1.1\r\n")
+    # raised before the end of the line is seen.
+    with pytest.raises(ParseError) as excinfo:
+        stream.feed(b"X-Long: " + b"x" * 32)
+    assert excinfo.value.start == 16
+
+
+def test_header_stream_max_line_length():
+    with pytest.raises(ValueError):
+        HeaderStream(max_line_length=1)
+
+
+def accepts(data: bytes, compiled: bool) -> bool:
+    try:
+        HeaderStream(compiled=compiled).feed(data)
+    except ParseError:
+        return False
+    return True
+
+
+@pytest.mark.parametrize(
+    "start_line",
+    [
+        b"GET /a/b?c=d HTTP/1.1",
+        b"GET /a b HTTP/1.1",
+        b"GET /a HTTP/1.1 ",
+        b"GET  /a HTTP/1.1",
+        b"G@T /a HTTP/1.1",
+        b"GET /% HTTP/1.1",
+        b"GET /a HTTP/1",
+        b"GET * HTTP/1.1",
+        b"GET http://example.com/a HTTP/1.1",
+        b"CONNECT example.com:443 HTTP/1.1",
+        b"HTTP/1.1 404 Not Found",
+        b"HTTP/1.1 404",
+    ],
+)
+def test_header_stream_start_line_fast_path(start_line: bytes):
+    data = start_line + b"\r\n\r\n"
+    assert accepts(data, compiled=True) == accepts(data, compiled=False)
+
+
+@pytest.mark.parametrize(
+    "host",
+    [
+        b"example.com",
+        b"example.com:8080",
+        b"example.com:",
+        b"example.com:80:80",
+        b"example.com:http",
+        b"ex%41mple.com",
+        b"ex%4",
+        b"1.2.3.4",
+        b"1.2.3.4:80",
+        b"1.2.3.4x",
+        b"1x",
+        b"[::1]:80",
+        b"[::1",
+        b"",
+    ],
+)
+def test_header_stream_host_fast_path(host: bytes):
+    data = b"GET / HTTP/1.1\r\nHost: " + host + b"\r\n\r\n"
+    assert accepts(data, compiled=True) == accepts(data, compiled=False)
@@ -0,0 +1,104 @@
+"""
+Measures driver memory of the extreme_weather template job on synthetic GSOD-like
+data in local-mode Spark, for growing inputs.
+
+    python benchmarks/extreme_weather_memory.py [rows ...]
+
+For each size, the job runs in a fresh process, once with the distributed
+implementation in the template and once with the previous implementation, which
+called `toPandas()` once per stat. The peak RSS of the Python driver process is
+reported: with the distributed implementation it stays flat as the input grows.
+
+Requires pyspark and a Java runtime.
+"""
+
+import contextlib
+import io
+import os
+import resource
+import subprocess
+import sys
+
+TEMPLATE_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "src", "emr_cli", "templates", "pyspark"
+)
+DEFAULT_SIZES = [250_000, 1_000_000, 4_000_000]
+
+
+def synthetic_gsod(spark, rows: int):
+    from pyspark.sql import functions as F
+
+    # About 1% of readings are the 9999.9 "no reading" value
+    def reading(seed: int, low: float, high: float):
+        return F.when(F.rand(seed) < 0.01, F.lit(9999.9)).otherwise(
+            F.round(F.lit(low) + F.rand(seed + 1) * (high - low), 1)
+        )
+
+    return (
+        spark.range(rows)
+        .withColumn("STATION", (F.col("id") % 10000).cast("string"))
+        .withColumn("DATE", F.expr("date_add(date'2022-01-01', cast(id % 365 as int))"))
+        .withColumn("LATITUDE", F.round(F.rand(1) * 180 - 90, 3))
+        .withColumn("LONGITUDE", F.round(F.rand(2) * 360 - 180, 3))
+        .withColumn("ELEVATION", F.round(F.rand(3) * 3000, 1))
+        .withColumn("NAME", F.concat(F.lit("STATION "), F.col("STATION")))
+        .withColumn("MAX", reading(4, -40.0, 120.0))
+        .withColumn("TEMP", reading(6, -50.0, 110.0))
+        .drop("id")
+    )
+
+
+def run_once(rows: int, implementation: str) -> None:
+    sys.path.insert(0, TEMPLATE_DIR)
+    from pyspark.sql import SparkSession
+    from jobs.extreme_weather import STATS, ExtremeWeather
+
+    spark = (
+        SparkSession.builder.master("local[*]")
+        .config("spark.driver.memory", "4g")
+        .config("spark.ui.enabled", "false")
+        .getOrCreate()
+    )
+    spark.sparkContext.setLogLevel("ERROR")
+
+    class SyntheticWeather(ExtremeWeather):
+        def _fetch_data(self):
+            return synthetic_gsod(self.spark, rows)
+
+    job = SyntheticWeather(2022)
+    with contextlib.redirect_stdout(io.StringIO()):
+        if implementation == "distributed":
+            job.run()
+        else:
+            df = job._fetch_data()
+            for stat in STATS:
+                # What find_outliers_for_column used to do
+                dfp = df.toPandas()
+                q = dfp.quantile(0.99, numeric_only=True)
+                col = stat["column_name"]
+                dfp[dfp[col] > q[col]][:10]
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(peak_kb // 1024)
+
+
+def main(sizes) -> None:
+    print(f"{'rows':>12} {'distributed':>14} {'toPandas':>14}")
+    for rows in sizes:
+        peaks = []
+        for implementation in ["distributed", "toPandas"]:
+            result = subprocess.run(
+                [sys.executable, __file__, "--run", str(rows), implementation],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            peaks.append(f"{result.stdout.split()[-1]} MB")
+        print(f"{rows:>12} {peaks[0]:>14} {peaks[1]:>14}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--run"]:
+        run_once(int(sys.argv[2]), sys.argv[3])
+    else:
+        main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
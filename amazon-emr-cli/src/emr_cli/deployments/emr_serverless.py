@@ -1,11 +1,15 @@
 import abc
 import json
 import os
+import random
 import sys
-from time import sleep
-from typing import List, Optional
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import boto3
+from botocore.exceptions import ClientError
 
 from src.emr_cli.utils import console_log
 
@@ -184,6 +188,113 @@ class Bootstrap:
         return app_id
 
 
+class JobSpec(NamedTuple):
+    name: str
+    job_args: Optional[List[str]] = None
+    spark_submit_opts: Optional[str] = None
+
+
+class JobRunResult(NamedTuple):
+    job_run_id: str
+    name: str
+    state: str
+    state_details: str = ""
+
+
+class JobPoller:
+    """
+    Tracks any number of job runs with a single polling loop.
+
+    Each round calls `get_job_run` once for every job run that hasn't finished.
+    The interval between rounds starts at `min_interval`, grows by `backoff` for
+    every round in which no job changed state, up to `max_interval`, and drops
+    back to `min_interval` when one does. Throttling errors end the round early
+    and back off as well. Each sleep is jittered to between half and all of the
+    interval, so concurrent pollers don't call the API in lockstep.
+    """
+
+    TERMINAL_STATES = ["SUCCESS", "FAILED", "CANCELLING", "CANCELLED"]
+    THROTTLING_ERRORS = [
+        "ThrottlingException",
+        "TooManyRequestsException",
+        "RequestLimitExceeded",
+    ]
+
+    def __init__(
+        self,
+        client,
+        application_id: str,
+        min_interval: float = 2.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+        on_transition: Optional[Callable[[JobRunResult, str], None]] = None,
+        sleep: Optional[Callable[[float], None]] = None,
+        jitter: Optional[Callable[[], float]] = None,
+    ) -> None:
+        self.client = client
+        self.application_id = application_id
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.on_transition = on_transition or self._log_transition
+        self.sleep = sleep or time.sleep
+        self.jitter = jitter or random.random
+        self.jobs: Dict[str, JobRunResult] = {}
+
+    def add(self, job_run_id: str, name: str, state: str = "SUBMITTED"):
+        self.jobs[job_run_id] = JobRunResult(job_run_id, name, state)
+
+    def results(self) -> List[JobRunResult]:
+        return list(self.jobs.values())
+
+    def wait(self) -> List[JobRunResult]:
+        """
+        Polls until every job run is in a terminal state and returns the results,
+        in the order the job runs were added.
+        """
+        interval = self.min_interval
+        while True:
+            changed, throttled = self._poll()
+            if not self._pending():
+                return self.results()
+            if changed and not throttled:
+                interval = self.min_interval
+            else:
+                interval = min(self.max_interval, interval * self.backoff)
+            self.sleep(interval * (0.5 + self.jitter() / 2))
+
+    def _pending(self) -> List[str]:
+        return [
+            job.job_run_id
+            for job in self.jobs.values()
+            if job.state not in self.TERMINAL_STATES
+        ]
+
+    def _poll(self) -> Tuple[bool, bool]:
+        changed = False
+        for job_run_id in self._pending():
+            try:
+                job_run = self.client.get_job_run(
+                    applicationId=self.application_id, jobRunId=job_run_id
+                ).get("jobRun")
+            except ClientError as e:
+                if e.response.get("Error", {}).get("Code") in self.THROTTLING_ERRORS:
+                    return changed, True
+                raise
+            job = self.jobs[job_run_id]
+            new_state = job_run.get("state")
+            if new_state != job.state:
+                self.jobs[job_run_id] = job._replace(
+                    state=new_state, state_details=job_run.get("stateDetails", "")
+                )
+                self.on_transition(self.jobs[job_run_id], job.state)
+                changed = True
+        return changed, False
+
+    def _log_transition(self, job: JobRunResult, old_state: str):
+        console_log(f"{job.name} ({job.job_run_id}): {old_state} -> {job.state}")
+
+
 class EMRServerless:
     def __init__(
         self,
@@ -209,6 +320,72 @@ class EMRServerless:
         spark_submit_opts: Optional[str] = None,
         wait: bool = True,
     ):
+        job_run_id = self.start_job(job_name, job_args, spark_submit_opts)
+
+        console_log(f"Job submitted to EMR Serverless (Job Run ID: {job_run_id})")
+        if wait:
+            console_log("Waiting for job to complete...")
+            poller = JobPoller(
+                self.client,
+                self.application_id,
+                on_transition=lambda job, old_state: console_log(
+                    f"Job state is now: {job.state}"
+                ),
+            )
+            poller.add(job_run_id, job_name)
+            (job,) = poller.wait()
+            if job.state != "SUCCESS":
+                console_log(f"EMR Serverless job failed: {job.state_details}")
+                sys.exit(1)
+            console_log("Job completed successfully!")
+
+        return job_run_id
+
+    def run_jobs(
+        self,
+        jobs: List[JobSpec],
+        wait: bool = True,
+        max_workers: int = 8,
+    ) -> List[JobRunResult]:
+        """
+        Submits `jobs` concurrently and, if `wait` is set, tracks them all with one
+        poller until they finish. State transitions are logged as they are seen.
+        Returns the result of each job, in the order of `jobs`.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            job_run_ids = list(
+                executor.map(
+                    lambda job: self.start_job(
+                        job.name, job.job_args, job.spark_submit_opts
+                    ),
+                    jobs,
+                )
+            )
+        console_log(f"Submitted {len(jobs)} jobs to EMR Serverless")
+
+        poller = JobPoller(self.client, self.application_id)
+        for job, job_run_id in zip(jobs, job_run_ids):
+            console_log(f"{job.name}: Job Run ID {job_run_id}")
+            poller.add(job_run_id, job.name)
+        if not wait:
+            return poller.results()
+
+        console_log("Waiting for jobs to complete...")
+        results = poller.wait()
+        counts = Counter(result.state for result in results)
+        summary = ", ".join(f"{n} {state}" for state, n in sorted(counts.items()))
+        console_log(f"All jobs finished: {summary}")
+        return results
+
+    def start_job(
+        self,
+        job_name: str,
+        job_args: Optional[List[str]] = None,
+        spark_submit_opts: Optional[str] = None,
+    ) -> str:
+        """
+        Submits a job run and returns its ID without waiting for it.
+        """
         jobDriver = {
             "sparkSubmit": {
                 "entryPoint": self.dp.entrypoint_uri(),
@@ -241,38 +418,7 @@ class EMRServerless:
             #     }
             # },
         )
-        job_run_id = response.get("jobRunId")
-
-        console_log(f"Job submitted to EMR Serverless (Job Run ID: {job_run_id})")
-        if wait:
-            console_log("Waiting for job to complete...")
-
-        job_done = False
-        job_state = "SUBMITTED"
-        jr_response = {}
-        while wait and not job_done:
-            jr_response = self.get_job_run(job_run_id)
-            new_state = jr_response.get("state")
-            if new_state != job_state:
-                console_log(f"Job state is now: {new_state}")
-                job_state = new_state
-            job_done = new_state in [
-                "SUCCESS",
-                "FAILED",
-                "CANCELLING",
-                "CANCELLED",
-            ]
-            sleep(2)
-
-        if wait:
-            if jr_response.get("state") != "SUCCESS":
-                console_log(
-                    f"EMR Serverless job failed: {jr_response.get('stateDetails')}"
-                )
-                sys.exit(1)
-            console_log("Job completed successfully!")
-
-        return job_run_id
+        return response.get("jobRunId")
 
     def get_job_run(self, job_run_id: str) -> dict:
         response = self.client.get_job_run(
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Tuple
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from src.emr_cli.utils import console_log
+
+# Object metadata key holding the SHA-256 of the uploaded file.
+# S3 returns user metadata keys in lowercase, so keep it lowercase here too.
+SHA256_METADATA_KEY = "emr-cli-sha256"
+
+MB = 1024 * 1024
+HASH_BLOCK_SIZE = 1 * MB
+
+
+class UploadResult(NamedTuple):
+    path: str
+    uri: str
+    sha256: str
+    uploaded: bool
+
+
+class _Progress:
+    """
+    Logs upload progress of a single file in 10% steps.
+
+    s3transfer calls this from several threads at once for multipart uploads.
+    """
+
+    def __init__(self, path: str, size: int):
+        self.name = os.path.basename(path)
+        self.size = size
+        self.seen = 0
+        self.logged = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, bytes_amount: int):
+        with self.lock:
+            self.seen += bytes_amount
+            percent = self.seen * 100 // self.size
+            if percent >= self.logged + 10:
+                self.logged = percent - percent % 10
+                console_log(f"Uploading {self.name}: {self.logged}%")
+
+
+def file_digests(path: str) -> Tuple[str, str]:
+    """
+    Returns the SHA-256 and MD5 hex digests of a file, read in a single pass.
+    """
+    sha256 = hashlib.sha256()
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+            md5.update(block)
+    return sha256.hexdigest(), md5.hexdigest()
+
+
+class S3Deployer:
+    """
+    Uploads deployment artifacts to S3, skipping files that are already there.
+
+    Each file is hashed locally and the SHA-256 is stored in the object metadata.
+    Before uploading, `head_object` is used to compare the local hash with the
+    metadata - or, for objects uploaded without it, with the ETag, which is the MD5
+    of single-part uploads. Changed files are uploaded concurrently, and large files
+    are split into parts that are themselves uploaded in parallel.
+    """
+
+    def __init__(
+        self,
+        s3_client,
+        max_workers: int = 4,
+        multipart_threshold: int = 16 * MB,
+        multipart_chunksize: int = 16 * MB,
+        max_concurrency: int = 8,
+        force: bool = False,
+    ) -> None:
+        self.s3_client = s3_client
+        self.max_workers = max_workers
+        self.transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold,
+            multipart_chunksize=multipart_chunksize,
+            max_concurrency=max_concurrency,
+        )
+        self.force = force
+
+    def deploy(self, artifacts: List[Tuple[str, str, str]]) -> List[UploadResult]:
+        """
+        Uploads each (local path, bucket, key) in `artifacts` unless the object
+        already has the same content. Returns a result per artifact, in order.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._deploy_file, path, bucket, key)
+                for path, bucket, key in artifacts
+            ]
+            results = [future.result() for future in futures]
+
+        uploaded = sum(1 for result in results if result.uploaded)
+        console_log(
+            f"Uploaded {uploaded} file(s), {len(results) - uploaded} unchanged"
+        )
+        return results
+
+    def _deploy_file(self, path: str, bucket: str, key: str) -> UploadResult:
+        uri = f"s3://{bucket}/{key}"
+        sha256, md5 = file_digests(path)
+        if not self.force and self._is_unchanged(bucket, key, sha256, md5):
+            console_log(f"{os.path.basename(path)} is unchanged, skipping upload")
+            return UploadResult(path, uri, sha256, False)
+
+        size = os.path.getsize(path)
+        self.s3_client.upload_file(
+            path,
+            bucket,
+            key,
+            ExtraArgs={"Metadata": {SHA256_METADATA_KEY: sha256}},
+            Callback=_Progress(path, size) if size >= 10 * MB else None,
+            Config=self.transfer_config,
+        )
+        console_log(f"Uploaded {os.path.basename(path)} to {uri}")
+        return UploadResult(path, uri, sha256, True)
+
+    def _is_unchanged(self, bucket: str, key: str, sha256: str, md5: str) -> bool:
+        response = self._head_object(bucket, key)
+        if response is None:
+            return False
+        remote_sha256 = response.get("Metadata", {}).get(SHA256_METADATA_KEY)
+        if remote_sha256 is not None:
+            return remote_sha256 == sha256
+        # Multipart ETags are not an MD5 of the content and can't be compared.
+        return response.get("ETag", "").strip('"') == md5
+
+    def _head_object(self, bucket: str, key: str) -> Optional[dict]:
+        try:
+            return self.s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            # Missing objects (404) or no permission to read them (403) both mean
+            # we can't prove the object is current, so we upload it.
+            return None
@@ -1,8 +1,10 @@
+import sys
+
 import click
 from src.emr_cli.config import ConfigReader, ConfigWriter
 from src.emr_cli.packaging.detector import ProjectDetector
 
-from .deployments.emr_serverless import Bootstrap, EMRServerless
+from .deployments.emr_serverless import Bootstrap, EMRServerless, JobSpec
 from .packaging.python_project import PythonProject
 
 
@@ -97,10 +99,16 @@ def init(path, dockerfile, project_type):
     help="Entrypoint file",
     required=True,
 )
+@click.option(
+    "--force",
+    default=False,
+    is_flag=True,
+    help="Build even if nothing changed since the last build",
+)
 @click.pass_obj
-def package(project, entry_point):
+def package(project, entry_point, force):
     p = project(entry_point)
-    p.build()
+    p.build(force=force)
 
 
 @click.command()
@@ -185,9 +193,88 @@ def run(
         emrs.run_job(job_name, job_args, spark_submit_opts, wait)
 
 
+@click.command(name="run-batch")
+@click.option("--application-id", help="EMR Serverless Application ID", required=True)
+@click.option(
+    "--entry-point",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=False),
+    help="Python or Jar file for the main entrypoint",
+    required=True,
+)
+@click.option(
+    "--job-role", help="IAM Role ARN to use for the job execution", required=True
+)
+@click.option("--wait", default=False, is_flag=True, help="Wait for all jobs to finish")
+@click.option("--s3-code-uri", help="Where to copy code artifacts to", required=True)
+@click.option("--job-name", help="The name of the jobs", default="emr-cli job")
+@click.option(
+    "--job-args",
+    help="""
+Comma-delimited string of arguments to be passed to one Spark job.
+Repeat the option to submit one job per set of arguments.""",
+    multiple=True,
+    required=True,
+)
+@click.option(
+    "--spark-submit-opts",
+    help="String of spark-submit options",
+    default=None,
+)
+@click.option(
+    "--max-concurrency",
+    help="Number of jobs submitted at the same time",
+    default=8,
+    show_default=True,
+)
+@click.option(
+    "--build",
+    help="Package and deploy the job assets before submitting",
+    default=False,
+    is_flag=True,
+)
+@click.pass_obj
+def run_batch(
+    project,
+    application_id,
+    entry_point,
+    job_role,
+    wait,
+    s3_code_uri,
+    job_name,
+    job_args,
+    spark_submit_opts,
+    max_concurrency,
+    build,
+):
+    """
+    Submits one EMR Serverless job per --job-args and tracks them all.
+    """
+    p = project(entry_point, s3_code_uri)
+
+    if build:
+        p.build()
+        p.deploy(s3_code_uri)
+
+    jobs = [
+        JobSpec(
+            f"{job_name} [{i}]", args.split(",") if args else None, spark_submit_opts
+        )
+        for i, args in enumerate(job_args, start=1)
+    ]
+    emrs = EMRServerless(application_id, job_role, p)
+    results = emrs.run_jobs(jobs, wait, max_concurrency)
+
+    failed = [r for r in results if wait and r.state != "SUCCESS"]
+    for r in failed:
+        click.echo(f"{r.name} ({r.job_run_id}) {r.state}: {r.state_details}")
+    if failed:
+        sys.exit(1)
+
+
 cli.add_command(package)
 cli.add_command(deploy)
 cli.add_command(run)
+cli.add_command(run_batch)
 cli.add_command(init)
 cli.add_command(bootstrap)
 
@@ -0,0 +1,126 @@
+import glob
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional
+
+# Files that decide which dependencies end up in a packaged virtual environment.
+DEPENDENCY_FILES = [
+    "pyproject.toml",
+    "poetry.lock",
+    "setup.py",
+    "setup.cfg",
+    "Dockerfile",
+    ".dockerignore",
+]
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def dependency_files(directory: str) -> List[str]:
+    """
+    Returns the packaging and requirements files present in `directory`.
+    """
+    paths = [os.path.join(directory, name) for name in DEPENDENCY_FILES]
+    paths += glob.glob(os.path.join(directory, "requirements*.txt"))
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def file_sha256(path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            sha256.update(block)
+    return sha256.hexdigest()
+
+
+class BuildCache:
+    """
+    Records the inputs of the last build in a manifest in `dist_dir`, so that
+    an unchanged project is not packaged again.
+
+    The fingerprint of a build is a hash over the path and content of every input
+    file. Content hashes are reused from the manifest while a file's size and
+    modification time are unchanged, so checking an unchanged project only stats
+    its files. A build is fresh if its fingerprint matches the manifest and the
+    outputs recorded there are still in place.
+    """
+
+    MANIFEST = ".emr-cli-build.json"
+    VERSION = 1
+
+    def __init__(self, dist_dir: str, name: str) -> None:
+        self.dist_dir = dist_dir
+        self.name = name
+        self.manifest_path = os.path.join(dist_dir, self.MANIFEST)
+        self.manifest = self._read_manifest()
+        self.files: Dict[str, list] = {}
+        self.fingerprint: Optional[str] = None
+
+    def is_fresh(self, inputs: List[str], outputs: List[str]) -> bool:
+        """
+        Fingerprints `inputs` and returns True if `outputs` were built from the
+        same inputs.
+        """
+        self.fingerprint = self._fingerprint(inputs)
+        entry = self.manifest.get("builds", {}).get(self.name)
+        if not entry or entry.get("fingerprint") != self.fingerprint:
+            return False
+        recorded = entry.get("outputs", {})
+        return sorted(recorded) == sorted(outputs) and all(
+            recorded[path] is not None and self._stat(path) == recorded[path]
+            for path in outputs
+        )
+
+    def save(self, outputs: List[str]) -> None:
+        """
+        Records the fingerprint computed by `is_fresh` for `outputs`, which have
+        just been built.
+        """
+        if self.fingerprint is None:
+            raise Exception("is_fresh must be called before save")
+        # Start from the manifest on disk, which another build may have updated
+        manifest = self._read_manifest()
+        manifest["version"] = self.VERSION
+        manifest["files"] = {**manifest.get("files", {}), **self.files}
+        manifest.setdefault("builds", {})[self.name] = {
+            "fingerprint": self.fingerprint,
+            "outputs": {path: self._stat(path) for path in outputs},
+        }
+        os.makedirs(self.dist_dir, exist_ok=True)
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+        self.manifest = manifest
+
+    def _fingerprint(self, inputs: List[str]) -> str:
+        known = self.manifest.get("files", {})
+        digest = hashlib.sha256(f"{self.VERSION}\0{self.name}\0".encode())
+        for path in sorted(set(os.path.abspath(p) for p in inputs)):
+            stat = self._stat(path)
+            cached = known.get(path)
+            if cached and cached[:2] == stat:
+                sha256 = cached[2]
+            else:
+                sha256 = file_sha256(path)
+            self.files[path] = stat + [sha256]
+            digest.update(f"{path}\0{sha256}\0".encode())
+        return digest.hexdigest()
+
+    def _stat(self, path: str) -> Optional[list]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return [st.st_size, st.st_mtime_ns]
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get("version") != self.VERSION:
+            return {}
+        return manifest
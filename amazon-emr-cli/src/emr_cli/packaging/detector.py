@@ -5,7 +5,7 @@ from src.emr_cli.packaging.python_files_project import PythonFilesProject
 from src.emr_cli.packaging.python_poetry_project import PythonPoetryProject
 from src.emr_cli.packaging.python_project import PythonProject
 from src.emr_cli.packaging.simple_project import SimpleProject
-from src.emr_cli.utils import find_files
+from src.emr_cli.utils.scanner import scan_project
 
 
 class ProjectDetector:
@@ -27,21 +27,22 @@ class ProjectDetector:
         if project_type:
             return self.PROJECT_TYPE_MAPPINGS.get(project_type)
 
+        # One walk of the project finds every marker file, and is reused by build
+        scan = scan_project(os.getcwd())
+
         # We default to a single file project - if the user has just a .py or .jar
         project = SimpleProject
 
         # If there are multiple .py files, we escalate to a PythonProject
-        if len(find_files(os.getcwd(), [".venv"], ".py")) > 1:
+        if len(scan.find(".py")) > 1:
             project = PythonFilesProject
 
         # If we have a pyproject.toml or setup.py, we have a python project
-        if find_files(os.getcwd(), [".venv"], "pyproject.toml") or find_files(
-            os.getcwd(), [".venv"], "setup.py"
-        ):
+        if scan.find("pyproject.toml") or scan.find("setup.py"):
             project = PythonProject
 
         # If we have a poetry.lock, it's a poetry project
-        if find_files(os.getcwd(), [".venv"], "poetry.lock"):
+        if scan.find("poetry.lock"):
             project = PythonPoetryProject
 
         return project
@@ -1,10 +1,14 @@
 import os
 import zipfile
+from typing import List
 
 import boto3
 
 from src.emr_cli.deployments.emr_serverless import DeploymentPackage
-from src.emr_cli.utils import console_log, find_files, mkdir, parse_bucket_uri
+from src.emr_cli.deployments.s3_deployer import S3Deployer
+from src.emr_cli.packaging.build_cache import BuildCache
+from src.emr_cli.utils import console_log, mkdir, parse_bucket_uri
+from src.emr_cli.utils.scanner import scan_project
 
 
 class PythonFilesProject(DeploymentPackage):
@@ -15,18 +19,40 @@ class PythonFilesProject(DeploymentPackage):
     additional packaging. The files in the project are simply zipped up.
     """
 
-    def build(self):
+    # Fixed entry timestamp, so the same files always produce the same zip and
+    # an unchanged zip is not uploaded again.
+    ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+    def build(self, force: bool = False):
         """
         Zip all the files except for the entrypoint file.
+
+        The zip is only rewritten if a file changed since the last build.
         """
-        py_files = find_files(os.getcwd(), [".venv"], ".py")
-        py_files.remove(os.path.abspath(self.entry_point_path))
-        cwd = os.getcwd()
+        entry_point = os.path.abspath(self.entry_point_path)
+        py_files = [
+            path for path in scan_project(os.getcwd()).find(".py") if path != entry_point
+        ]
+        zip_path = f"{self.dist_dir}/pyfiles.zip"
+        cache = BuildCache(self.dist_dir, "pyfiles")
+        if cache.is_fresh(py_files, [zip_path]) and not force:
+            console_log(f"No changes since the last build, reusing {zip_path}")
+            return
+
         mkdir(self.dist_dir)
-        with zipfile.ZipFile(f"{self.dist_dir}/pyfiles.zip", "w") as zf:
-            for file in py_files:
-                relpath = os.path.relpath(file, cwd)
-                zf.write(file, relpath)
+        self._write_zip(zip_path, py_files)
+        cache.save([zip_path])
+
+    def _write_zip(self, zip_path: str, files: List[str]):
+        cwd = os.getcwd()
+        tmp_path = f"{zip_path}.tmp"
+        with zipfile.ZipFile(tmp_path, "w") as zf:
+            for relpath in sorted(os.path.relpath(file, cwd) for file in files):
+                info = zipfile.ZipInfo(relpath, date_time=self.ZIP_DATE_TIME)
+                info.external_attr = 0o644 << 16
+                with open(relpath, "rb") as f:
+                    zf.writestr(info, f.read())
+        os.replace(tmp_path, zip_path)
 
     def deploy(self, s3_code_uri: str) -> str:
         """
@@ -38,9 +64,12 @@ class PythonFilesProject(DeploymentPackage):
 
         console_log(f"Deploying {filename} and local python modules to {s3_code_uri}")
 
-        s3_client.upload_file(self.entry_point_path, bucket, f"{prefix}/{filename}")
-        s3_client.upload_file(
-            f"{self.dist_dir}/pyfiles.zip", bucket, f"{prefix}/pyfiles.zip")
+        S3Deployer(s3_client).deploy(
+            [
+                (self.entry_point_path, bucket, f"{prefix}/{filename}"),
+                (f"{self.dist_dir}/pyfiles.zip", bucket, f"{prefix}/pyfiles.zip"),
+            ]
+        )
 
         return f"s3://{bucket}/{prefix}/{filename}"
 
@@ -8,7 +8,10 @@ from urllib.parse import urlparse
 import boto3
 
 from src.emr_cli.deployments.emr_serverless import DeploymentPackage
+from src.emr_cli.deployments.s3_deployer import S3Deployer
+from src.emr_cli.packaging.build_cache import BuildCache, dependency_files
 from src.emr_cli.utils import console_log, copy_template
+from src.emr_cli.utils.scanner import scan_project
 
 
 class PythonPoetryProject(DeploymentPackage):
@@ -24,14 +27,29 @@ class PythonPoetryProject(DeploymentPackage):
         copy_template("poetry", target_dir)
         console_log("Project initialized.")
 
-    def build(self):
+    def build(self, force: bool = False):
         if not Path("poetry.lock").exists():
             print("Error: No poetry.lock present, please setup your poetry project.")
             sys.exit(1)
 
+        outputs = [os.path.join(self.dist_dir, "pyspark_deps.tar.gz")]
+        cache = BuildCache(self.dist_dir, "poetry")
+        if cache.is_fresh(self._build_inputs(), outputs) and not force:
+            console_log(f"No changes since the last build, reusing {self.dist_dir}/")
+            return
+
         console_log(f"Packaging assets into {self.dist_dir}/")
         # TODO: Add an option for --force-local-build
         self._run_docker_build(self.dist_dir)
+        cache.save(outputs)
+
+    def _build_inputs(self) -> List[str]:
+        cwd = os.getcwd()
+        return (
+            dependency_files(cwd)
+            + [self._dockerfile_path()]
+            + scan_project(cwd).find(".py")
+        )
 
     def _run_local_build(self, output_dir: str = "dist"):
         subprocess.run(
@@ -74,13 +92,15 @@ class PythonPoetryProject(DeploymentPackage):
 
         console_log(f"Deploying {filename} and dependencies to {s3_code_uri}")
 
-        s3_client.upload_file(
-            self.entry_point_path, bucket, os.path.join(prefix, filename)
-        )
-        s3_client.upload_file(
-            os.path.join(self.dist_dir, "pyspark_deps.tar.gz"),
-            bucket,
-            os.path.join(prefix, "pyspark_deps.tar.gz"),
+        S3Deployer(s3_client).deploy(
+            [
+                (self.entry_point_path, bucket, os.path.join(prefix, filename)),
+                (
+                    os.path.join(self.dist_dir, "pyspark_deps.tar.gz"),
+                    bucket,
+                    os.path.join(prefix, "pyspark_deps.tar.gz"),
+                ),
+            ]
         )
 
         return f"s3://{bucket}/{prefix}/{filename}"
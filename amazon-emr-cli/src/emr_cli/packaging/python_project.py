@@ -3,11 +3,15 @@ import subprocess
 import sys
 from pathlib import Path
 from shutil import copy
+from typing import List
 
 import boto3
 
 from src.emr_cli.deployments.emr_serverless import DeploymentPackage
+from src.emr_cli.deployments.s3_deployer import S3Deployer
+from src.emr_cli.packaging.build_cache import BuildCache, dependency_files
 from src.emr_cli.utils import console_log, copy_template, parse_bucket_uri
+from src.emr_cli.utils.scanner import scan_project
 
 
 class PythonProject(DeploymentPackage):
@@ -32,9 +36,12 @@ class PythonProject(DeploymentPackage):
         target_path = Path(target_dir)
         copy(template_path, target_path)
 
-    def build(self):
+    def build(self, force: bool = False):
         """
         For now, uses a pre-existing Docker file and setuptools
+
+        The Docker build is skipped if the packaging files and sources have not
+        changed since the last build.
         """
         if not Path("Dockerfile").exists():
             print(
@@ -45,8 +52,19 @@ class PythonProject(DeploymentPackage):
             print("Error: No pyproject.toml present, please set one up before building")
             sys.exit(1)
 
+        outputs = [f"{self.dist_dir}/pyspark_deps.tar.gz"]
+        cache = BuildCache(self.dist_dir, "python")
+        if cache.is_fresh(self._build_inputs(), outputs) and not force:
+            console_log(f"No changes since the last build, reusing {self.dist_dir}/")
+            return
+
         console_log(f"Packaging assets into {self.dist_dir}/")
         self._run_docker_build(self.dist_dir)
+        cache.save(outputs)
+
+    def _build_inputs(self) -> List[str]:
+        cwd = os.getcwd()
+        return dependency_files(cwd) + scan_project(cwd).find(".py")
 
     def _run_docker_build(self, output_dir: str):
         subprocess.run(
@@ -66,11 +84,15 @@ class PythonProject(DeploymentPackage):
 
         console_log(f"Deploying {filename} and dependencies to {self.s3_uri_base}")
 
-        s3_client.upload_file(self.entry_point_path, bucket, f"{prefix}/{filename}")
-        s3_client.upload_file(
-            f"{self.dist_dir}/pyspark_deps.tar.gz",
-            bucket,
-            f"{prefix}/pyspark_deps.tar.gz",
+        S3Deployer(s3_client).deploy(
+            [
+                (self.entry_point_path, bucket, f"{prefix}/{filename}"),
+                (
+                    f"{self.dist_dir}/pyspark_deps.tar.gz",
+                    bucket,
+                    f"{prefix}/pyspark_deps.tar.gz",
+                ),
+            ]
         )
 
         return f"s3://{bucket}/{prefix}/{filename}"
@@ -3,6 +3,7 @@ import os
 import boto3
 
 from src.emr_cli.deployments.emr_serverless import DeploymentPackage
+from src.emr_cli.deployments.s3_deployer import S3Deployer
 from src.emr_cli.utils import console_log, parse_bucket_uri
 
 
@@ -12,7 +13,7 @@ class SimpleProject(DeploymentPackage):
     This can be a pyspark file or packaged jar file.
     """
 
-    def build(self):
+    def build(self, force: bool = False):
         pass
 
     def deploy(self, s3_code_uri: str) -> str:
@@ -25,6 +26,8 @@ class SimpleProject(DeploymentPackage):
 
         console_log(f"Deploying {filename} to {s3_code_uri}")
 
-        s3_client.upload_file(self.entry_point_path, bucket, f"{prefix}/{filename}")
+        S3Deployer(s3_client).deploy(
+            [(self.entry_point_path, bucket, f"{prefix}/{filename}")]
+        )
 
         return f"s3://{bucket}/{prefix}/{filename}"
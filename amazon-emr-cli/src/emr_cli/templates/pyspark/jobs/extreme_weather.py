@@ -1,18 +1,36 @@
 import argparse
 from datetime import date
-from typing import List
+from typing import Dict, List, Optional
 
-from pyspark.sql import DataFrame, Row, SparkSession
+from pyspark.sql import Column, DataFrame, Row, SparkSession
 from pyspark.sql import functions as F
 
 GSOD_S3_BASE = "s3://noaa-gsod-pds"
 
+# Values that indicate "no reading" for an attribute.
+MISSING_VALUES = [99.99, 999.9, 9999.9]
+
+DETAIL_COLUMNS = ["STATION", "DATE", "LATITUDE", "LONGITUDE", "ELEVATION", "NAME"]
+
+STATS = [
+    {"description": "Highest temperature", "column_name": "MAX", "units": "°F"},
+    {
+        "description": "Highest all-day average temperature",
+        "column_name": "TEMP",
+        "units": "°F",
+    },
+]
+
 
 class ExtremeWeather:
     """
     Usage: extreme-weather [--year xxxx]
 
     Displays extreme weather stats (highest temp, wind, precipitation) for the given year.
+
+    Everything is computed on the executors: the largest value and the outlier
+    threshold of every stat come from a single aggregation over the cached data, and
+    only the top rows are brought back to the driver.
     """
 
     def __init__(self, year: int) -> None:
@@ -20,41 +38,80 @@ class ExtremeWeather:
         self.spark = SparkSession.builder.appName("ExtremeWeather").getOrCreate()
 
     def run(self) -> None:
-        df = self._fetch_data()
-        for stat in [
-            {"description": "Highest temperature", "column_name": "MAX", "units": "°F"},
-            {
-                "description": "Highest all-day average temperature",
-                "column_name": "TEMP",
-                "units": "°F",
-            },
-        ]:
-            max_row = self.findLargest(df, stat.get("column_name"))
+        columns = [stat["column_name"] for stat in STATS]
+        df = self._fetch_data().select(*DETAIL_COLUMNS, *columns).cache()
+        summary = self.summarize(df, columns)
+
+        for stat in STATS:
+            col = stat["column_name"]
+            max_row = summary[col]["max_row"]
             print(f"--- {stat['description']}")
             print(
-                f"    {max_row[stat['column_name']]}{stat['units']} on {max_row.DATE} at {max_row.NAME} ({max_row.LATITUDE}, {max_row.LONGITUDE})"
+                f"    {max_row[col]}{stat['units']} on {max_row.DATE} at {max_row.NAME} ({max_row.LATITUDE}, {max_row.LONGITUDE})"
             )
 
             print("--- Top 10 Outliers")
-            outliers = self.find_outliers_for_column(df, stat.get("column_name"))
-            for i, row in outliers[:10].iterrows():
-                print(
-                    f"    {row['NAME']} ({row['DATE']}) – {row[stat['column_name']]}{stat['units']}"
-                )
+            outliers = self.find_outliers_for_column(
+                df, col, threshold=summary[col]["threshold"]
+            )
+            for row in outliers.limit(10).collect():
+                print(f"    {row['NAME']} ({row['DATE']}) – {row[col]}{stat['units']}")
             print("\n")
 
+        df.unpersist()
+
+    def summarize(
+        self,
+        df: DataFrame,
+        columns: List[str],
+        percent: float = 0.99,
+        accuracy: int = 10000,
+    ) -> Dict[str, dict]:
+        """
+        Finds, for each column, the row with the largest value and the `percent`
+        quantile, in one pass over `df`.
+
+        The quantile is approximate, with a relative error of 1 / `accuracy`.
+        Missing readings are ignored.
+        """
+        aggregates = []
+        for col in columns:
+            # Structs compare field by field, so the max struct is the row with the
+            # largest value in `col`.
+            row = F.struct(_valid(col).alias(col), *DETAIL_COLUMNS)
+            aggregates.append(F.max(row).alias(f"{col}_max_row"))
+            aggregates.append(
+                F.percentile_approx(_valid(col), percent, accuracy).alias(
+                    f"{col}_threshold"
+                )
+            )
+
+        result = df.agg(*aggregates).first()
+        return {
+            col: {
+                "max_row": result[f"{col}_max_row"],
+                "threshold": result[f"{col}_threshold"],
+            }
+            for col in columns
+        }
+
     def find_outliers_for_column(
         self,
         df: DataFrame,
         col: str,
         percent: float = 0.99,
+        threshold: Optional[float] = None,
     ) -> DataFrame:
         """
-        Converts the provided DataFrame to a Pandas DataFrame and retrieves the top 99% quantile.
+        Returns the rows whose `col` is above the `percent` quantile, largest first.
+
+        The quantile is computed with `approxQuantile` unless `threshold` is given,
+        e.g. from `summarize`. Missing readings are excluded.
         """
-        dfp = df.toPandas()
-        q = dfp.quantile(0.99)
-        return dfp[dfp[col] > q[col]]
+        valid = df.filter(~F.col(col).isin(MISSING_VALUES))
+        if threshold is None:
+            (threshold,) = valid.approxQuantile(col, [percent], 0.0001)
+        return valid.filter(F.col(col) > threshold).orderBy(F.desc(col))
 
     def _gsod_year_uri(self, year: int) -> str:
         """
@@ -78,22 +135,21 @@ class ExtremeWeather:
         While 99.99 _could_ be a valid value for temperature, for example, we know there are higher readings.
         """
         return (
-            df.select(
-                "STATION",
-                "DATE",
-                "LATITUDE",
-                "LONGITUDE",
-                "ELEVATION",
-                "NAME",
-                col_name,
-            )
-            .filter(~F.col(col_name).isin([99.99, 999.9, 9999.9]))
+            df.select(*DETAIL_COLUMNS, col_name)
+            .filter(~F.col(col_name).isin(MISSING_VALUES))
             .orderBy(F.desc(col_name))
             .limit(1)
             .first()
         )
 
 
+def _valid(col: str) -> Column:
+    """
+    `col`, with missing readings replaced by null so aggregates skip them.
+    """
+    return F.when(~F.col(col).isin(MISSING_VALUES), F.col(col))
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("--year", type=int, required=False, default=date.today().year)
@@ -103,4 +159,4 @@ def parse_args() -> argparse.Namespace:
 if __name__ == "__main__":
     args = parse_args()
     weather_data = ExtremeWeather(args.year)
-    weather_data.run()
\ No newline at end of file
+    weather_data.run()
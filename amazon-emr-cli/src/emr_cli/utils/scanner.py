@@ -0,0 +1,189 @@
+import os
+import re
+from typing import Dict, List, NamedTuple, Optional, Pattern, Tuple
+
+# Directories that never hold project sources, ignored in addition to .gitignore.
+DEFAULT_IGNORE = [".venv", ".git", "node_modules", "__pycache__"]
+
+
+class IgnoreRule(NamedTuple):
+    # Directory the rule applies under, relative to the scan root ("" for the root)
+    base: str
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+
+def _glob_to_regex(glob: str) -> str:
+    """
+    Translates a .gitignore glob to a regex: `*` and `?` don't match `/`, `**`
+    matches any number of directories.
+    """
+    i, n, out = 0, len(glob), []
+    while i < n:
+        c = glob[i]
+        if glob.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif glob.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[" and "]" in glob[i + 1 :]:
+            end = glob.index("]", i + 1)
+            body = glob[i + 1 : end].replace("\\", "\\\\")
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            out.append(f"[{body}]")
+            i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(glob[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def parse_ignore_pattern(line: str, base: str = "") -> Optional[IgnoreRule]:
+    """
+    Parses one line of a .gitignore file found in directory `base`.
+    Returns None for blank lines and comments.
+    """
+    line = line.rstrip("\n").rstrip("\r")
+    if not line.strip() or line.startswith("#"):
+        return None
+    line = line.rstrip(" ")
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    # A pattern with a slash before its end is relative to the .gitignore;
+    # otherwise it matches a name at any depth.
+    if "/" in line:
+        regex = _glob_to_regex(line.lstrip("/"))
+    else:
+        regex = "(?:.*/)?" + _glob_to_regex(line)
+    return IgnoreRule(base, re.compile(regex + "$"), negate, dir_only)
+
+
+def is_ignored(rules: List[IgnoreRule], relpath: str, is_dir: bool) -> bool:
+    """
+    Returns True if `relpath` (relative to the scan root, using `/`) is ignored.
+    As in git, the last matching rule wins.
+    """
+    ignored = False
+    for rule in rules:
+        if rule.dir_only and not is_dir:
+            continue
+        if rule.base:
+            if not relpath.startswith(rule.base + "/"):
+                continue
+            path = relpath[len(rule.base) + 1 :]
+        else:
+            path = relpath
+        if rule.regex.match(path):
+            ignored = not rule.negate
+    return ignored
+
+
+def _read_gitignore(directory: str, base: str) -> List[IgnoreRule]:
+    try:
+        with open(os.path.join(directory, ".gitignore"), encoding="utf-8") as f:
+            lines = f.readlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+    rules = [parse_ignore_pattern(line, base) for line in lines]
+    return [rule for rule in rules if rule is not None]
+
+
+class ProjectScan:
+    """
+    The files of a project, found in a single `os.scandir` walk.
+
+    Directories and files matching `ignore` (.gitignore-style globs) or a
+    .gitignore file in the project are skipped. Symlinked directories are not
+    followed.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ignore: Optional[List[str]] = None,
+        use_gitignore: bool = True,
+    ) -> None:
+        self.directory = directory
+        self.ignore = DEFAULT_IGNORE if ignore is None else ignore
+        self.use_gitignore = use_gitignore
+        self.files: List[str] = []
+        self._by_name: Dict[str, List[str]] = {}
+        self._scan()
+
+    def find(self, search: str) -> List[str]:
+        """
+        Returns the files whose name is, or ends with, `search`, like `find_files`.
+        """
+        return [
+            path
+            for name, paths in self._by_name.items()
+            if name == search or name.endswith(search)
+            for path in paths
+        ]
+
+    def _scan(self):
+        root_rules = [parse_ignore_pattern(glob) for glob in self.ignore]
+        stack: List[Tuple[str, str, List[IgnoreRule]]] = [
+            (self.directory, "", [rule for rule in root_rules if rule is not None])
+        ]
+        while stack:
+            directory, relpath, rules = stack.pop()
+            if self.use_gitignore:
+                rules = rules + _read_gitignore(directory, relpath)
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            subdirs = []
+            for entry in entries:
+                entry_relpath = f"{relpath}/{entry.name}" if relpath else entry.name
+                is_dir = entry.is_dir(follow_symlinks=False)
+                if is_ignored(rules, entry_relpath, is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append((entry.path, entry_relpath, rules))
+                elif entry.is_file():
+                    self.files.append(entry.path)
+                    self._by_name.setdefault(entry.name, []).append(entry.path)
+            # Visit subdirectories in name order
+            stack.extend(reversed(subdirs))
+
+
+_scans: Dict[Tuple[str, Tuple[str, ...], bool], ProjectScan] = {}
+
+
+def scan_project(
+    directory: str,
+    ignore: Optional[List[str]] = None,
+    use_gitignore: bool = True,
+    rescan: bool = False,
+) -> ProjectScan:
+    """
+    Returns the scan of `directory`, walking it only the first time, so that
+    project detection and packaging share a single walk.
+    """
+    key = (
+        os.path.abspath(directory),
+        tuple(DEFAULT_IGNORE if ignore is None else ignore),
+        use_gitignore,
+    )
+    if rescan or key not in _scans:
+        _scans[key] = ProjectScan(directory, ignore, use_gitignore)
+    return _scans[key]
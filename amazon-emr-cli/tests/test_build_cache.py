@@ -0,0 +1,144 @@
+import os
+import zipfile
+from unittest.mock import patch
+
+from src.emr_cli.packaging.build_cache import BuildCache
+from src.emr_cli.packaging.python_files_project import PythonFilesProject
+from src.emr_cli.packaging.python_project import PythonProject
+
+
+def touch_later(path):
+    # Make sure a rewritten file gets a different mtime, whatever the resolution
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+class TestBuildCache:
+    def test_fresh_after_save(self, tmp_path):
+        src = tmp_path / "a.py"
+        src.write_text("a = 1")
+        out = tmp_path / "dist" / "out.zip"
+        cache = BuildCache(str(tmp_path / "dist"), "test")
+        assert not cache.is_fresh([str(src)], [str(out)])
+        out.parent.mkdir()
+        out.write_text("built")
+        cache.save([str(out)])
+
+        assert BuildCache(str(tmp_path / "dist"), "test").is_fresh(
+            [str(src)], [str(out)]
+        )
+        # Another build name has its own fingerprint
+        assert not BuildCache(str(tmp_path / "dist"), "other").is_fresh(
+            [str(src)], [str(out)]
+        )
+
+    def test_stale_when_input_changes(self, tmp_path):
+        src = tmp_path / "a.py"
+        src.write_text("a = 1")
+        out = tmp_path / "out.zip"
+        out.write_text("built")
+        cache = BuildCache(str(tmp_path), "test")
+        cache.is_fresh([str(src)], [str(out)])
+        cache.save([str(out)])
+
+        src.write_text("a = 2")
+        touch_later(src)
+        assert not BuildCache(str(tmp_path), "test").is_fresh([str(src)], [str(out)])
+
+    def test_fresh_when_only_mtime_changes(self, tmp_path):
+        src = tmp_path / "a.py"
+        src.write_text("a = 1")
+        out = tmp_path / "out.zip"
+        out.write_text("built")
+        cache = BuildCache(str(tmp_path), "test")
+        cache.is_fresh([str(src)], [str(out)])
+        cache.save([str(out)])
+
+        touch_later(src)
+        assert BuildCache(str(tmp_path), "test").is_fresh([str(src)], [str(out)])
+
+    def test_stale_when_output_missing_or_changed(self, tmp_path):
+        src = tmp_path / "a.py"
+        src.write_text("a = 1")
+        out = tmp_path / "out.zip"
+        out.write_text("built")
+        cache = BuildCache(str(tmp_path), "test")
+        cache.is_fresh([str(src)], [str(out)])
+        cache.save([str(out)])
+
+        out.write_text("something else")
+        touch_later(out)
+        assert not BuildCache(str(tmp_path), "test").is_fresh([str(src)], [str(out)])
+        out.unlink()
+        assert not BuildCache(str(tmp_path), "test").is_fresh([str(src)], [str(out)])
+
+    def test_damaged_manifest(self, tmp_path):
+        (tmp_path / BuildCache.MANIFEST).write_text("{not json")
+        src = tmp_path / "a.py"
+        src.write_text("a = 1")
+        assert not BuildCache(str(tmp_path), "test").is_fresh([str(src)], [])
+
+
+class TestPythonFilesProjectBuild:
+    def setup_project(self, path, monkeypatch):
+        monkeypatch.chdir(path)
+        (path / "entrypoint.py").write_text("import jobs.job")
+        (path / "jobs").mkdir()
+        (path / "jobs" / "__init__.py").write_text("")
+        (path / "jobs" / "job.py").write_text("x = 1")
+
+    def test_deterministic_zip(self, tmp_path, monkeypatch):
+        self.setup_project(tmp_path, monkeypatch)
+        PythonFilesProject("entrypoint.py").build()
+        first = (tmp_path / "dist" / "pyfiles.zip").read_bytes()
+
+        for path in (tmp_path / "jobs").iterdir():
+            touch_later(path)
+        PythonFilesProject("entrypoint.py").build(force=True)
+        assert (tmp_path / "dist" / "pyfiles.zip").read_bytes() == first
+
+        with zipfile.ZipFile(tmp_path / "dist" / "pyfiles.zip") as zf:
+            assert zf.namelist() == ["jobs/__init__.py", "jobs/job.py"]
+            assert zf.read("jobs/job.py") == b"x = 1"
+
+    def test_zip_reused_until_changed(self, tmp_path, monkeypatch):
+        self.setup_project(tmp_path, monkeypatch)
+        PythonFilesProject("entrypoint.py").build()
+
+        with patch.object(PythonFilesProject, "_write_zip") as write_zip:
+            PythonFilesProject("entrypoint.py").build()
+            write_zip.assert_not_called()
+
+        (tmp_path / "jobs" / "job.py").write_text("x = 2")
+        touch_later(tmp_path / "jobs" / "job.py")
+        PythonFilesProject("entrypoint.py").build()
+        with zipfile.ZipFile(tmp_path / "dist" / "pyfiles.zip") as zf:
+            assert zf.read("jobs/job.py") == b"x = 2"
+
+
+class TestPythonProjectBuild:
+    def test_docker_build_skipped_until_changed(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "Dockerfile").write_text("FROM scratch")
+        (tmp_path / "pyproject.toml").write_text("[project]\nname = 'job'")
+        (tmp_path / "entrypoint.py").write_text("print('hello')")
+
+        def docker_build(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+            with open(os.path.join(output_dir, "pyspark_deps.tar.gz"), "w") as f:
+                f.write("venv")
+
+        with patch.object(
+            PythonProject, "_run_docker_build", side_effect=docker_build
+        ) as run:
+            PythonProject("entrypoint.py").build()
+            PythonProject("entrypoint.py").build()
+            assert run.call_count == 1
+
+            (tmp_path / "pyproject.toml").write_text("[project]\nname = 'job2'")
+            touch_later(tmp_path / "pyproject.toml")
+            PythonProject("entrypoint.py").build()
+            assert run.call_count == 2
+
+            PythonProject("entrypoint.py").build(force=True)
+            assert run.call_count == 3
@@ -0,0 +1,199 @@
+from datetime import datetime
+from unittest.mock import patch
+
+import boto3
+import pytest
+from botocore.stub import Stubber
+
+from src.emr_cli.deployments.emr_serverless import (
+    EMRServerless,
+    JobPoller,
+    JobRunResult,
+    JobSpec,
+)
+from src.emr_cli.packaging.simple_project import SimpleProject
+
+APPLICATION_ID = "00f1abcdefgh1234"
+JOB_ROLE = "arn:aws:iam::123456789012:role/emr-cli-job-role"
+
+
+def job_run(job_run_id, state, state_details=None):
+    return {
+        "jobRun": {
+            "applicationId": APPLICATION_ID,
+            "jobRunId": job_run_id,
+            "arn": f"arn:aws:emr-serverless:us-east-1:123456789012:/applications/{APPLICATION_ID}/jobruns/{job_run_id}",  # noqa: E501
+            "createdBy": "arn:aws:iam::123456789012:user/test",
+            "createdAt": datetime(2023, 1, 1),
+            "updatedAt": datetime(2023, 1, 1),
+            "executionRole": JOB_ROLE,
+            "state": state,
+            "stateDetails": state_details or f"Job is {state}",
+            "releaseLabel": "emr-6.9.0",
+            "jobDriver": {"sparkSubmit": {"entryPoint": "s3://bucket/code/main.py"}},
+        }
+    }
+
+
+def started(job_run_id):
+    return {
+        "applicationId": APPLICATION_ID,
+        "jobRunId": job_run_id,
+        "arn": f"arn:aws:emr-serverless:us-east-1:123456789012:/applications/{APPLICATION_ID}/jobruns/{job_run_id}",  # noqa: E501
+    }
+
+
+def expect_poll(stubber, job_run_id, state, state_details=None):
+    stubber.add_response(
+        "get_job_run",
+        job_run(job_run_id, state, state_details),
+        {"applicationId": APPLICATION_ID, "jobRunId": job_run_id},
+    )
+
+
+@pytest.fixture
+def client():
+    return boto3.client(
+        "emr-serverless",
+        region_name="us-east-1",
+        aws_access_key_id="testing",
+        aws_secret_access_key="testing",
+    )
+
+
+@pytest.fixture
+def emrs(client):
+    emrs = EMRServerless(
+        APPLICATION_ID,
+        JOB_ROLE,
+        SimpleProject("main.py", "s3://bucket/code"),
+        region="us-east-1",
+    )
+    emrs.client = client
+    return emrs
+
+
+class TestJobPoller:
+    def test_adaptive_backoff(self, client):
+        sleeps = []
+        transitions = []
+        poller = JobPoller(
+            client,
+            APPLICATION_ID,
+            on_transition=lambda job, old: transitions.append(
+                (job.job_run_id, old, job.state)
+            ),
+            sleep=sleeps.append,
+            jitter=lambda: 1.0,
+        )
+        poller.add("job-1", "first")
+        poller.add("job-2", "second")
+
+        with Stubber(client) as stubber:
+            # Both change state: poll again after the minimum interval
+            expect_poll(stubber, "job-1", "RUNNING")
+            expect_poll(stubber, "job-2", "PENDING")
+            # No change: back off
+            expect_poll(stubber, "job-1", "RUNNING")
+            expect_poll(stubber, "job-2", "PENDING")
+            # Throttled: end the round and back off again
+            stubber.add_client_error("get_job_run", "ThrottlingException")
+            # job-1 finishes, so polling speeds up again
+            expect_poll(stubber, "job-1", "SUCCESS")
+            expect_poll(stubber, "job-2", "RUNNING")
+            expect_poll(stubber, "job-2", "FAILED", "Out of memory")
+            results = poller.wait()
+            stubber.assert_no_pending_responses()
+
+        assert sleeps == [2.0, 3.0, 4.5, 2.0]
+        assert transitions == [
+            ("job-1", "SUBMITTED", "RUNNING"),
+            ("job-2", "SUBMITTED", "PENDING"),
+            ("job-1", "RUNNING", "SUCCESS"),
+            ("job-2", "PENDING", "RUNNING"),
+            ("job-2", "RUNNING", "FAILED"),
+        ]
+        assert results == [
+            JobRunResult("job-1", "first", "SUCCESS", "Job is SUCCESS"),
+            JobRunResult("job-2", "second", "FAILED", "Out of memory"),
+        ]
+
+    def test_max_interval_and_jitter(self, client):
+        sleeps = []
+        poller = JobPoller(
+            client,
+            APPLICATION_ID,
+            min_interval=10,
+            max_interval=20,
+            sleep=sleeps.append,
+            jitter=lambda: 0.0,
+        )
+        poller.add("job-1", "first", "RUNNING")
+        with Stubber(client) as stubber:
+            for _ in range(3):
+                expect_poll(stubber, "job-1", "RUNNING")
+            expect_poll(stubber, "job-1", "SUCCESS")
+            poller.wait()
+        # Jitter sleeps between half and all of the interval
+        assert sleeps == [7.5, 10.0, 10.0]
+
+    def test_other_errors_are_raised(self, client):
+        poller = JobPoller(client, APPLICATION_ID, sleep=lambda s: None)
+        poller.add("job-1", "first")
+        with Stubber(client) as stubber:
+            stubber.add_client_error("get_job_run", "ResourceNotFoundException")
+            with pytest.raises(client.exceptions.ResourceNotFoundException):
+                poller.wait()
+
+
+class TestRunJobs:
+    def test_run_jobs(self, emrs, client):
+        jobs = [JobSpec(f"job [{i}]", [str(i)]) for i in range(1, 4)]
+        with Stubber(client) as stubber, patch("time.sleep") as sleep:
+            for i in range(1, 4):
+                stubber.add_response("start_job_run", started(f"run-{i}"))
+            # Jobs are polled in submission order, whichever run ID they got
+            for state in ["RUNNING"] * 3 + ["SUCCESS", "SUCCESS", "FAILED"]:
+                stubber.add_response("get_job_run", job_run("run", state))
+            results = emrs.run_jobs(jobs, max_workers=3)
+            stubber.assert_no_pending_responses()
+
+        assert sleep.call_count == 1
+        # Submission is concurrent, so run IDs can be assigned in any order
+        assert sorted(r.job_run_id for r in results) == ["run-1", "run-2", "run-3"]
+        assert [r.state for r in results] == ["SUCCESS", "SUCCESS", "FAILED"]
+        assert [r.name for r in results] == ["job [1]", "job [2]", "job [3]"]
+
+    def test_run_jobs_no_wait(self, emrs, client):
+        with Stubber(client) as stubber:
+            stubber.add_response(
+                "start_job_run",
+                started("run-1"),
+                {
+                    "applicationId": APPLICATION_ID,
+                    "executionRoleArn": JOB_ROLE,
+                    "name": "job",
+                    "jobDriver": {
+                        "sparkSubmit": {
+                            "entryPoint": "s3://bucket/code/main.py",
+                            "entryPointArguments": ["a", "b"],
+                        }
+                    },
+                },
+            )
+            results = emrs.run_jobs([JobSpec("job", ["a", "b"])], wait=False)
+        assert results == [JobRunResult("run-1", "job", "SUBMITTED")]
+
+    def test_run_job(self, emrs, client):
+        with Stubber(client) as stubber, patch("time.sleep"):
+            stubber.add_response("start_job_run", started("run-1"))
+            expect_poll(stubber, "run-1", "RUNNING")
+            expect_poll(stubber, "run-1", "SUCCESS")
+            assert emrs.run_job("job", wait=True) == "run-1"
+
+    def test_run_job_failed(self, emrs, client):
+        with Stubber(client) as stubber, patch("time.sleep"):
+            stubber.add_response("start_job_run", started("run-1"))
+            expect_poll(stubber, "run-1", "FAILED", "Bad input")
+            with pytest.raises(SystemExit):
+                emrs.run_job("job", wait=True)
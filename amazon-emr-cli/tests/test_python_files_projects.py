@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 import boto3
@@ -12,8 +14,17 @@ class TestDeployMethod(unittest.TestCase):
         """
         # Create an instance of the class that contains the deploy method
         self.instance = PythonFilesProject()
-        self.instance.entry_point_path = "local/path/to/entry_point.py"
-        self.instance.dist_dir = "local/path/to/dist"
+        # Artifacts are hashed before upload, so they have to exist
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.entry_point_path = os.path.join(self.tmp_dir.name, "entry_point.py")
+        self.dist_dir = os.path.join(self.tmp_dir.name, "dist")
+        os.mkdir(self.dist_dir)
+        for path in [self.entry_point_path, f"{self.dist_dir}/pyfiles.zip"]:
+            with open(path, "w") as f:
+                f.write(path)
+        self.instance.entry_point_path = self.entry_point_path
+        self.instance.dist_dir = self.dist_dir
 
     @patch('boto3.client')
     @patch('src.emr_cli.packaging.python_files_project.console_log')
@@ -34,8 +45,9 @@ class TestDeployMethod(unittest.TestCase):
         result = self.instance.deploy(s3_code_uri)
 
         # Assert
-        mock_s3_client.upload_file.assert_any_call('local/path/to/entry_point.py', 'my-bucket', 'my/prefix/entry_point.py')
-        mock_s3_client.upload_file.assert_any_call('local/path/to/dist/pyfiles.zip', 'my-bucket', 'my/prefix/pyfiles.zip')
+        uploads = [c[0] for c in mock_s3_client.upload_file.call_args_list]
+        self.assertIn((self.entry_point_path, 'my-bucket', 'my/prefix/entry_point.py'), uploads)
+        self.assertIn((f"{self.dist_dir}/pyfiles.zip", 'my-bucket', 'my/prefix/pyfiles.zip'), uploads)
         self.assertEqual(result, 's3://my-bucket/my/prefix/entry_point.py')
 
     @patch('boto3.client')
@@ -112,8 +124,8 @@ class TestDeployMethod(unittest.TestCase):
         mock_s3_client = MagicMock()
         mock_boto_client.return_value = mock_s3_client
         # Simulate that the zip file does not exist
-        self.instance.entry_point_path = "local/path/to/entry_point.py"  # Ensure the entry point exists
-        self.instance.dist_dir = "local/path/to/dist"  # Ensure the dist dir is set correctly
+        self.instance.entry_point_path = self.entry_point_path  # Ensure the entry point exists
+        self.instance.dist_dir = self.dist_dir  # Ensure the dist dir is set correctly
         mock_s3_client.upload_file.side_effect = FileNotFoundError("Zip file not found")  # Simulate error for the zip upload
 
         # Act & Assert
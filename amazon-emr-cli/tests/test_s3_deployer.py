@@ -0,0 +1,105 @@
+import hashlib
+
+import boto3
+import pytest
+
+moto = pytest.importorskip("moto")
+mock_aws = getattr(moto, "mock_aws", None) or moto.mock_s3  # moto < 5 has mock_s3
+
+from src.emr_cli.deployments.s3_deployer import (
+    MB,
+    SHA256_METADATA_KEY,
+    S3Deployer,
+)
+
+BUCKET = "emr-cli-test"
+
+
+@pytest.fixture
+def s3_client(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    with mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket=BUCKET)
+        yield client
+
+
+class TestS3Deployer:
+    def test_upload_and_skip_unchanged(self, s3_client, tmp_path):
+        entrypoint = tmp_path / "entrypoint.py"
+        entrypoint.write_text("print('hello')")
+        artifacts = [(str(entrypoint), BUCKET, "code/entrypoint.py")]
+
+        results = S3Deployer(s3_client).deploy(artifacts)
+        assert [r.uploaded for r in results] == [True]
+        assert results[0].uri == f"s3://{BUCKET}/code/entrypoint.py"
+        head = s3_client.head_object(Bucket=BUCKET, Key="code/entrypoint.py")
+        assert head["Metadata"][SHA256_METADATA_KEY] == results[0].sha256
+
+        results = S3Deployer(s3_client).deploy(artifacts)
+        assert [r.uploaded for r in results] == [False]
+
+    def test_upload_changed(self, s3_client, tmp_path):
+        entrypoint = tmp_path / "entrypoint.py"
+        entrypoint.write_text("print('hello')")
+        artifacts = [(str(entrypoint), BUCKET, "code/entrypoint.py")]
+        S3Deployer(s3_client).deploy(artifacts)
+
+        entrypoint.write_text("print('goodbye')")
+        results = S3Deployer(s3_client).deploy(artifacts)
+        assert [r.uploaded for r in results] == [True]
+        body = s3_client.get_object(Bucket=BUCKET, Key="code/entrypoint.py")["Body"]
+        assert body.read() == b"print('goodbye')"
+
+    def test_force(self, s3_client, tmp_path):
+        entrypoint = tmp_path / "entrypoint.py"
+        entrypoint.write_text("print('hello')")
+        artifacts = [(str(entrypoint), BUCKET, "code/entrypoint.py")]
+        S3Deployer(s3_client).deploy(artifacts)
+        results = S3Deployer(s3_client, force=True).deploy(artifacts)
+        assert [r.uploaded for r in results] == [True]
+
+    def test_skip_by_etag_without_metadata(self, s3_client, tmp_path):
+        entrypoint = tmp_path / "entrypoint.py"
+        entrypoint.write_text("print('hello')")
+        # Uploaded by an earlier version of the CLI, without the hash metadata
+        s3_client.upload_file(str(entrypoint), BUCKET, "code/entrypoint.py")
+
+        artifacts = [(str(entrypoint), BUCKET, "code/entrypoint.py")]
+        results = S3Deployer(s3_client).deploy(artifacts)
+        assert [r.uploaded for r in results] == [False]
+
+    def test_multipart_and_concurrent_uploads(self, s3_client, tmp_path, capsys):
+        archive = tmp_path / "pyspark_deps.tar.gz"
+        archive.write_bytes(b"\x01" * (11 * MB))
+        entrypoint = tmp_path / "entrypoint.py"
+        entrypoint.write_text("print('hello')")
+        artifacts = [
+            (str(entrypoint), BUCKET, "code/entrypoint.py"),
+            (str(archive), BUCKET, "code/pyspark_deps.tar.gz"),
+        ]
+
+        deployer = S3Deployer(
+            s3_client, multipart_threshold=5 * MB, multipart_chunksize=5 * MB
+        )
+        results = deployer.deploy(artifacts)
+        assert [r.uploaded for r in results] == [True, True]
+        head = s3_client.head_object(Bucket=BUCKET, Key="code/pyspark_deps.tar.gz")
+        # A multipart ETag is not the MD5 of the content
+        assert head["ETag"].strip('"').endswith("-3")
+        assert head["ContentLength"] == 11 * MB
+        assert (
+            head["Metadata"][SHA256_METADATA_KEY]
+            == hashlib.sha256(archive.read_bytes()).hexdigest()
+        )
+        assert "Uploading pyspark_deps.tar.gz: 100%" in capsys.readouterr().out
+
+        results = deployer.deploy(artifacts)
+        assert [r.uploaded for r in results] == [False, False]
+
+    def test_missing_file(self, s3_client, tmp_path):
+        artifacts = [(str(tmp_path / "missing.py"), BUCKET, "code/missing.py")]
+        with pytest.raises(FileNotFoundError):
+            S3Deployer(s3_client).deploy(artifacts)
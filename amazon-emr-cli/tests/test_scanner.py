@@ -0,0 +1,157 @@
+import os
+from unittest.mock import patch
+
+from src.emr_cli.packaging.detector import ProjectDetector
+from src.emr_cli.packaging.python_files_project import PythonFilesProject
+from src.emr_cli.packaging.python_poetry_project import PythonPoetryProject
+from src.emr_cli.packaging.python_project import PythonProject
+from src.emr_cli.packaging.simple_project import SimpleProject
+from src.emr_cli.utils import scanner
+from src.emr_cli.utils.scanner import (
+    ProjectScan,
+    is_ignored,
+    parse_ignore_pattern,
+    scan_project,
+)
+
+
+def make_tree(root, paths):
+    for path in paths:
+        full = root / path
+        full.parent.mkdir(parents=True, exist_ok=True)
+        full.write_text("")
+
+
+def relpaths(scan, root):
+    return sorted(
+        os.path.relpath(path, root).replace(os.sep, "/") for path in scan.files
+    )
+
+
+def ignored(patterns, relpath, is_dir=False):
+    rules = [parse_ignore_pattern(p) for p in patterns]
+    return is_ignored([r for r in rules if r is not None], relpath, is_dir)
+
+
+class TestIgnorePatterns:
+    def test_name_matches_at_any_depth(self):
+        assert ignored(["*.pyc"], "a.pyc")
+        assert ignored(["*.pyc"], "pkg/sub/a.pyc")
+        assert not ignored(["*.pyc"], "a.py")
+
+    def test_anchored(self):
+        assert ignored(["/build"], "build", True)
+        assert not ignored(["/build"], "src/build", True)
+        assert ignored(["docs/*.md"], "docs/a.md")
+        assert not ignored(["docs/*.md"], "docs/sub/a.md")
+
+    def test_double_star(self):
+        assert ignored(["**/data"], "a/b/data", True)
+        assert ignored(["data/**"], "data/a/b.csv")
+        assert ignored(["a/**/z.py"], "a/z.py")
+        assert ignored(["a/**/z.py"], "a/b/c/z.py")
+
+    def test_dir_only(self):
+        assert ignored(["logs/"], "logs", True)
+        assert not ignored(["logs/"], "logs", False)
+
+    def test_negation_last_match_wins(self):
+        assert not ignored(["*.py", "!keep.py"], "keep.py")
+        assert ignored(["!keep.py", "*.py"], "keep.py")
+
+    def test_comments_and_blank_lines(self):
+        assert parse_ignore_pattern("# comment") is None
+        assert parse_ignore_pattern("   ") is None
+        assert ignored(["\\#file"], "#file")
+
+
+class TestProjectScan:
+    def test_default_ignores(self, tmp_path):
+        make_tree(
+            tmp_path,
+            [
+                "entrypoint.py",
+                "jobs/job.py",
+                ".venv/lib/site.py",
+                ".git/hooks/hook.py",
+                "node_modules/pkg/index.py",
+                "jobs/__pycache__/job.cpython-39.pyc",
+            ],
+        )
+        scan = ProjectScan(str(tmp_path))
+        assert relpaths(scan, tmp_path) == ["entrypoint.py", "jobs/job.py"]
+
+    def test_gitignore(self, tmp_path):
+        make_tree(
+            tmp_path,
+            [
+                "entrypoint.py",
+                "data/big/part-0.py",
+                "dist/pyfiles.zip",
+                "jobs/job.py",
+                "jobs/generated.py",
+                "jobs/keep_generated.py",
+            ],
+        )
+        (tmp_path / ".gitignore").write_text("data/\n/dist\n")
+        (tmp_path / "jobs" / ".gitignore").write_text("*generated.py\n!keep_*\n")
+        scan = ProjectScan(str(tmp_path))
+        assert relpaths(scan, tmp_path) == [
+            ".gitignore",
+            "entrypoint.py",
+            "jobs/.gitignore",
+            "jobs/job.py",
+            "jobs/keep_generated.py",
+        ]
+
+        scan = ProjectScan(str(tmp_path), use_gitignore=False)
+        assert "data/big/part-0.py" in relpaths(scan, tmp_path)
+
+    def test_custom_ignore(self, tmp_path):
+        make_tree(tmp_path, ["entrypoint.py", "notebooks/explore.py", ".venv/a.py"])
+        scan = ProjectScan(str(tmp_path), ignore=["notebooks"])
+        assert relpaths(scan, tmp_path) == [".venv/a.py", "entrypoint.py"]
+
+    def test_find(self, tmp_path):
+        make_tree(tmp_path, ["setup.py", "pkg/poetry.lock", "pkg/mod.py"])
+        scan = ProjectScan(str(tmp_path))
+        assert sorted(scan.find(".py")) == [
+            str(tmp_path / "pkg" / "mod.py"),
+            str(tmp_path / "setup.py"),
+        ]
+        assert scan.find("poetry.lock") == [str(tmp_path / "pkg" / "poetry.lock")]
+        assert scan.find("pyproject.toml") == []
+
+    def test_scan_project_is_cached(self, tmp_path):
+        make_tree(tmp_path, ["entrypoint.py"])
+        scan = scan_project(str(tmp_path))
+        make_tree(tmp_path, ["other.py"])
+        assert scan_project(str(tmp_path)) is scan
+        assert len(scan_project(str(tmp_path), rescan=True).find(".py")) == 2
+
+
+class TestDetectorScan:
+    def test_detect(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        make_tree(tmp_path, ["entrypoint.py"])
+        assert ProjectDetector().detect() is SimpleProject
+        make_tree(tmp_path, ["jobs/job.py"])
+        scan_project(str(tmp_path), rescan=True)
+        assert ProjectDetector().detect() is PythonFilesProject
+        make_tree(tmp_path, ["pyproject.toml"])
+        scan_project(str(tmp_path), rescan=True)
+        assert ProjectDetector().detect() is PythonProject
+        make_tree(tmp_path, ["poetry.lock"])
+        scan_project(str(tmp_path), rescan=True)
+        assert ProjectDetector().detect() is PythonPoetryProject
+
+    def test_detect_and_build_share_one_walk(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        make_tree(tmp_path, ["entrypoint.py", "jobs/job.py"])
+        with patch.object(
+            scanner, "ProjectScan", side_effect=ProjectScan
+        ) as project_scan:
+            project = ProjectDetector().detect()
+            project("entrypoint.py").build()
+        assert project is PythonFilesProject
+        assert project_scan.call_count == 1
@@ -17,9 +17,12 @@ arabic_diacritics = re.compile("""
                          """, re.VERBOSE)
 
 
+# Deletes the characters matched by arabic_diacritics in a single str.translate
+arabic_diacritics_table = str.maketrans('', '', '\u0651\u064e\u064b\u064f\u064c\u0650\u064d\u0652\u0640')
+
+
 def remove_diacritics(text):
-    text = re.sub(arabic_diacritics, '', text)
-    return text
+    return text.translate(arabic_diacritics_table)
 
 
 def remove_punctuation(s):
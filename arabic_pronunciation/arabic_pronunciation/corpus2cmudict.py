@@ -1,7 +1,10 @@
 import argparse
-import operator
-import re
 import collections
+import functools
+import itertools
+import multiprocessing
+import os
+import re
 
 from arabic_pronunciation import phonetise_Arabic
 import arabic_pronunciation.arabic_utils as arabic_utils
@@ -13,46 +16,99 @@ parser.add_argument('-p', '--project-name', type=str,
                     help='project name', required=True)
 parser.add_argument('-s', '--s-tag', action='store_true',
                     help='the sentences include <s> tag')
+parser.add_argument('-j', '--jobs', type=int, default=None,
+                    help='number of worker processes (default: number of CPUs)')
+
+# Number of corpus lines each worker counts at a time
+LINES_PER_BATCH = 10000
+# Number of distinct words each worker phonetises at a time
+WORDS_PER_BATCH = 1000
+
+s_tag_pattern = re.compile('<s>(.*)</s>')
+
+
+def count_words(lines, s_tag=False):
+    """Counts the occurrences of every word in `lines`."""
+    counts = collections.Counter()
+    for line in lines:
+        if s_tag:
+            sentence = s_tag_pattern.search(line).group(1)
+        else:
+            sentence = line
+        counts.update(sentence.split())
+    return counts
+
 
+def batches(iterable, size):
+    iterator = iter(iterable)
+    batch = list(itertools.islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(itertools.islice(iterator, size))
 
-def calculateFrequencies(dic):
-    for word in dic:
-        dic[word]=collections.Counter(dic[word])
 
-def corpus2dictionary(corpus, project_name):
+def phonetise_corpus(corpus, s_tag=False, processes=None):
+    """
+    Counts the words of `corpus` (any iterable of lines, e.g. an open file) and phonetises each distinct word once,
+    with phonetise_Arabic.phonetise_many.
+    Returns the word counts, in order of first occurrence, and the pronunciations of every word.
+
+    The corpus is streamed in batches of LINES_PER_BATCH lines, so memory use grows with the vocabulary rather than
+    the corpus. With more than one process, batches are counted and words phonetised in a process pool.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    count_batch = functools.partial(count_words, s_tag=s_tag)
+    if processes == 1:
+        word_counts = collections.Counter()
+        for batch in batches(corpus, LINES_PER_BATCH):
+            word_counts.update(count_batch(batch))
+        pronunciations = dict(zip(word_counts, phonetise_Arabic.phonetise_many(word_counts)))
+        return word_counts, pronunciations
+
+    with multiprocessing.Pool(processes) as pool:
+        word_counts = collections.Counter()
+        # imap keeps the batches in corpus order, so words stay in order of first occurrence
+        for counts in pool.imap(count_batch, batches(corpus, LINES_PER_BATCH)):
+            word_counts.update(counts)
+        # Sorted, so that the words of a batch share prefixes phonetise_many can reuse
+        words = sorted(word_counts)
+        results = pool.imap(phonetise_Arabic.phonetise_many, batches(words, WORDS_PER_BATCH))
+        pronunciations = dict(zip(words, itertools.chain.from_iterable(results)))
+    return word_counts, pronunciations
+
+
+def build_dictionaries(word_counts, pronunciations):
+    """
+    Builds the pronunciation frequencies of every word, and of every word without diacritics, from the word counts of
+    a corpus. Every occurrence of a word counts once for each of its pronunciations.
+    Returns both dictionaries and the set of phones used.
+    """
     pronunciation_dict = {}
-    pronunciation_dict_cleaned={}
+    pronunciation_dict_cleaned = {}
     phones_list = set()
     phones_list.add('SIL')
-    for line in corpus:
-        if args.s_tag:
-            sentence = re.search('<s>(.*)</s>', line).group(1)
-        else:
-            sentence = line
-        words = sentence.split()
-        for word in words:
-            pronunciations = phonetise_Arabic.phonetise_word(word)
-            for pronunciation in pronunciations:
-                for phone in pronunciation.split():
-                    phones_list.add(phone)
-
-            def addWordToDictionary(localWord, dic):
-                if localWord not in dic:
-                    dic[localWord] = []
-                dic[localWord].extend(pronunciations)
-            cleaned_word = arabic_utils.remove_diacritics(word)
-            addWordToDictionary(word, pronunciation_dict)
-            addWordToDictionary(cleaned_word, pronunciation_dict_cleaned)
-
-    calculateFrequencies(pronunciation_dict)
-    calculateFrequencies(pronunciation_dict_cleaned)
+    for word, count in word_counts.items():
+        frequencies = collections.Counter(pronunciations[word])
+        for pronunciation in frequencies:
+            phones_list.update(pronunciation.split())
+            frequencies[pronunciation] *= count
+        cleaned_word = arabic_utils.remove_diacritics(word)
+        pronunciation_dict[word] = frequencies
+        pronunciation_dict_cleaned.setdefault(cleaned_word, collections.Counter()).update(frequencies)
+    return pronunciation_dict, pronunciation_dict_cleaned, phones_list
+
+
+def corpus2dictionary(corpus, project_name, s_tag=False, processes=None):
+    word_counts, pronunciations = phonetise_corpus(corpus, s_tag, processes)
+    pronunciation_dict, pronunciation_dict_cleaned, phones_list = build_dictionaries(word_counts, pronunciations)
 
     print('writing 2 dic files')
-    writeFile(pronunciation_dict, proj_name + '_moshakal.dic')
-    writeFile(pronunciation_dict_cleaned, proj_name + '_cleaned.dic')
+    writeFile(pronunciation_dict, project_name + '_moshakal.dic')
+    writeFile(pronunciation_dict_cleaned, project_name + '_cleaned.dic')
 
     print('writing phone file')
-    with open(proj_name + '.phone', mode='w', encoding='utf-8') as phone_writer:
+    with open(project_name + '.phone', mode='w', encoding='utf-8') as phone_writer:
         for ph in sorted(phones_list):
             phone_writer.write(ph)
             phone_writer.write('\n')
@@ -66,6 +122,4 @@ def writeFile(dic, fileName):
 
 if __name__ == '__main__':
     args = parser.parse_args()
-    corpus = args.input.readlines()
-    proj_name = args.project_name
-    corpus2dictionary(corpus, project_name=proj_name)
+    corpus2dictionary(args.input, project_name=args.project_name, s_tag=args.s_tag, processes=args.jobs)
@@ -20,7 +20,7 @@ if __name__ == '__main__':
             continue
         word = line.split()[0]
         phones = ' '.join(line.split()[1:])
-        arabic_word = arabic_utils.remove_diacritics(buckwalterToArabic(word))
+        arabic_word = arabic_utils.remove_diacritics(buckwalterToArabic.buckwalterToArabic(word))
         print(word, arabic_word)
         if arabic_word in cmu_dict:
             cmu_dict[arabic_word].add(phones)
@@ -2,10 +2,11 @@
 # -*- coding: UTF8 -*-
 
 import argparse
+import itertools
 import os
 import re
 
-from arabic_pronunciation import arabic_utils, constants,handle_characters,emphatic_context,remove_duplicates, pronounciations_from_phones, convert_from_arabic_to_phones
+from arabic_pronunciation import arabic_utils, constants,handle_characters,emphatic_context,remove_duplicates, pronounciations_from_phones, convert_from_arabic_to_phones, transliteration
 
 
 
@@ -50,7 +51,12 @@ def isFixedWord2(word, results, orthography, pronunciations):
 
 
 
-def phonetise_word(arabic_word):
+def phonetise_word(arabic_word, max_variants=None, most_likely_first=False):
+    """
+    Returns the possible pronunciations of arabic_word, the most likely first.
+    max_variants limits the number of pronunciations returned, and most_likely_first orders the generated ones by
+    how many ambiguous phones differ from their most likely alternative.
+    """
     utterances = [arabic_word]
     arabic_word = arabic_utils.remove_diacritics(arabic_word)
     result = ''  # Pronunciations Dictionary
@@ -124,9 +130,151 @@ def phonetise_word(arabic_word):
                 # Alif could be ommited in definite article and beginning of some words
                 if letter in [u'a', u'A', u'Y']:
                     phones += handle_characters.alef(beforePreviousCharacter, previousCharacter, letter, nextCharacter, emphaticContext)
-    pronunciations += pronounciations_from_phones.get_different_possible_pronounciations(phones)
-    pronunciations = remove_duplicates.remove_duplicates(pronunciations)
+    return _pronunciations(pronunciations, phones, len(arabic_word), max_variants, most_likely_first)
 
-    return [' '.join(item) for item in pronunciations if len(item) >=len(arabic_word)]
 
+def _pronunciations(fixed_pronunciations, phones, min_length, max_variants, most_likely_first):
+    if not fixed_pronunciations and list not in map(type, phones):
+        # A single pronunciation
+        item = remove_duplicates.remove_duplicate_phones([phone for phone in phones if phone != u''])
+        return [' '.join(item)] if len(item) >= min_length and max_variants != 0 else []
+    # Variants are generated lazily, so with max_variants only the pronunciations returned are built
+    candidates = itertools.chain(fixed_pronunciations,
+                                 pronounciations_from_phones.iter_pronounciations(phones, most_likely_first))
+    results = []
+    seen = set()
+    for item in candidates:
+        if max_variants is not None and len(results) >= max_variants:
+            break
+        item = remove_duplicates.remove_duplicate_phones(item)
+        if len(item) >= min_length:
+            pronunciation = ' '.join(item)
+            if pronunciation not in seen:
+                seen.add(pronunciation)
+                results.append(pronunciation)
+    return results
+
+
+# -----------------------------------------------------------------------------------------------------
+# Batch phonetisation----------------------------------------------------------------------------------
+# -----------------------------------------------------------------------------------------------------
+# The rules of the main loop of phonetise_word, as one handler per letter. A handler appends the phones of
+# word[index] to phones, and records in undo the phones it replaces.
+emphatics = frozenset(constants.emphatics)
+backward_emphatics = emphatics - frozenset(constants.forwardEmphatics)
+
+
+def _emphatic_context(word, index):  # Same as emphatic_context.getState
+    return word[index] in emphatics or word[index + 1] in backward_emphatics
+
+
+def _consonant(phone):
+    def handle(word, index, phones, undo):
+        phones.append(phone)
+    return handle
+
+
+def _lam(word, index, phones, undo):
+    phones += handle_characters.lam(word[index - 2], word[index - 1], word[index + 1], word[index + 2])
+
+
+def _shadda(word, index, phones, undo):
+    # shadda just doubles the letter before it
+    if word[index - 1] not in (u'w', u'y') and len(phones) > 0:
+        undo.append((index, len(phones) - 1, phones[-1]))
+        phones[-1] = phones[-1] + phones[-1]
+
+
+def _madda(word, index, phones, undo):
+    # phonetise_word passes the emphatic_context module as the emphatic state, which is always true
+    phones += handle_characters.madda(True)
+
+
+def _ta_marbuta(word, index, phones, undo):
+    phones += handle_characters.p(word[index + 1])
+
+
+def _waw_and_ya(word, index, phones, undo):
+    phones += handle_characters.handle_vowels(word[index - 1], word[index], word[index + 1], word[index + 2],
+                                              _emphatic_context(word, index))
+
+
+def _kasra_and_damma(word, index, phones, undo):
+    phones += handle_characters.kasra_and_damma(word, word[index], _emphatic_context(word, index),
+                                                word[index + 1], word[index + 2])
+
+
+def _alef(word, index, phones, undo):
+    phones += handle_characters.alef(word[index - 2], word[index - 1], word[index], word[index + 1],
+                                     _emphatic_context(word, index))
+
+
+letter_handlers = {letter: _consonant(phone) for letter, phone in constants.unambiguousConsonantMap.items()}
+letter_handlers.update({
+    u'l': _lam, u'~': _shadda, u'|': _madda, u'p': _ta_marbuta,
+    u'w': _waw_and_ya, u'y': _waw_and_ya,
+    u'u': _kasra_and_damma, u'i': _kasra_and_damma,
+    u'a': _alef, u'A': _alef, u'Y': _alef,
+})
+
+
+def phonetise_many(words, max_variants=None, most_likely_first=False):
+    """
+    Returns the pronunciations of each of words, as phonetise_word would.
+
+    The words are transliterated together and each distinct word is phonetised once, its letters dispatched through
+    letter_handlers. Words are visited in sorted order, and the phones of the letters a word shares with the
+    previous one (with the letters that follow them) are reused rather than recomputed.
+    """
+    words = list(words)
+    distinct = [word for word in dict.fromkeys(words) if u'\n' not in word]
+    if distinct:
+        text = u'\n'.join(distinct)
+        buckwalter_words = transliteration.arabicToBuckwalter(text).split(u'\n')
+        lengths = [len(word) for word in arabic_utils.remove_diacritics(text).split(u'\n')]
+    else:
+        buckwalter_words = lengths = []
+
+    results = {}
+    batch = []
+    for arabic_word, buckwalter_word, length in zip(distinct, buckwalter_words, lengths):
+        word = transliteration.normalise(buckwalter_word)
+        if u' ' in word or u'#' in word or word in (u'-', u'sil'):
+            continue
+        pronunciations = []
+        isFixedWord2(word, u'', word, pronunciations)
+        batch.append((u'##' + word + u'##', arabic_word, pronunciations, length))
+    batch.sort()
+
+    previous = u''
+    phones = []
+    marks = []  # marks[index - 2] is the number of phones before the letter at index
+    undo = []
+    for word, arabic_word, pronunciations, length in batch:
+        # Go back to the first letter whose phones depend on a letter that isn't shared with the previous word
+        shared = 0
+        for shared, (letter, previous_letter) in enumerate(zip(word, previous)):
+            if letter != previous_letter:
+                break
+        else:
+            shared = min(len(word), len(previous))
+        start = max(2, shared - 2)
+        while undo and undo[-1][0] >= start:
+            _, position, phone = undo.pop()
+            phones[position] = phone
+        if marks:
+            del phones[marks[start - 2]:]
+            del marks[start - 2:]
+
+        for index in range(start, len(word) - 2):
+            marks.append(len(phones))
+            handle = letter_handlers.get(word[index])
+            if handle is not None:
+                handle(word, index, phones, undo)
+        marks.append(len(phones))
+        previous = word
+
+        results[arabic_word] = _pronunciations(pronunciations, phones, length, max_variants, most_likely_first)
 
+    return [list(results[word]) if word in results else phonetise_word(word, max_variants, most_likely_first)
+            for word in words]
@@ -1,21 +1,43 @@
-def get_different_possible_pronounciations(phones):
-    pronunciations = []
-    possibilities = 1
-    for letter in phones:
-        if isinstance(letter, list):
-            possibilities = possibilities * len(letter)
+import itertools
 
-    # Generate all possible pronunciations
-    for i in range(0, possibilities):
-        pronunciations.append([])
-        iterations = 1
-        for index, letter in enumerate(phones):
-            if isinstance(letter, list):
-                curIndex = int(i / iterations) % len(letter)
-                if letter[curIndex] != u'':
-                    pronunciations[-1].append(letter[curIndex])
-                iterations = iterations * len(letter)
-            else:
-                if letter != u'':
-                    pronunciations[-1].append(letter)
-    return pronunciations
\ No newline at end of file
+
+def iter_pronounciations(phones, most_likely_first=False):
+    """
+    Lazily generates the possible pronunciations of a list of phones, where an ambiguous phone is a list of
+    alternatives, the most likely one first. Empty phones are dropped and each pronunciation is generated once.
+
+    By default pronunciations come in the order get_different_possible_pronounciations always used, where the
+    first ambiguous phone changes fastest. With most_likely_first, they are ordered by how many phones differ from
+    their most likely alternative.
+    Either way the first pronunciation is the most likely one, so taking it doesn't enumerate the others.
+    """
+    if list not in map(type, phones):
+        yield [phone for phone in phones if phone != u'']
+        return
+    choices = [phone if isinstance(phone, list) else [phone] for phone in phones]
+    if most_likely_first:
+        combinations = _by_likelihood(choices)
+    else:
+        combinations = (reversed(combination) for combination in itertools.product(*reversed(choices)))
+    seen = set()
+    for combination in combinations:
+        pronunciation = tuple(phone for phone in combination if phone != u'')
+        if pronunciation not in seen:
+            seen.add(pronunciation)
+            yield list(pronunciation)
+
+
+def _by_likelihood(choices):
+    ambiguous = [index for index, alternatives in enumerate(choices) if len(alternatives) > 1]
+    most_likely = [alternatives[0] for alternatives in choices]
+    for changes in range(len(ambiguous) + 1):
+        for changed in itertools.combinations(ambiguous, changes):
+            for alternatives in itertools.product(*(choices[index][1:] for index in changed)):
+                combination = list(most_likely)
+                for index, alternative in zip(changed, alternatives):
+                    combination[index] = alternative
+                yield combination
+
+
+def get_different_possible_pronounciations(phones, max_variants=None, most_likely_first=False):
+    return list(itertools.islice(iter_pronounciations(phones, most_likely_first), max_variants))
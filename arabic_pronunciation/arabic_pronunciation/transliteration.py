@@ -0,0 +1,82 @@
+import re
+
+buckwalter = {  # mapping from Arabic script to Buckwalter
+    u'\u0628': u'b', u'\u0630': u'*', u'\u0637': u'T', u'\u0645': u'm',
+    u'\u062a': u't', u'\u0631': u'r', u'\u0638': u'Z', u'\u0646': u'n',
+    u'\u062b': u'^', u'\u0632': u'z', u'\u0639': u'E', u'\u0647': u'h',
+    u'\u062c': u'j', u'\u0633': u's', u'\u063a': u'g', u'\u062d': u'H',
+    u'\u0642': u'q', u'\u0641': u'f', u'\u062e': u'x', u'\u0635': u'S',
+    u'\u0634': u'$', u'\u062f': u'd', u'\u0636': u'D', u'\u0643': u'k',
+    u'\u0623': u'>', u'\u0621': u'\'', u'\u0626': u'}', u'\u0624': u'&',
+    u'\u0625': u'<', u'\u0622': u'|', u'\u0627': u'A', u'\u0649': u'Y',
+    u'\u0629': u'p', u'\u064a': u'y', u'\u0644': u'l', u'\u0648': u'w',
+    u'\u064b': u'F', u'\u064c': u'N', u'\u064d': u'K', u'\u064e': u'a',
+    u'\u064f': u'u', u'\u0650': u'i', u'\u0651': u'~', u'\u0652': u'o'
+}
+
+ArabicScript = {  # mapping from Buckwalter to Arabic script
+    latin: arabic for arabic, latin in buckwalter.items()
+}
+
+to_buckwalter_table = str.maketrans(buckwalter)
+to_arabic_table = str.maketrans(ArabicScript)
+
+
+def arabicToBuckwalter(word):  # Convert input string to Buckwalter
+    return word.translate(to_buckwalter_table)
+
+
+def buckwalterToArabic(word):  # Convert input string to Arabic
+    return word.translate(to_arabic_table)
+
+
+# ----------------------------------------------------------------------------
+# Normalisation of Buckwalter utterances--------------------------------------
+# ----------------------------------------------------------------------------
+# The rules are applied in the same order as the sequence of str.replace/re.sub calls they replace, because they
+# feed each other (removing o can bring A and F together, a rule can consume the space another one starts with...).
+# Rules that commute are merged into a single str.translate, anchored rules are plain string checks, and the
+# remaining patterns are compiled once and only run when the text they start with is in the utterance.
+remove_sukun_and_tatweel = str.maketrans({u'\u0640': None, u'o': None})
+expand_nunation_and_madda = str.maketrans({u'F': u'an', u'N': u'un', u'K': u'in', u'|': u'>A'})
+
+silent_alef_after_space = re.compile(u'([^\\-]) A')
+hamza_without_vowel = re.compile(u' >([^auAw ])')
+hamza_below_without_kasra = re.compile(u'<([^i])')
+alef_without_vowel = re.compile(u' A([^aui])')
+
+
+def normalise(utterance):
+    """
+    Normalises an utterance in Buckwalter: removes sukun and tatweel, expands nunation and madda, and makes hamzas
+    and the alef of the definite article explicit. Words are still separated by spaces.
+    """
+    utterance = utterance.replace(u'AF', u'F')
+    utterance = utterance.translate(remove_sukun_and_tatweel)
+    utterance = utterance.replace(u'aA', u'A')
+    utterance = utterance.replace(u'aY', u'Y')
+    if u' A' in utterance:
+        utterance = silent_alef_after_space.sub(u'\\1 ', utterance)
+    utterance = utterance.translate(expand_nunation_and_madda)
+
+    # Deal with Hamza types that when not followed by a short vowel letter,
+    # this short vowel is added automatically
+    utterance = utterance.replace(u'Ai', u'<i')
+    utterance = utterance.replace(u'Aa', u'>a')
+    utterance = utterance.replace(u'Au', u'>u')
+    if utterance.startswith(u'Al'):
+        utterance = u'>al' + utterance[2:]
+    utterance = utterance.replace(u' - Al', u' - >al')
+    if utterance.startswith(u'- Al'):
+        utterance = u'- >al' + utterance[4:]
+    if utterance[:1] == u'>' and utterance[1:2] not in (u'', u'a', u'u', u'A', u'w'):
+        utterance = u'>a' + utterance[1:]
+    if u' >' in utterance:
+        utterance = hamza_without_vowel.sub(u' >a\\1', utterance)
+    if u'<' in utterance:
+        utterance = hamza_below_without_kasra.sub(u'<i\\1', utterance)
+    if u' A' in utterance:
+        utterance = alef_without_vowel.sub(u' \\1', utterance)
+    if utterance[:1] == u'A' and utterance[1:2] not in (u'', u'a', u'u', u'i'):
+        utterance = utterance[1:]
+    return utterance
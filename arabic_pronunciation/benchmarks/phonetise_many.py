@@ -0,0 +1,57 @@
+"""
+Throughput of phonetise_many against calling phonetise_word for every word, in words per second, on the distinct
+words of a generated vocabulary and on a corpus drawn from it with Zipf-distributed word frequencies.
+
+    python -m benchmarks.phonetise_many [number of corpus words]
+"""
+import itertools
+import random
+import sys
+import time
+
+from arabic_pronunciation import phonetise_Arabic
+from benchmarks.transliteration import TEXT
+
+PREFIXES = [u'', u'وَ', u'فَ', u'بِ', u'الْ', u'وَالْ', u'بِالْ', u'لِلْ', u'كَ']
+SUFFIXES = [u'', u'هَا', u'هُمْ', u'كُمْ', u'نَا', u'ي']
+
+
+def vocabulary():
+    stems = sorted(set(word.replace(u'الْ', u'') for word in TEXT.split()))
+    words = [prefix + stem + suffix for prefix, stem, suffix in itertools.product(PREFIXES, stems, SUFFIXES)]
+    random.Random(0).shuffle(words)
+    return words
+
+
+def corpus(words, size):
+    weights = [1.0 / rank for rank in range(1, len(words) + 1)]
+    return random.Random(1).choices(words, weights, k=size)
+
+
+def words_per_second(function, words, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(words)
+        best = min(best, time.perf_counter() - start)
+    return len(words) / best
+
+
+def per_word(words):
+    return [phonetise_Arabic.phonetise_word(word) for word in words]
+
+
+def main(size):
+    distinct = vocabulary()
+    assert phonetise_Arabic.phonetise_many(distinct) == per_word(distinct)
+
+    print('{:<28}{:>16}{:>16}{:>10}'.format('', 'per word (w/s)', 'batch (w/s)', 'speedup'))
+    for name, words in [('{:,} distinct words'.format(len(distinct)), distinct),
+                        ('{:,} corpus words'.format(size), corpus(distinct, size))]:
+        before = words_per_second(per_word, words)
+        after = words_per_second(phonetise_Arabic.phonetise_many, words)
+        print('{:<28}{:>16,.0f}{:>16,.0f}{:>9.1f}x'.format(name, before, after, after / before))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,84 @@
+"""
+Throughput of Buckwalter transliteration and utterance normalisation, in words per second, compared with the
+character-by-character transliteration and one-pass-per-rule normalisation they replaced.
+
+    python -m benchmarks.transliteration [number of words]
+"""
+import re
+import sys
+import time
+
+from arabic_pronunciation import convert_from_arabic_to_phones
+from arabic_pronunciation.transliteration import arabicToBuckwalter, buckwalter
+
+TEXT = (
+    u'ذَهَبَ الطَّالِبُ إِلَى الْمَدْرَسَةِ صَبَاحًا وَقَرَأَ كِتَابًا جَدِيدًا عَنْ تَارِيخِ الْعُلُومِ '
+    u'وَالْمُسْتَشْفَيَاتِ فِي الْقُرُونِ الْوُسْطَى ثُمَّ كَتَبَ مَقَالَةً قَصِيرَةً لِأَصْدِقَائِهِ '
+    u'الَّذِينَ يُتَابِعُونَهُ بِاهْتِمَامٍ كَبِيرٍ وَيَنْتَظِرُونَ آرَاءَهُ فِي مُسْتَقْبَلِ اللُّغَةِ الْعَرَبِيَّةِ'
+)
+
+
+def legacy_arabic_to_buckwalter(word):
+    result = u''
+    for letter in word:
+        if letter in buckwalter:
+            result += buckwalter[letter]
+        else:
+            result += letter
+    return result
+
+
+def legacy_convert(arabic_word):
+    utterance = legacy_arabic_to_buckwalter(arabic_word)
+    utterance = utterance.replace(u'AF', u'F')
+    utterance = utterance.replace(u'ـ', u'')
+    utterance = utterance.replace(u'o', u'')
+    utterance = utterance.replace(u'aA', u'A')
+    utterance = utterance.replace(u'aY', u'Y')
+    utterance = re.sub(u'([^\\-]) A', u'\\1 ', utterance)
+    utterance = utterance.replace(u'F', u'an')
+    utterance = utterance.replace(u'N', u'un')
+    utterance = utterance.replace(u'K', u'in')
+    utterance = utterance.replace(u'|', u'>A')
+    utterance = re.sub(u'^Ai', u'<i', utterance)
+    utterance = re.sub(u'^Aa', u'>a', utterance)
+    utterance = re.sub(u'^Au', u'>u', utterance)
+    utterance = re.sub(u'Ai', u'<i', utterance)
+    utterance = re.sub(u'Aa', u'>a', utterance)
+    utterance = re.sub(u'Au', u'>u', utterance)
+    utterance = re.sub(u'^Al', u'>al', utterance)
+    utterance = re.sub(u' - Al', u' - >al', utterance)
+    utterance = re.sub(u'^- Al', u'- >al', utterance)
+    utterance = re.sub(u'^>([^auAw])', u'>a\\1', utterance)
+    utterance = re.sub(u' >([^auAw ])', u' >a\\1', utterance)
+    utterance = re.sub(u'<([^i])', u'<i\\1', utterance)
+    utterance = re.sub(u' A([^aui])', u' \\1', utterance)
+    utterance = re.sub(u'^A([^aui])', u'\\1', utterance)
+    return utterance.split(u' ')
+
+
+def words_per_second(function, words):
+    start = time.perf_counter()
+    for word in words:
+        function(word)
+    return len(words) / (time.perf_counter() - start)
+
+
+def main(count):
+    vocabulary = TEXT.split()
+    words = (vocabulary * (count // len(vocabulary) + 1))[:count]
+    for word in vocabulary:
+        assert convert_from_arabic_to_phones.convert(word) == legacy_convert(word), word
+
+    print('{:<22}{:>16}{:>16}{:>10}'.format('', 'before (w/s)', 'after (w/s)', 'speedup'))
+    for name, before, after in [
+        ('arabicToBuckwalter', legacy_arabic_to_buckwalter, arabicToBuckwalter),
+        ('convert', legacy_convert, convert_from_arabic_to_phones.convert),
+    ]:
+        before_rate = words_per_second(before, words)
+        after_rate = words_per_second(after, words)
+        print('{:<22}{:>16,.0f}{:>16,.0f}{:>9.1f}x'.format(name, before_rate, after_rate, after_rate / before_rate))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,73 @@
+import collections
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from arabic_pronunciation import arabic_utils, corpus2cmudict, phonetise_Arabic
+
+CORPUS = [
+    "<s> بِمُسْتَطِيل نُتَابِعُهَا </s>\n",
+    "<s> نُتَابِعُهَا كَتَبَ الْكِتَابَ </s>\n",
+    "<s> كَتَبَ كُتُب كتب نُتَابِعُهَا </s>\n",
+    "<s> هَذَا الْكِتَابُ </s>\n",
+]
+
+
+def reference_dictionaries(corpus):
+    """What corpus2dictionary computed before words were counted first: every occurrence is phonetised."""
+    pronunciation_dict = {}
+    pronunciation_dict_cleaned = {}
+    for line in corpus:
+        for word in corpus2cmudict.s_tag_pattern.search(line).group(1).split():
+            pronunciations = phonetise_Arabic.phonetise_word(word)
+            pronunciation_dict.setdefault(word, []).extend(pronunciations)
+            pronunciation_dict_cleaned.setdefault(arabic_utils.remove_diacritics(word), []).extend(pronunciations)
+    return ({w: collections.Counter(p) for w, p in pronunciation_dict.items()},
+            {w: collections.Counter(p) for w, p in pronunciation_dict_cleaned.items()})
+
+
+class TestCorpus2Dictionary(unittest.TestCase):
+
+    def test_count_words(self):
+        counts = corpus2cmudict.count_words(CORPUS, s_tag=True)
+        self.assertEqual(counts['نُتَابِعُهَا'], 3)
+        self.assertEqual(counts['كتب'], 1)
+        self.assertNotIn('<s>', counts)
+
+    def test_same_frequencies_as_phonetising_every_occurrence(self):
+        word_counts, pronunciations = corpus2cmudict.phonetise_corpus(CORPUS, s_tag=True, processes=1)
+        moshakal, cleaned, phones = corpus2cmudict.build_dictionaries(word_counts, pronunciations)
+        expected_moshakal, expected_cleaned = reference_dictionaries(CORPUS)
+        self.assertEqual(moshakal, expected_moshakal)
+        self.assertEqual(cleaned, expected_cleaned)
+        # Ties keep the order in which pronunciations were first seen
+        for word in expected_cleaned:
+            self.assertEqual(cleaned[word].most_common(), expected_cleaned[word].most_common())
+        self.assertIn('SIL', phones)
+        self.assertIn('T', phones)
+
+    def test_words_are_phonetised_once(self):
+        with mock.patch.object(phonetise_Arabic, 'phonetise_many', wraps=phonetise_Arabic.phonetise_many) as many:
+            corpus2cmudict.phonetise_corpus(CORPUS * 10, s_tag=True, processes=1)
+        many.assert_called_once()
+        self.assertEqual(len(list(many.call_args[0][0])), 8)
+
+    def test_process_pool(self):
+        self.assertEqual(corpus2cmudict.phonetise_corpus(CORPUS, s_tag=True, processes=2),
+                         corpus2cmudict.phonetise_corpus(CORPUS, s_tag=True, processes=1))
+
+    def test_writes_dictionary_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            project = os.path.join(directory, 'corpus')
+            corpus2cmudict.corpus2dictionary(iter(CORPUS), project, s_tag=True, processes=1)
+            with open(project + '_cleaned.dic', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            self.assertIn('نتابعها\t\tn u0 t aa b i0 E u0 h aa\t\t3', lines)
+            with open(project + '.phone', encoding='utf-8') as f:
+                phones = f.read().split()
+            self.assertEqual(phones, sorted(phones))
+
+
+if __name__ == '__main__':
+    unittest.main()
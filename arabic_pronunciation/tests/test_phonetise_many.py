@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from arabic_pronunciation import phonetise_Arabic
+from arabic_pronunciation.transliteration import buckwalter, buckwalterToArabic
+
+WORDS = [
+    u'بِمُسْتَطِيل', u'نُتَابِعُهَا', u'نُتَابِعُهَا', u'كَتَبَ', u'كُتُب', u'كتب', u'الْكِتَابُ', u'وَالْكِتَابُ',
+    u'هَذَا', u'لَكِنَّهُ', u'يَدْعُوا', u'الشَّمْسُ', u'كِتَابًا', u'آرَاءَهُ', u'مُسْتَشْفَى',
+]
+
+
+def per_word(words, **kwargs):
+    return [phonetise_Arabic.phonetise_word(word, **kwargs) for word in words]
+
+
+class TestPhonetiseMany(unittest.TestCase):
+
+    def test_same_as_phonetise_word(self):
+        self.assertEqual(phonetise_Arabic.phonetise_many(WORDS), per_word(WORDS))
+
+    def test_options(self):
+        for kwargs in [{'max_variants': 0}, {'max_variants': 1}, {'most_likely_first': True}]:
+            self.assertEqual(phonetise_Arabic.phonetise_many(WORDS, **kwargs), per_word(WORDS, **kwargs))
+
+    def test_shared_prefix_after_shadda(self):
+        # The shadda of each first word doubles a phone of the prefix it shares with the second one
+        words = [buckwalterToArabic(word) for word in [u'b~a', u'b~u', u'mud~apN', u'mud~atuhu', u'bad~', u'bad']]
+        self.assertEqual(phonetise_Arabic.phonetise_many(words), per_word(words))
+
+    def test_words_phonetise_word_handles_alone(self):
+        words = [u'كَتَبَ كِتَابًا', u'كَتَبَ\nكِتَابًا', u'-', u'sil', u'#كتب', u'ـ']
+        self.assertEqual(phonetise_Arabic.phonetise_many(words), per_word(words))
+
+    def test_results_are_not_shared(self):
+        results = phonetise_Arabic.phonetise_many([u'كَتَبَ', u'كَتَبَ'])
+        results[0].append(u'x')
+        self.assertEqual(results[1], [u'k a t a b a'])
+
+    def test_random_words(self):
+        rng = random.Random(0)
+        letters = list(buckwalter)
+        words = [u''.join(rng.choice(letters) for _ in range(rng.randint(1, 10))) for _ in range(2000)]
+        words += [word[:rng.randint(0, len(word))] for word in words[:1000]]
+        self.assertEqual(phonetise_Arabic.phonetise_many(words), per_word(words))
+
+    def test_empty(self):
+        self.assertEqual(phonetise_Arabic.phonetise_many([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import itertools
+import unittest
+
+from arabic_pronunciation import phonetise_Arabic
+from arabic_pronunciation.pronounciations_from_phones import get_different_possible_pronounciations, iter_pronounciations
+
+
+class TestPronounciationsFromPhones(unittest.TestCase):
+
+    def test_first_ambiguous_phone_changes_fastest(self):
+        phones = [u'b', [u'a', u'A'], u'k', [u'aa', u'']]
+        self.assertEqual(get_different_possible_pronounciations(phones), [
+            [u'b', u'a', u'k', u'aa'],
+            [u'b', u'A', u'k', u'aa'],
+            [u'b', u'a', u'k'],
+            [u'b', u'A', u'k'],
+        ])
+
+    def test_most_likely_first(self):
+        phones = [[u'a', u'A'], [u'i0', u'i1'], [u'aa', u'']]
+        pronunciations = get_different_possible_pronounciations(phones, most_likely_first=True)
+        self.assertEqual(pronunciations[:4], [
+            [u'a', u'i0', u'aa'],
+            [u'A', u'i0', u'aa'],
+            [u'a', u'i1', u'aa'],
+            [u'a', u'i0'],
+        ])
+        self.assertEqual(pronunciations[-1], [u'A', u'i1'])
+        self.assertEqual(sorted(pronunciations), sorted(get_different_possible_pronounciations(phones)))
+
+    def test_duplicates_are_generated_once(self):
+        # Shadda doubling an ambiguous phone repeats its alternatives
+        phones = [u'b', [u'aa', u'', u'aa', u'']]
+        self.assertEqual(get_different_possible_pronounciations(phones), [[u'b', u'aa'], [u'b']])
+        self.assertEqual(get_different_possible_pronounciations(phones, most_likely_first=True),
+                         [[u'b', u'aa'], [u'b']])
+
+    def test_no_phones(self):
+        self.assertEqual(get_different_possible_pronounciations([]), [[]])
+
+    def test_lazy(self):
+        # 2 ** 200 pronunciations
+        phones = [[u'a', u'A']] * 200
+        self.assertEqual(get_different_possible_pronounciations(phones, max_variants=1), [[u'a'] * 200])
+        variants = list(itertools.islice(iter_pronounciations(phones, most_likely_first=True), 3))
+        self.assertEqual([variant.count(u'A') for variant in variants], [0, 1, 1])
+
+
+class TestPhonetiseWordVariants(unittest.TestCase):
+
+    def test_max_variants(self):
+        word = u'نُتَابِعُهَا'
+        self.assertEqual(phonetise_Arabic.phonetise_word(word),
+                         [u'n u0 t aa b i0 E u0 h aa', u'n u0 t aa b i0 E u0 h a'])
+        self.assertEqual(phonetise_Arabic.phonetise_word(word, max_variants=1), [u'n u0 t aa b i0 E u0 h aa'])
+        self.assertEqual(phonetise_Arabic.phonetise_word(word, max_variants=0), [])
+
+    def test_most_likely_first(self):
+        word = u'يَدْعُوا'
+        pronunciations = phonetise_Arabic.phonetise_word(word, most_likely_first=True)
+        self.assertEqual(pronunciations[0], phonetise_Arabic.phonetise_word(word)[0])
+        self.assertEqual(sorted(pronunciations), sorted(phonetise_Arabic.phonetise_word(word)))
+
+
+if __name__ == '__main__':
+    unittest.main()
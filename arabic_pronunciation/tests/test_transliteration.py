@@ -0,0 +1,79 @@
+import itertools
+import random
+import re
+import unittest
+
+from arabic_pronunciation import convert_from_arabic_to_phones
+from arabic_pronunciation.transliteration import ArabicScript, arabicToBuckwalter, buckwalter, buckwalterToArabic, normalise
+
+
+def reference_convert(utterance):
+    """convert_from_arabic_to_phones.convert as it was before the rules were merged, one pass per rule."""
+    utterance = u''.join(buckwalter.get(letter, letter) for letter in utterance)
+    utterance = utterance.replace(u'AF', u'F')
+    utterance = utterance.replace(u'ـ', u'')
+    utterance = utterance.replace(u'o', u'')
+    utterance = utterance.replace(u'aA', u'A')
+    utterance = utterance.replace(u'aY', u'Y')
+    utterance = re.sub(u'([^\\-]) A', u'\\1 ', utterance)
+    utterance = utterance.replace(u'F', u'an')
+    utterance = utterance.replace(u'N', u'un')
+    utterance = utterance.replace(u'K', u'in')
+    utterance = utterance.replace(u'|', u'>A')
+    utterance = re.sub(u'^Ai', u'<i', utterance)
+    utterance = re.sub(u'^Aa', u'>a', utterance)
+    utterance = re.sub(u'^Au', u'>u', utterance)
+    utterance = re.sub(u'Ai', u'<i', utterance)
+    utterance = re.sub(u'Aa', u'>a', utterance)
+    utterance = re.sub(u'Au', u'>u', utterance)
+    utterance = re.sub(u'^Al', u'>al', utterance)
+    utterance = re.sub(u' - Al', u' - >al', utterance)
+    utterance = re.sub(u'^- Al', u'- >al', utterance)
+    utterance = re.sub(u'^>([^auAw])', u'>a\\1', utterance)
+    utterance = re.sub(u' >([^auAw ])', u' >a\\1', utterance)
+    utterance = re.sub(u'<([^i])', u'<i\\1', utterance)
+    utterance = re.sub(u' A([^aui])', u' \\1', utterance)
+    utterance = re.sub(u'^A([^aui])', u'\\1', utterance)
+    return utterance.split(u' ')
+
+
+# Every character the normalisation rules look at, in Buckwalter and in Arabic script
+RULE_CHARACTERS = [u'A', u'F', u'o', u'ـ', u'a', u'Y', u' ', u'-', u'N', u'K', u'|', u'i', u'u', u'l', u'<',
+                   u'>', u'w', u'b', u'ا', u'ً', u'ْ', u'أ', u'إ']
+
+
+class TestTransliteration(unittest.TestCase):
+
+    def test_round_trip(self):
+        arabic = u''.join(buckwalter)
+        self.assertEqual(arabicToBuckwalter(arabic), u''.join(buckwalter.values()))
+        self.assertEqual(buckwalterToArabic(arabicToBuckwalter(arabic)), arabic)
+        self.assertEqual(ArabicScript[u'a'], u'َ')
+
+    def test_unknown_characters_are_kept(self):
+        self.assertEqual(arabicToBuckwalter(u'بx 1'), u'bx 1')
+        self.assertEqual(buckwalterToArabic(u'b!R'), u'ب!R')
+
+    def test_normalise(self):
+        self.assertEqual(normalise(u'Aibono'), u'<ibn')
+        self.assertEqual(normalise(u'Al$amso'), u'>al$ams')
+        self.assertEqual(normalise(u'kitaAbF'), u'kitAban')
+
+    def test_same_as_one_pass_per_rule(self):
+        for length in range(4):
+            for characters in itertools.product(RULE_CHARACTERS, repeat=length):
+                utterance = u''.join(characters)
+                self.assertEqual(convert_from_arabic_to_phones.convert(utterance), reference_convert(utterance),
+                                 repr(utterance))
+
+    def test_same_as_one_pass_per_rule_random(self):
+        rng = random.Random(0)
+        characters = RULE_CHARACTERS + list(buckwalter)
+        for _ in range(20000):
+            utterance = u''.join(rng.choice(characters) for _ in range(rng.randint(4, 16)))
+            self.assertEqual(convert_from_arabic_to_phones.convert(utterance), reference_convert(utterance),
+                             repr(utterance))
+
+
+if __name__ == '__main__':
+    unittest.main()
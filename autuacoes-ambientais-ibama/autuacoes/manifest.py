@@ -0,0 +1,85 @@
+import csv
+import datetime
+import gzip
+import hashlib
+import json
+from pathlib import Path
+
+
+class DownloadManifest:
+    """JSON file recording every PDF downloaded by the spider
+
+    Each entry is keyed by the PDF name (like `AM-2010`) and has the content
+    hash, size, fetch time, HTTP cache validators and number of extracted rows,
+    so unchanged PDFs don't need to be downloaded or parsed again: their rows
+    are read from the rows file saved next to the PDF (like `AM-2010.csv.gz`).
+    """
+
+    def __init__(self, filename):
+        self.filename = Path(filename)
+        if self.filename.exists():
+            with self.filename.open() as fobj:
+                self.entries = json.load(fobj)
+        else:
+            self.entries = {}
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def is_unchanged(self, key, content):
+        entry = self.entries.get(key)
+        return entry is not None and entry["sha256"] == content_hash(content)
+
+    def record(self, key, content, rows, etag=None, last_modified=None):
+        self.entries[key] = {
+            "sha256": content_hash(content),
+            "size": len(content),
+            "fetched_at": now().isoformat(),
+            "rows": rows,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        self.save()
+
+    def touch(self, key):
+        """Update fetch time of an entry (content was checked and is the same)"""
+        self.entries[key]["fetched_at"] = now().isoformat()
+        self.save()
+
+    def save(self):
+        # Write to a temporary file first, so an interrupted run doesn't leave
+        # a truncated manifest behind.
+        temp_filename = self.filename.with_name(self.filename.name + ".tmp")
+        with temp_filename.open(mode="w") as fobj:
+            json.dump(self.entries, fobj, indent=2, sort_keys=True)
+        temp_filename.replace(self.filename)
+
+
+def write_rows(filename, data):
+    """Write rows (dicts) to a gzipped CSV file and return how many there were"""
+    total = 0
+    with gzip.open(filename, mode="wt", encoding="utf-8", newline="") as fobj:
+        writer = None
+        for row in data:
+            if writer is None:
+                writer = csv.DictWriter(fobj, fieldnames=list(row.keys()))
+                writer.writeheader()
+            writer.writerow(row)
+            total += 1
+    return total
+
+
+def read_rows(filename):
+    with gzip.open(filename, mode="rt", encoding="utf-8", newline="") as fobj:
+        yield from csv.DictReader(fobj)
+
+
+def content_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def now():
+    return datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
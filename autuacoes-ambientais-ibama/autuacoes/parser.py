@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
 import rows
 from rows.fields import slug
@@ -12,6 +14,8 @@ REGEXP_CNPJ = re.compile("([0-9]{2}\.[0-9]{3}\.[0-9]{3}/[0-9]{4}-[0-9]{2})")
 REGEXP_CPF = re.compile("([0-9]{3}\.[0-9]{3}\.[0-9]{3}-[0-9]{2})")
 REGEXP_NUMBERS = re.compile("[0-9]")
 REGEXP_PROCESSO = re.compile("([0-9./-]+)")
+PAGES_PER_CHUNK = 4  # Pages each worker process extracts at a time
+FILES_AHEAD = 2  # Files queued in the process pool after the current one
 
 
 class BRMoneyField(rows.fields.DecimalField):
@@ -201,16 +205,101 @@ class IbamaPdfExtractor:
                 yield row
 
 
+def extract_pages(filename, page_numbers, header=None, logger=None):
+    """Extract rows from some pages of `filename` (runs in a worker process)
+
+    Pages 2+ need the header captured from page 1, so it must be passed
+    unless `page_numbers` starts at page 1. Return the header and the rows.
+    """
+    extractor = IbamaPdfExtractor(filename, logger=logger)
+    extractor.header = header
+    data = [
+        row
+        for page_number in page_numbers
+        for row in extractor.extract_page(page_number)
+    ]
+    return extractor.header, data
+
+
+def extract_files(
+    filenames,
+    jobs=None,
+    pages_per_chunk=PAGES_PER_CHUNK,
+    files_ahead=FILES_AHEAD,
+    logger=None,
+):
+    """Extract rows from all `filenames`, distributing pages over processes
+
+    Rows are yielded in the same order as iterating `IbamaPdfExtractor` over
+    each file would. `jobs` is the number of worker processes (default: number
+    of CPUs); with `jobs=1` files are extracted in this process. Only
+    `files_ahead` files after the one being yielded are queued, so memory use
+    doesn't grow with the number of files.
+    """
+    if jobs == 1:
+        for filename in filenames:
+            yield from IbamaPdfExtractor(filename, logger=logger)
+        return
+
+    filenames = iter(filenames)
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Files go through two queues: `starting` while page 1 is extracted
+        # (the other pages need its header) and `extracting` after the
+        # remaining chunks were queued. Each future is dropped as soon as its
+        # rows are yielded.
+        starting, extracting = deque(), deque()
+
+        def start_files():
+            while len(starting) + len(extracting) <= files_ahead:
+                filename = next(filenames, None)
+                if filename is None:
+                    break
+                first_page = executor.submit(extract_pages, filename, (1,), None, logger)
+                starting.append((filename, first_page))
+
+        def queue_chunks(filename, first_page):
+            header, _ = first_page.result()
+            total_pages = IbamaPdfExtractor(filename).total_pages
+            chunks = deque([first_page])
+            for start in range(2, total_pages + 1, pages_per_chunk):
+                page_numbers = range(start, min(start + pages_per_chunk, total_pages + 1))
+                chunks.append(
+                    executor.submit(extract_pages, filename, page_numbers, header, logger)
+                )
+            extracting.append(chunks)
+
+        start_files()
+        while starting or extracting:
+            if not extracting:
+                queue_chunks(*starting.popleft())
+            # Keep workers busy with the next files whose header is known
+            while starting and starting[0][1].done():
+                queue_chunks(*starting.popleft())
+
+            chunks = extracting[0]
+            _, data = chunks.popleft().result()
+            if not chunks:
+                extracting.popleft()
+                start_files()
+            yield from data
+            del data
+
+
 if __name__ == "__main__":
     import argparse
     import logging
-    from pathlib import Path
 
     from rows.utils import CsvLazyDictWriter
     from tqdm import tqdm
 
     parser = argparse.ArgumentParser()
     parser.add_argument("--log-file", default="parser.log")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of processes extracting pages (0: number of CPUs)",
+    )
     parser.add_argument("input_filename", nargs="+")
     parser.add_argument("output_filename")
     args = parser.parse_args()
@@ -224,11 +313,9 @@ if __name__ == "__main__":
 
     progress = tqdm(unit_scale=True, unit="rows")
     writer = CsvLazyDictWriter(args.output_filename)
-    for filename in args.input_filename:
-        iterator = IbamaPdfExtractor(filename, logger=logger)
-        progress.desc = f"Parsing {Path(filename).name}"
-        for row in iterator:
-            writer.writerow(row)
-            progress.update()
+    progress.desc = f"Parsing {len(args.input_filename)} files"
+    for row in extract_files(args.input_filename, jobs=args.jobs or None, logger=logger):
+        writer.writerow(row)
+        progress.update()
     writer.close()
     progress.close()
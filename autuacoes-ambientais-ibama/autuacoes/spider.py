@@ -6,6 +6,7 @@ import scrapy
 from rows.utils.date import date_range, today
 
 from .cities import STATE_CODES
+from .manifest import DownloadManifest, read_rows, write_rows
 from .parser import IbamaPdfExtractor
 
 
@@ -23,7 +24,16 @@ class AutuacoesSpider(scrapy.Spider):
     end_year = datetime.datetime.now().year
     base_url = "https://servicos.ibama.gov.br/ctf/publico/areasembargadas/ConsultaPublicaAreasEmbargadas.php"
 
-    def __init__(self, download_path, start_year=None, end_year=None):
+    refresh_years = 1  # Most recent years downloaded again (could be changed)
+
+    def __init__(
+        self,
+        download_path,
+        start_year=None,
+        end_year=None,
+        force=False,
+        refresh_years=None,
+    ):
         super().__init__()
 
         self.download_path = Path(download_path)
@@ -33,6 +43,10 @@ class AutuacoesSpider(scrapy.Spider):
             int(start_year) if start_year else self.start_year,
             int(end_year) if end_year else self.end_year,
         )
+        self.force = force
+        if refresh_years is not None:
+            self.refresh_years = int(refresh_years)
+        self.manifest = DownloadManifest(self.download_path / "manifest.json")
 
     def start_requests(self):
         for date in date_range(
@@ -41,7 +55,7 @@ class AutuacoesSpider(scrapy.Spider):
             end_date = datetime.date(date.year, 12, 31)
             for code in STATE_CODES.keys():
                 request = self.make_request(code, date, end_date)
-                if request is not None:  # if it's cached, it's None
+                if request is not None:  # if there's nothing to extract, it's None
                     yield request
 
     def make_request(self, state_code, start_date, end_date):
@@ -50,16 +64,37 @@ class AutuacoesSpider(scrapy.Spider):
         # downloaded is for the whole year, thus the filename contains only the
         # year (and not the complete start/end dates).
         state = STATE_CODES[state_code]
-        filename = self.download_path / f"{state}-{start_date.year}.pdf"
-        meta = {"row": {"filename": filename}}
-
-        # If the file was downloaded already, use the downloaded version, but
-        # download again and overwrite the file if it's for the current year
-        # (could be changed since last download).
-        # TODO: add an option to force re-downloading all the files
-        if filename.exists() and start_date.year != today().year:
+        key = f"{state}-{start_date.year}"
+        filename = self.download_path / f"{key}.pdf"
+        meta = {
+            "row": {"filename": filename},
+            "key": key,
+            "handle_httpstatus_list": [304],
+        }
+        headers = {}
+
+        # Files for the most recent years are downloaded again (could be
+        # changed since last download), unless forced. Rows of other files
+        # already in the manifest are read from the rows file extracted by a
+        # previous run. Files downloaded before the manifest existed are parsed
+        # from the downloaded version.
+        entry = self.manifest.get(key)
+        cached = self.is_cached(key)
+        refresh = self.force or start_date.year > today().year - self.refresh_years
+        if not refresh and cached:
+            if not entry["rows"]:
+                return None
+            url = "file://" + str(self.rows_filename(key).absolute())
+            return scrapy.Request(url, meta=meta, callback=self.parse_cached)
+        elif not refresh and filename.exists():
             url = "file://" + str(filename.absolute())
         else:
+            if cached and not self.force:
+                # If the server supports it, it won't send an unchanged file
+                if entry["etag"]:
+                    headers["If-None-Match"] = entry["etag"]
+                if entry["last_modified"]:
+                    headers["If-Modified-Since"] = entry["last_modified"]
             start = start_date.strftime("%d/%m/%Y")
             end = end_date.strftime("%d/%m/%Y")
             query = {
@@ -69,20 +104,76 @@ class AutuacoesSpider(scrapy.Spider):
                 "fpdf": "1",
             }
             url = self.base_url + "?" + urlencode(query)
-        return scrapy.Request(url, meta=meta)
+        return scrapy.Request(url, meta=meta, headers=headers)
+
+    def rows_filename(self, key):
+        return self.download_path / f"{key}.csv.gz"
+
+    def is_cached(self, key):
+        """Whether the rows for `key` were extracted by a previous run"""
+        entry = self.manifest.get(key)
+        return entry is not None and (
+            not entry["rows"] or self.rows_filename(key).exists()
+        )
+
+    def parse_cached(self, response):
+        key = response.meta["key"]
+        self.logger.debug(f"{key} in manifest, using rows extracted before")
+        yield from read_rows(self.rows_filename(key))
 
     def parse(self, response):
+        key = response.meta["key"]
+        filename = response.meta["row"]["filename"]
+        if response.status == 304 or (
+            not self.force
+            and self.manifest.is_unchanged(key, response.body)
+            and self.is_cached(key)
+        ):
+            self.logger.debug(f"{key} not changed since last download")
+            if response.status != 304 and self.manifest.get(key)["rows"] and not filename.exists():
+                with filename.open(mode="wb") as fobj:
+                    fobj.write(response.body)
+            self.manifest.touch(key)
+            if self.manifest.get(key)["rows"]:
+                yield from read_rows(self.rows_filename(key))
+            return
+
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        validators = {
+            name: value.decode("ascii") if value is not None else None
+            for name, value in validators.items()
+        }
         if b"foi encontrado registros para esse" in response.body:
+            self.manifest.record(key, response.body, rows=0, **validators)
             return
 
-        filename = response.meta["row"]["filename"]
-        if not filename.exists():
-            with filename.open(mode="wb") as fobj:
+        # The PDF and its rows replace the ones from a previous run only after
+        # all rows were extracted, together with the manifest entry, so they
+        # are never out of step (an interrupted run leaves the old ones).
+        # TODO: add option to download-only (do not parse)
+        rows_filename = self.rows_filename(key)
+        temp_rows_filename = rows_filename.with_name(rows_filename.name + ".tmp")
+        if response.url.startswith("file://"):
+            temp_filename = None
+            pdf_filename = filename
+        else:
+            temp_filename = pdf_filename = filename.with_name(filename.name + ".tmp")
+            with temp_filename.open(mode="wb") as fobj:
                 fobj.write(response.body)
+        total = write_rows(
+            temp_rows_filename, IbamaPdfExtractor(pdf_filename, logger=self.logger)
+        )
+        if temp_filename is not None:
+            temp_filename.replace(filename)
+        temp_rows_filename.replace(rows_filename)
+        self.manifest.record(key, response.body, rows=total, **validators)
 
-        # TODO: add option to download-only (do not parse)
-        for row in IbamaPdfExtractor(filename, logger=self.logger):
-            yield row
+        # Rows are always read from the rows file, so they're the same whether
+        # the PDF was extracted in this run or in a previous one.
+        yield from read_rows(rows_filename)
 
 
 if __name__ == "__main__":
@@ -97,6 +188,16 @@ if __name__ == "__main__":
     parser.add_argument("--log-level", default="INFO")
     parser.add_argument("--start-year", type=int)
     parser.add_argument("--end-year", type=int)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Download and parse all the files, even if not changed",
+    )
+    parser.add_argument(
+        "--refresh-years",
+        type=int,
+        help=f"Download again the files for the most recent years (default: {AutuacoesSpider.refresh_years})",
+    )
     parser.add_argument("download_path")
     parser.add_argument("output_filename")
     args = parser.parse_args()
@@ -115,6 +216,8 @@ if __name__ == "__main__":
         download_path=args.download_path,
         start_year=args.start_year,
         end_year=args.end_year,
+        force=args.force,
+        refresh_years=args.refresh_years,
     )
     process.start()
     writer.close()
@@ -0,0 +1,49 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from autuacoes.manifest import DownloadManifest, content_hash
+
+
+class TestDownloadManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.filename = Path(self.temp_dir.name) / "manifest.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_record_is_saved(self):
+        manifest = DownloadManifest(self.filename)
+        manifest.record("AM-2010", b"%PDF-1.3 ...", rows=42, etag='"abc"')
+
+        entry = DownloadManifest(self.filename).get("AM-2010")
+        self.assertEqual(entry["sha256"], content_hash(b"%PDF-1.3 ..."))
+        self.assertEqual(entry["size"], 12)
+        self.assertEqual(entry["rows"], 42)
+        self.assertEqual(entry["etag"], '"abc"')
+        self.assertIsNone(entry["last_modified"])
+        self.assertIn("fetched_at", entry)
+        self.assertFalse(self.filename.with_name("manifest.json.tmp").exists())
+
+    def test_is_unchanged(self):
+        manifest = DownloadManifest(self.filename)
+        self.assertFalse(manifest.is_unchanged("AM-2010", b"content"))
+        manifest.record("AM-2010", b"content", rows=1)
+        self.assertTrue(manifest.is_unchanged("AM-2010", b"content"))
+        self.assertFalse(manifest.is_unchanged("AM-2010", b"new content"))
+        self.assertFalse(manifest.is_unchanged("AC-2010", b"content"))
+
+    def test_touch_keeps_content_data(self):
+        manifest = DownloadManifest(self.filename)
+        manifest.record("AM-2010", b"content", rows=1)
+        entry = dict(manifest.get("AM-2010"))
+        manifest.touch("AM-2010")
+        self.assertEqual(
+            {key: value for key, value in manifest.get("AM-2010").items() if key != "fetched_at"},
+            {key: value for key, value in entry.items() if key != "fetched_at"},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
 import re
+from unittest.mock import PropertyMock, patch
 
 import rows
 
+from autuacoes.parser import IbamaPdfExtractor, extract_files, extract_pages
+
 
 def test_parse_pdf():
     filename = "tests/data/amazonas-2010.pdf"
@@ -17,3 +20,27 @@ def test_parse_pdf():
 
     doc = rows.plugins.pdf.PDFMinerBackend(filename)
     # TODO: assert if the result is equal to `tests/data/amazonas-2010.csv`
+
+
+def test_extract_files_in_parallel_keeps_order():
+    filename = "tests/data/amazonas-2010.pdf"
+    # Only the first pages, to keep the test fast
+    with patch.object(IbamaPdfExtractor, "total_pages", new_callable=PropertyMock, return_value=5):
+        serial = list(IbamaPdfExtractor(filename))
+        parallel = list(extract_files([filename, filename], jobs=2, pages_per_chunk=2))
+        one_file_queued = list(
+            extract_files(iter([filename, filename]), jobs=2, pages_per_chunk=2, files_ahead=0)
+        )
+
+    assert parallel == serial + serial
+    assert one_file_queued == serial + serial
+
+
+def test_extract_pages_uses_given_header():
+    filename = "tests/data/amazonas-2010.pdf"
+    header, first_page = extract_pages(filename, (1,))
+    _, second_page = extract_pages(filename, (2,), header)
+
+    extractor = IbamaPdfExtractor(filename)
+    assert first_page == list(extractor.extract_page(1))
+    assert second_page == list(extractor.extract_page(2))
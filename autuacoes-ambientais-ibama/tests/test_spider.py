@@ -1,11 +1,19 @@
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import PropertyMock, call, patch
+from autuacoes.manifest import DownloadManifest, read_rows, write_rows
+from autuacoes.parser import IbamaPdfExtractor
 from autuacoes.spider import AutuacoesSpider
 import datetime
 import tempfile
 import os
+import shutil
+from pathlib import Path
 from urllib.parse import quote
 
+import scrapy
+from rows.utils.date import today
+from scrapy.http import Response
+
 
 class TestAutuacoesSpider(unittest.TestCase):
     def setUp(self):
@@ -204,5 +212,137 @@ class TestAutuacoesSpider(unittest.TestCase):
         self.assertEqual(len(requests), len(expected_calls))
 
 
+class TestAutuacoesSpiderManifest(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.download_path = Path(self.temp_dir.name)
+        self.start_date = datetime.date(2000, 1, 1)
+        self.end_date = datetime.date(2000, 12, 31)
+        self.manifest_filename = self.download_path / "manifest.json"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_request(self, **kwargs):
+        spider = AutuacoesSpider(download_path=self.download_path, **kwargs)
+        return spider.make_request("13", self.start_date, self.end_date)
+
+    def make_response(self, body, url=AutuacoesSpider.base_url):
+        request = scrapy.Request(
+            url,
+            meta={"row": {"filename": self.download_path / "AM-2000.pdf"}, "key": "AM-2000"},
+        )
+        return Response(url, body=body, request=request)
+
+    def cache_rows(self, body, data):
+        (self.download_path / "AM-2000.pdf").write_bytes(body)
+        write_rows(self.download_path / "AM-2000.csv.gz", data)
+        DownloadManifest(self.manifest_filename).record("AM-2000", body, rows=len(data), etag='"abc"')
+
+    def test_file_not_in_manifest_is_parsed_from_disk(self):
+        (self.download_path / "AM-2000.pdf").write_bytes(b"pdf")
+        request = self.make_request()
+        self.assertTrue(request.url.startswith("file://"))
+        self.assertTrue(request.url.endswith("AM-2000.pdf"))
+
+    def test_file_in_manifest_is_read_from_rows_file(self):
+        self.cache_rows(b"pdf", [{"numero": "1"}])
+        request = self.make_request()
+        self.assertTrue(request.url.endswith("AM-2000.csv.gz"))
+        self.assertEqual(request.callback.__name__, "parse_cached")
+
+    def test_empty_result_in_manifest_is_skipped(self):
+        DownloadManifest(self.manifest_filename).record("AM-2000", b"nothing", rows=0)
+        self.assertIsNone(self.make_request())
+
+    def test_refresh_years_sends_conditional_request(self):
+        self.cache_rows(b"pdf", [{"numero": "1"}])
+        request = self.make_request(refresh_years=today().year - 1999)
+        self.assertTrue(request.url.startswith(AutuacoesSpider.base_url))
+        self.assertEqual(request.headers["If-None-Match"], b'"abc"')
+
+    def test_force_downloads_again(self):
+        self.cache_rows(b"pdf", [{"numero": "1"}])
+        request = self.make_request(force=True)
+        self.assertTrue(request.url.startswith(AutuacoesSpider.base_url))
+        self.assertNotIn("If-None-Match", request.headers)
+
+    @patch('autuacoes.spider.IbamaPdfExtractor')
+    def test_unchanged_file_is_not_parsed(self, mock_extractor):
+        self.cache_rows(b"pdf", [{"numero": "1"}, {"numero": "2"}])
+        spider = AutuacoesSpider(download_path=self.download_path)
+
+        rows = list(spider.parse(self.make_response(b"pdf")))
+        self.assertEqual(rows, [{"numero": "1"}, {"numero": "2"}])
+        mock_extractor.assert_not_called()
+
+    @patch('autuacoes.spider.IbamaPdfExtractor')
+    def test_changed_file_is_parsed_and_recorded(self, mock_extractor):
+        mock_extractor.return_value = iter([{"numero": "1"}, {"numero": "2"}])
+        self.cache_rows(b"old pdf", [{"numero": "0"}])
+        spider = AutuacoesSpider(download_path=self.download_path)
+
+        rows = list(spider.parse(self.make_response(b"new pdf")))
+        self.assertEqual(rows, [{"numero": "1"}, {"numero": "2"}])
+        self.assertEqual((self.download_path / "AM-2000.pdf").read_bytes(), b"new pdf")
+        self.assertEqual(list(read_rows(self.download_path / "AM-2000.csv.gz")), rows)
+        entry = DownloadManifest(self.manifest_filename).get("AM-2000")
+        self.assertEqual(entry["rows"], 2)
+        self.assertEqual(entry["size"], 7)
+
+    @patch('autuacoes.spider.IbamaPdfExtractor')
+    def test_interrupted_extraction_keeps_previous_files(self, mock_extractor):
+        def extract():
+            yield {"numero": "1"}
+            raise ValueError("Row parsed incorrectly")
+
+        mock_extractor.return_value = extract()
+        self.cache_rows(b"old pdf", [{"numero": "0"}])
+        spider = AutuacoesSpider(download_path=self.download_path)
+
+        with self.assertRaises(ValueError):
+            list(spider.parse(self.make_response(b"new pdf")))
+        self.assertEqual((self.download_path / "AM-2000.pdf").read_bytes(), b"old pdf")
+        self.assertEqual(
+            list(read_rows(self.download_path / "AM-2000.csv.gz")), [{"numero": "0"}]
+        )
+        self.assertTrue(DownloadManifest(self.manifest_filename).is_unchanged("AM-2000", b"old pdf"))
+
+
+def run_spider(download_path):
+    """Run the spider over files already downloaded and return the rows"""
+    spider = AutuacoesSpider(download_path=download_path, start_year=2010, end_year=2010)
+    rows = []
+    for request in spider.start_requests():
+        assert request.url.startswith("file://"), request.url
+        body = Path(request.url[len("file://"):]).read_bytes()
+        response = Response(request.url, body=body, request=request)
+        rows.extend((request.callback or spider.parse)(response))
+    return rows
+
+
+class TestAutuacoesSpiderRuns(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.download_path = Path(self.temp_dir.name)
+        shutil.copy("tests/data/amazonas-2010.pdf", self.download_path / "AM-2010.pdf")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    @patch('autuacoes.spider.STATE_CODES', {"13": "AM"})
+    @patch('autuacoes.spider.date_range', lambda *args: [datetime.date(2010, 1, 1)])
+    # Only the first pages, to keep the test fast
+    @patch.object(IbamaPdfExtractor, "total_pages", new_callable=PropertyMock, return_value=2)
+    def test_second_run_has_same_output(self, mock_total_pages):
+        first = run_spider(self.download_path)
+        self.assertTrue(first)
+
+        with patch('autuacoes.spider.IbamaPdfExtractor') as mock_extractor:
+            second = run_spider(self.download_path)
+        mock_extractor.assert_not_called()
+        self.assertEqual(second, first)
+
+
 if __name__ == '__main__':
     unittest.main()